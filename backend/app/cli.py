@@ -0,0 +1,261 @@
+"""Maintenance commands.
+
+Usage (from the repository root):
+    python -m backend.app.cli migrate
+    python -m backend.app.cli rebuild-rollups
+    python -m backend.app.cli check-query-plans
+    python -m backend.app.cli check-pagination
+    python -m backend.app.cli rescore [--report-type-id ID] [--replace] [--dry-run]
+"""
+import argparse
+import sys
+import time
+from typing import List
+from .database import SessionLocal, engine
+from .migrations import migration_status, run_migrations
+from .services.rule_grading import RULE_GRADING_CHUNK_SIZE, rule_grading_pool
+from .services.statistics_service import StatisticsService
+
+# Finished jobs read per query by rescore
+RESCORE_PAGE_SIZE = 500
+
+
+def migrate(args):
+    applied = run_migrations(engine)
+    for version, description, done in migration_status(engine):
+        print(f"{version:>4}  {'applied' if done else 'pending':<8} {description}")
+    if not applied:
+        print("Database schema is up to date")
+
+
+def rebuild_rollups(args):
+    db = SessionLocal()
+    try:
+        groups = StatisticsService.rebuild_rollups(db)
+        print(f"Rebuilt evaluation statistics rollups: {groups} group(s)")
+    finally:
+        db.close()
+
+
+def check_query_plans(args):
+    from .query_plans import check_query_plans as explain_hot_queries
+
+    db = SessionLocal()
+    try:
+        results = explain_hot_queries(db)
+    finally:
+        db.close()
+
+    failed = 0
+    for name, plan, problems in results:
+        print(f"{'FAIL' if problems else 'ok':<5} {name}")
+        if problems or args.verbose:
+            for line in plan:
+                print(f"        {line}")
+        failed += bool(problems)
+    if failed:
+        print(f"{failed} hot queries use a full table scan or a temporary sort")
+        sys.exit(1)
+
+
+def check_pagination(args):
+    """Page through rows that share one created_at, stored in each of SQLite's text formats.
+
+    Runs on a throwaway in-memory SQLite database, since SQLite is where created_at is text:
+    CURRENT_TIMESTAMP defaults have whole seconds, datetimes bound by SQLAlchemy microseconds.
+    """
+    from datetime import datetime
+    from sqlalchemy import create_engine, insert, text
+    from sqlalchemy.orm import Session
+    from .database import Base
+    from .models import Student
+    from .pagination import paginate
+
+    timestamp = datetime(2026, 1, 1, 12, 0, 0)
+    rows = [{"first_name": "Page", "last_name": str(i), "matriculation_number": f"{9000000 + i}"} for i in range(25)]
+    formats = {
+        "CURRENT_TIMESTAMP default": lambda db: db.execute(
+            text("UPDATE students SET created_at = :created_at"), {"created_at": "2026-01-01 12:00:00"}
+        ),
+        "bound datetime": lambda db: db.execute(
+            Student.__table__.update().values(created_at=timestamp)
+        ),
+    }
+
+    failed = 0
+    for name, set_created_at in formats.items():
+        memory_engine = create_engine("sqlite://")
+        Base.metadata.create_all(memory_engine)
+        with Session(memory_engine) as db:
+            db.execute(insert(Student.__table__), rows)
+            set_created_at(db)
+            db.commit()
+            expected = sorted(student.id for student in db.query(Student))
+            for descending in (False, True):
+                seen, cursor = [], None
+                while True:
+                    page, cursor = paginate(db.query(Student), Student, args.page_size, cursor, descending)
+                    seen.extend(student.id for student in page)
+                    # A cursor that does not move past its row would repeat pages forever
+                    if cursor is None or len(seen) > len(expected):
+                        break
+                ok = sorted(seen) == expected
+                print(f"{'ok' if ok else 'FAIL':<5} {name}, {'descending' if descending else 'ascending'}: "
+                      f"{len(seen)} of {len(expected)} rows")
+                failed += not ok
+        memory_engine.dispose()
+    if failed:
+        print(f"{failed} cursor walks skipped or repeated rows")
+        sys.exit(1)
+
+
+def _past_submissions(db, args, jobs: list):
+    """Report contents kept in the payloads of finished evaluation jobs, oldest first.
+
+    Appends (job id, evaluation id) of each yielded submission to jobs, so jobs[i] belongs
+    to the submission with batch result index i. Jobs are read in keyset pages that are
+    fetched completely before any is yielded: with SQLite's default journal a SELECT still
+    open on this session would keep the batch's commits waiting on "database is locked".
+    """
+    from .models import EvaluationJob
+
+    query = db.query(EvaluationJob.id, EvaluationJob.payload, EvaluationJob.evaluator_id, EvaluationJob.evaluation_id)\
+        .filter(EvaluationJob.status == "succeeded", EvaluationJob.job_type == args.job_type)\
+        .order_by(EvaluationJob.id)
+    last_id = 0
+    while True:
+        page = query.filter(EvaluationJob.id > last_id).limit(RESCORE_PAGE_SIZE).all()
+        db.rollback()
+        if not page:
+            return
+        last_id = page[-1].id
+        for job_id, payload, evaluator_id, evaluation_id in page:
+            if args.report_type_id is not None and payload.get("report_type_id") != args.report_type_id:
+                continue
+            jobs.append((job_id, evaluation_id))
+            yield {
+                "student_id": payload["student_id"],
+                "report_type_id": payload["report_type_id"],
+                "report_title": payload["report_title"],
+                "report_content": payload["report_content"],
+                "evaluator_id": evaluator_id,
+            }
+
+
+def _replace_evaluations(db, jobs: list, results: List[dict]) -> int:
+    """Point each re-scored job at its new evaluation and delete the rule-based one it had before.
+
+    Returns the number of deleted evaluations. Does not touch the rollups.
+    """
+    from sqlalchemy import update
+    from .models import Evaluation, EvaluationJob, EvaluationScore
+    from .services.pdf_cache import pdf_cache
+
+    moved = [(jobs[result["index"]], result["evaluation_id"]) for result in results if result["success"]]
+    if not moved:
+        return 0
+    previous_ids = [evaluation_id for (_, evaluation_id), _ in moved if evaluation_id is not None]
+    db.execute(update(EvaluationJob), [{"id": job_id, "evaluation_id": new_id} for (job_id, _), new_id in moved])
+    stale_ids = [
+        row.id for row in db.query(Evaluation.id).filter(
+            Evaluation.id.in_(previous_ids), Evaluation.evaluation_method == "rule-based"
+        )
+    ]
+    if stale_ids:
+        db.query(EvaluationScore).filter(EvaluationScore.evaluation_id.in_(stale_ids)).delete(synchronize_session=False)
+        db.query(Evaluation).filter(Evaluation.id.in_(stale_ids)).delete(synchronize_session=False)
+    db.commit()
+    # Bulk deletes skip the session hooks that drop cached PDFs of changed evaluations
+    for evaluation_id in stale_ids:
+        pdf_cache.invalidate(evaluation_id)
+    return len(stale_ids)
+
+
+def rescore(args):
+    from .services.evaluation_service import EvaluationService
+
+    if args.replace and args.job_type != "rule-based":
+        print("--replace only applies to rule-based jobs, whose evaluation the new one replaces")
+        sys.exit(2)
+
+    # Jobs are read with one session while the batch writes with another
+    read_db = SessionLocal()
+    db = SessionLocal()
+    start = time.perf_counter()
+    documents = succeeded = replaced = 0
+    jobs = []
+    try:
+        for results in EvaluationService().evaluate_batch_rule_based(
+                db, _past_submissions(read_db, args, jobs), chunk_size=args.chunk_size, dry_run=args.dry_run):
+            documents += len(results)
+            for result in results:
+                if result["success"]:
+                    succeeded += 1
+                else:
+                    print(f"Submission {result['index'] + 1} ({result['report_title']}): {result['error']}")
+            if args.replace and not args.dry_run:
+                replaced += _replace_evaluations(db, jobs, results)
+    finally:
+        rule_grading_pool.shutdown()
+        read_db.close()
+        if replaced:
+            # Rollups cannot take evaluations back out (min/max), so recompute them
+            db.rollback()
+            StatisticsService.rebuild_rollups(db)
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    rate = documents / elapsed if elapsed > 0 else 0.0
+    print(f"{'Scored' if args.dry_run else 'Re-scored'} {succeeded} of {documents} submission(s) in {elapsed:.1f}s "
+          f"({rate:.1f} documents/sec, {max(rule_grading_pool.workers, 1)} process(es))")
+    if replaced:
+        print(f"Replaced {replaced} earlier rule-based evaluation(s) and rebuilt the statistics rollups")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EduTec maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_parser.set_defaults(func=migrate)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-rollups", help="Recompute the statistics rollup tables from all evaluations"
+    )
+    rebuild_parser.set_defaults(func=rebuild_rollups)
+
+    plans_parser = subparsers.add_parser(
+        "check-query-plans", help="EXPLAIN the hot queries and fail if one needs a full table scan"
+    )
+    plans_parser.add_argument("-v", "--verbose", action="store_true", help="Print every query plan")
+    plans_parser.set_defaults(func=check_query_plans)
+
+    pagination_parser = subparsers.add_parser(
+        "check-pagination", help="Page through rows sharing one timestamp and fail if a row is skipped or repeated"
+    )
+    pagination_parser.add_argument("--page-size", type=int, default=10)
+    pagination_parser.set_defaults(func=check_pagination)
+
+    rescore_parser = subparsers.add_parser(
+        "rescore", help="Re-score past submissions with the current rule-based rules as new evaluations "
+                        "(each run adds one evaluation per submission unless --replace is given)"
+    )
+    rescore_parser.add_argument("--report-type-id", type=int, help="Only submissions of this report type")
+    rescore_parser.add_argument("--job-type", choices=["llm", "rule-based"], default="rule-based",
+                                help="Submissions of jobs of this type (default: rule-based)")
+    rescore_parser.add_argument("--replace", action="store_true",
+                                help="Delete the job's previous rule-based evaluation and point the job at the new one "
+                                     "(rule-based jobs only; rebuilds the statistics rollups)")
+    rescore_parser.add_argument("--chunk-size", type=int, default=RULE_GRADING_CHUNK_SIZE,
+                                help="Submissions scored and saved together")
+    rescore_parser.add_argument("--dry-run", action="store_true", help="Score without saving evaluations")
+    rescore_parser.set_defaults(func=rescore)
+
+    args = parser.parse_args(argv)
+    if args.command != "migrate":
+        run_migrations(engine)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
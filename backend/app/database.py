@@ -1,6 +1,9 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from .sqlite_tuning import configure_sqlite_engine, install_write_queue
 import os
 from dotenv import load_dotenv
 
@@ -8,18 +11,59 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./evaluations.db")
 
+# Text format of SQLite's CURRENT_TIMESTAMP server defaults (whole seconds)
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         DATABASE_URL, connect_args={"check_same_thread": False}
     )
+    configure_sqlite_engine(engine)
+    install_write_queue(engine)
 else:
     engine = create_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (aiosqlite, asyncpg)"""
+    for prefix, async_prefix in (
+        ("sqlite:", "sqlite+aiosqlite:"),
+        ("postgresql+psycopg2:", "postgresql+asyncpg:"),
+        ("postgresql:", "postgresql+asyncpg:"),
+        ("postgres:", "postgresql+asyncpg:"),
+    ):
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+# Used by the async read routes: a request waits on the connection pool, not on a threadpool thread
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+if ASYNC_DATABASE_URL.startswith("sqlite") and ":memory:" not in ASYNC_DATABASE_URL:
+    # aiosqlite defaults to NullPool, which would open a connection (and thread) per request
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=AsyncAdaptedQueuePool)
+    configure_sqlite_engine(async_engine)
+else:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
+def dialect_insert(db):
+    """Return the dialect-specific insert() that supports ON CONFLICT upserts"""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise Exception(f"Upserts are not supported for database dialect: {dialect_name}")
+    return insert
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -28,5 +72,10 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 
 
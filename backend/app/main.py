@@ -3,14 +3,20 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from jinja2 import Template, FileSystemLoader, Environment
 from sqlalchemy.orm import Session
-from .database import engine, get_db, Base
-from .routers import students, reports, evaluations, auth
+from .database import async_engine, engine, get_db
+from .migrations import run_migrations
+from .routers import students, reports, evaluations, auth, analytics, admin
 from .services.rubric_service import RubricService
+from .services.llm_client import close_async_openai_client
+from .services.pdf_renderer import pdf_render_pool
+from .services.rule_grading import rule_grading_pool
+from .services.report_renderer import report_renderer
+from .services.statistics_service import StatisticsService
 from .models import User
 from .routers.auth import get_password_hash
 import os
 
-Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(
     title="EduTec - Academic Evaluation Tool",
@@ -25,7 +31,7 @@ if os.path.exists(static_path):
     app.mount("/static", StaticFiles(directory=static_path), name="static")
 
 if os.path.exists(templates_path):
-    jinja_env = Environment(loader=FileSystemLoader(templates_path))
+    jinja_env = report_renderer.environment
 else:
     jinja_env = None
 
@@ -33,6 +39,8 @@ app.include_router(students.router)
 app.include_router(reports.router)
 app.include_router(evaluations.router)
 app.include_router(auth.router)
+app.include_router(analytics.router)
+app.include_router(admin.router)
 
 
 @app.on_event("startup")
@@ -41,6 +49,7 @@ async def startup_event():
     db = next(get_db())
     try:
         RubricService.initialize_default_rubrics(db)
+        StatisticsService.ensure_rollups(db)
         
         existing_user = db.query(User).filter(
             (User.email == "demo@test.de") | (User.username == "demo")
@@ -77,6 +86,20 @@ async def startup_event():
         traceback.print_exc()
     finally:
         db.close()
+    
+    # Compile the report template once up front
+    report_renderer.get_report_template()
+    evaluations.evaluation_job_service.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and close shared clients"""
+    evaluations.evaluation_job_service.stop()
+    await close_async_openai_client()
+    await async_engine.dispose()
+    pdf_render_pool.shutdown()
+    rule_grading_pool.shutdown()
 
 
 def render_template(template_name: str, context: dict = None) -> str:
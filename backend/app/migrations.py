@@ -0,0 +1,111 @@
+"""Versioned schema migrations.
+
+New databases get the full schema from Base.metadata.create_all. Existing databases are
+brought up to date by the migrations below, which are applied in order and recorded in
+the schema_migrations table. Every migration must be idempotent (check before creating),
+because create_all may already have created the objects it adds on a fresh database.
+
+To change the schema, update models.py and append a migration with the next version.
+"""
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import func
+from typing import Callable, List, Tuple
+from .database import Base
+from . import models
+
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now())
+)
+
+
+def create_missing_indexes(connection: Connection, *tables: Table):
+    """Create the indexes declared on the given model tables that do not exist yet"""
+    inspector = inspect(connection)
+    for table in tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+
+
+def add_column_if_missing(connection: Connection, table: Table, column_name: str):
+    """Add a column declared on a model table to an existing database table"""
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    if column_name in existing:
+        return
+    column = table.c[column_name]
+    column_type = column.type.compile(dialect=connection.dialect)
+    ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg}"
+    connection.execute(text(ddl))
+
+
+def _baseline(connection: Connection):
+    """Tables as created by create_all before versioned migrations existed"""
+    Base.metadata.create_all(bind=connection)
+
+
+def _hot_query_indexes(connection: Connection):
+    create_missing_indexes(connection, models.Student.__table__, models.Evaluation.__table__,
+                           models.EvaluationScore.__table__, models.EvaluationStatsRollup.__table__)
+
+
+def _rubric_version(connection: Connection):
+    add_column_if_missing(connection, models.ReportType.__table__, "rubric_version")
+
+
+def _imported_created_at_format(connection: Connection):
+    """Rewrite created_at values that evaluation imports stored with microseconds on SQLite
+    in the whole-second text format of the CURRENT_TIMESTAMP default"""
+    if connection.dialect.name != "sqlite":
+        return
+    connection.execute(text(
+        "UPDATE evaluations SET created_at = strftime('%Y-%m-%d %H:%M:%S', created_at) "
+        "WHERE created_at LIKE '%.%'"
+    ))
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "baseline schema", _baseline),
+    (2, "composite indexes for list, history, statistics and export queries", _hot_query_indexes),
+    (3, "rubric version counter on report types", _rubric_version),
+    (4, "imported evaluation timestamps in the SQLite default format", _imported_created_at_format),
+]
+
+
+def applied_versions(connection: Connection) -> set:
+    migration_metadata.create_all(bind=connection)
+    return {row.version for row in connection.execute(select(schema_migrations.c.version))}
+
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Create missing tables and apply pending migrations; returns the versions applied"""
+    applied_now = []
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            # Serialize concurrent application processes migrating the same database
+            connection.execute(text("SELECT pg_advisory_xact_lock(812734)"))
+        Base.metadata.create_all(bind=connection)
+        done = applied_versions(connection)
+        for version, description, migrate in MIGRATIONS:
+            if version in done:
+                continue
+            migrate(connection)
+            connection.execute(schema_migrations.insert().values(version=version, description=description))
+            applied_now.append(version)
+            print(f"Applied schema migration {version}: {description}")
+    return applied_now
+
+
+def migration_status(engine: Engine) -> List[Tuple[int, str, bool]]:
+    """List all migrations with whether they have been applied"""
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+    return [(version, description, version in done) for version, description, _ in MIGRATIONS]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Date, Boolean, JSON, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -21,6 +21,7 @@ class ReportType(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
     description = Column(Text)
+    rubric_version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped on every rubric change
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     rubrics = relationship("Rubric", back_populates="report_type", cascade="all, delete-orphan")
@@ -45,6 +46,9 @@ class Rubric(Base):
 
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        Index("ix_students_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String, nullable=False)
@@ -57,6 +61,14 @@ class Student(Base):
 
 class Evaluation(Base):
     __tablename__ = "evaluations"
+    __table_args__ = (
+        # Keyset pages of "my evaluations" and a student's history, newest first
+        Index("ix_evaluations_evaluator_created_at_id", "evaluator_id", "created_at", "id"),
+        Index("ix_evaluations_student_created_at_id", "student_id", "created_at", "id"),
+        # Statistics and exports filtered by report type and date
+        Index("ix_evaluations_report_type_created_at", "report_type_id", "created_at"),
+        Index("ix_evaluations_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
@@ -79,6 +91,10 @@ class Evaluation(Base):
 
 class EvaluationScore(Base):
     __tablename__ = "evaluation_scores"
+    __table_args__ = (
+        Index("ix_evaluation_scores_evaluation_rubric", "evaluation_id", "rubric_id"),
+        Index("ix_evaluation_scores_rubric_id", "rubric_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     evaluation_id = Column(Integer, ForeignKey("evaluations.id"), nullable=False)
@@ -91,5 +107,44 @@ class EvaluationScore(Base):
     rubric = relationship("Rubric", back_populates="scores")
 
 
+class EvaluationStatsRollup(Base):
+    """Running score aggregates per report type, evaluator, evaluation method and day"""
+    __tablename__ = "evaluation_stats_rollups"
+    __table_args__ = (
+        UniqueConstraint("report_type_id", "evaluator_id", "evaluation_method", "day", name="uq_evaluation_stats_rollup_group"),
+        Index("ix_evaluation_stats_rollups_report_type_day", "report_type_id", "day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    report_type_id = Column(Integer, ForeignKey("report_types.id"), nullable=False)
+    evaluator_id = Column(Integer, nullable=False, default=0)  # 0 when the evaluation has no evaluator
+    evaluation_method = Column(String, nullable=False)
+    day = Column(Date, nullable=False)
+    evaluation_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sum_squares = Column(Float, nullable=False, default=0.0)
+    max_possible_sum = Column(Float, nullable=False, default=0.0)
+    min_score = Column(Float)
+    max_score = Column(Float)
+
+
+class EvaluationJob(Base):
+    __tablename__ = "evaluation_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False)  # llm, rule-based
+    status = Column(String, nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    payload = Column(JSON, nullable=False)  # Evaluation request (student, report type, title, content)
+    evaluator_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    evaluation_id = Column(Integer, ForeignKey("evaluations.id"), nullable=True)
+    error = Column(Text)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    evaluation = relationship("Evaluation")
+
+
 
 
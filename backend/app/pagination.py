@@ -0,0 +1,124 @@
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, and_, func, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+from typing import Callable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+from .database import SQLITE_TIMESTAMP_FORMAT, SessionLocal
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+STREAM_BATCH_SIZE = 200
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    """Opaque cursor pointing at the last row of a page"""
+    payload = {"created_at": created_at.isoformat(sep=" ") if created_at else None, "id": row_id}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Decode a cursor from encode_cursor; raises HTTP 400 for malformed cursors"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        created_at = datetime.fromisoformat(payload["created_at"]) if payload["created_at"] else None
+        return created_at, int(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _sqlite_timestamp(created_at: datetime) -> str:
+    """created_at as SQLite's strftime('%Y-%m-%d %H:%M:%f') renders it (milliseconds)"""
+    return created_at.strftime("%Y-%m-%d %H:%M:%S.") + f"{created_at.microsecond // 1000:03d}"
+
+
+def _keyset_filter(dialect_name: str, model, created_at: datetime, row_id: int, descending: bool):
+    """Condition selecting the rows after the cursor row in (created_at, id) order.
+
+    SQLite keeps created_at as text: CURRENT_TIMESTAMP defaults without fractional seconds,
+    datetimes bound by SQLAlchemy with microseconds. Both sides are therefore compared in
+    one normalized format. A plain comparison on the stored column is added so the index
+    on created_at can still narrow the rows: it only bounds the range by whole seconds,
+    which holds for any of the stored formats.
+    """
+    if dialect_name != "sqlite":
+        column, bound = model.created_at, created_at
+        coarse = None
+    else:
+        column = func.strftime("%Y-%m-%d %H:%M:%f", model.created_at)
+        bound = literal(_sqlite_timestamp(created_at), String)
+        second = created_at.replace(microsecond=0)
+        if descending:
+            coarse = model.created_at < (second + timedelta(seconds=1)).strftime(SQLITE_TIMESTAMP_FORMAT)
+        else:
+            coarse = model.created_at >= second.strftime(SQLITE_TIMESTAMP_FORMAT)
+
+    if descending:
+        condition = or_(column < bound, and_(column == bound, model.id < row_id))
+    else:
+        condition = or_(column > bound, and_(column == bound, model.id > row_id))
+    return condition if coarse is None else and_(coarse, condition)
+
+
+def apply_keyset(query, model, cursor: Optional[str] = None, descending: bool = False,
+                 dialect_name: Optional[str] = None):
+    """Order a Query or select() by (created_at, id) and continue after the cursor row.
+
+    dialect_name is only needed for select() statements, which are not bound to a session.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if created_at is None:
+            query = query.filter(model.created_at.is_(None), model.id < row_id if descending else model.id > row_id)
+        else:
+            query = query.filter(_keyset_filter(
+                dialect_name or query.session.get_bind().dialect.name, model, created_at, row_id, descending
+            ))
+
+    if descending:
+        return query.order_by(model.created_at.desc(), model.id.desc())
+    return query.order_by(model.created_at, model.id)
+
+
+def paginate(query: Query, model, limit: int, cursor: Optional[str] = None,
+             descending: bool = False) -> Tuple[List, Optional[str]]:
+    """Fetch one page of at most limit rows; returns the rows and the cursor of the next page"""
+    rows = apply_keyset(query, model, cursor, descending).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+async def apaginate(db: AsyncSession, statement, model, limit: int, cursor: Optional[str] = None,
+                    descending: bool = False, scalars: bool = True) -> Tuple[List, Optional[str]]:
+    """paginate() for select() statements on an AsyncSession; scalars=False returns rows"""
+    statement = apply_keyset(statement, model, cursor, descending, dialect_name=db.bind.dialect.name)
+    result = await db.execute(statement.limit(limit + 1))
+    rows = result.scalars().all() if scalars else result.all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def stream_ndjson(build_query: Callable, serialize: Callable, batch_size: int = STREAM_BATCH_SIZE) -> StreamingResponse:
+    """Stream query results as newline-delimited JSON while rows are fetched.
+
+    build_query receives a session owned by the stream, since the request's session
+    may be closed before the response body has been sent.
+    """
+    def generate() -> Iterator[bytes]:
+        db = SessionLocal()
+        try:
+            for row in build_query(db).yield_per(batch_size):
+                yield (json.dumps(jsonable_encoder(serialize(row))) + "\n").encode("utf-8")
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
@@ -0,0 +1,94 @@
+"""EXPLAIN checks for the hot query patterns.
+
+Builds the queries behind the list, history, export and statistics routes and asks the
+database for their plans. A plan that reads one of the large tables with a full table scan
+or sorts it in a temporary structure means an index is missing.
+
+Run from the repository root:
+    python -m backend.app.cli check-query-plans
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import List, Tuple
+from datetime import datetime
+from .models import Evaluation, EvaluationScore, EvaluationStatsRollup, Student
+from .pagination import DEFAULT_PAGE_SIZE, apply_keyset, encode_cursor
+from .services.evaluation_service import EvaluationService
+import re
+
+# Tables that grow with usage; scans of the small lookup tables (report types, rubrics) are fine
+LARGE_TABLES = ("evaluations", "evaluation_scores", "students", "evaluation_stats_rollups")
+
+
+def hot_queries(db: Session) -> List[Tuple[str, object]]:
+    """(name, query) pairs mirroring the queries issued by the hot routes"""
+    cursor = encode_cursor(datetime(2026, 1, 1, 12, 0, 0), 1000)
+    summaries = EvaluationService.query_evaluation_summaries
+    full = EvaluationService.query_evaluations_with_scores
+    return [
+        ("my evaluations, first page", apply_keyset(
+            summaries(db).filter(Evaluation.evaluator_id == 1), Evaluation, descending=True
+        ).limit(DEFAULT_PAGE_SIZE + 1)),
+        ("my evaluations, next page", apply_keyset(
+            summaries(db).filter(Evaluation.evaluator_id == 1), Evaluation, cursor, descending=True
+        ).limit(DEFAULT_PAGE_SIZE + 1)),
+        ("my evaluations, full view", apply_keyset(
+            full(db).filter(Evaluation.evaluator_id == 1), Evaluation, cursor, descending=True
+        ).limit(DEFAULT_PAGE_SIZE + 1)),
+        ("scores of a page (selectinload)", db.query(EvaluationScore).filter(EvaluationScore.evaluation_id.in_([1, 2, 3]))),
+        ("student history, next page", apply_keyset(
+            summaries(db).filter(Evaluation.student_id == 1), Evaluation, cursor, descending=True
+        ).limit(DEFAULT_PAGE_SIZE + 1)),
+        ("students, next page", apply_keyset(db.query(Student), Student, cursor).limit(DEFAULT_PAGE_SIZE + 1)),
+        ("export by report type and date", db.query(Evaluation.id).filter(
+            Evaluation.report_type_id == 1,
+            Evaluation.created_at >= datetime(2026, 1, 1),
+            Evaluation.created_at < datetime(2026, 2, 1)
+        ).order_by(Evaluation.created_at, Evaluation.id)),
+        ("export by date", db.query(Evaluation.id).filter(
+            Evaluation.created_at >= datetime(2026, 1, 1),
+            Evaluation.created_at < datetime(2026, 2, 1)
+        ).order_by(Evaluation.created_at, Evaluation.id)),
+        ("report type time series", db.query(EvaluationStatsRollup).filter(
+            EvaluationStatsRollup.report_type_id == 1
+        ).order_by(EvaluationStatsRollup.day)),
+    ]
+
+
+def explain(db: Session, query) -> List[str]:
+    """Return the plan lines of a query"""
+    statement = query.statement if hasattr(query, "statement") else query
+    dialect = db.get_bind().dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        return [row[3] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    # Without enable_seqscan the planner only picks a sequential scan when no index applies,
+    # which keeps the check independent of table sizes and statistics
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    return [row[0] for row in db.execute(text(f"EXPLAIN {sql}"))]
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Plan lines that scan or sort a large table without an index"""
+    problems = []
+    for line in plan:
+        sqlite_scan = re.match(r"\s*SCAN (\w+)\b(?! USING)", line)
+        postgres_scan = re.search(r"Seq Scan on (\w+)", line)
+        match = sqlite_scan or postgres_scan
+        if match and match.group(1) in LARGE_TABLES:
+            problems.append(line.strip())
+        elif "USE TEMP B-TREE FOR ORDER BY" in line:
+            problems.append(line.strip())
+    return problems
+
+
+def check_query_plans(db: Session) -> List[Tuple[str, List[str], List[str]]]:
+    """Explain every hot query; returns (name, plan, problems) per query"""
+    results = []
+    try:
+        for name, query in hot_queries(db):
+            plan = explain(db, query)
+            results.append((name, plan, full_scans(plan)))
+    finally:
+        db.rollback()
+    return results
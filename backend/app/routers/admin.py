@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db
+from ..schemas import RubricImportResponse, UserResponse
+from ..services.import_utils import open_import
+from ..services.rubric_service import RUBRIC_IMPORT_COLUMNS, RubricService
+from ..routers.auth import get_current_user
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.post("/rubrics/import", response_model=RubricImportResponse)
+def import_rubrics(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Create or update rubrics from a CSV, Excel (.xlsx) or NDJSON file (admin only).
+
+    Needs report_type (name), section_name and max_points; description, criteria (a JSON
+    object) and order are optional. Only new and changed sections are written, all in one
+    transaction, and nothing is written if a row is invalid. dry_run=true reports the
+    changes without applying them.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    
+    try:
+        chunks = open_import(file, RUBRIC_IMPORT_COLUMNS, format)
+        return RubricService.import_rubrics(db, chunks, dry_run=dry_run)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
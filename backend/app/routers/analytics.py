@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db
+from ..services.analytics_service import AnalyticsService
+from ..services.agreement_service import agreement_service
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.get("/sections")
+def get_section_distributions(
+    group_by: str = "report_type",
+    report_type_id: Optional[int] = None,
+    evaluator_id: Optional[int] = None,
+    semester: Optional[str] = None,
+    bins: int = 10,
+    db: Session = Depends(get_db)
+):
+    """Get score distributions per rubric section, grouped by report type, evaluator or semester"""
+    try:
+        return AnalyticsService.get_section_distributions(
+            db,
+            group_by=group_by,
+            report_type_id=report_type_id,
+            evaluator_id=evaluator_id,
+            semester=semester,
+            bins=bins
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/agreement")
+def get_agreement(compare: str = "method", report_type_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Get inter-rater agreement per rubric section between evaluation methods or evaluators"""
+    try:
+        return agreement_service.get_agreement(db, compare=compare, report_type_id=report_type_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
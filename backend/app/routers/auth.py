@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from ..database import get_db
+from ..database import SessionLocal, get_db
 from ..models import User
 from ..schemas import UserCreate, UserResponse, Token, LoginRequest
+from ..services.token_cache import token_cache
 import os
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -58,7 +60,26 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def load_principal(username: str) -> Optional[UserResponse]:
+    """Look up a user in a short-lived session and return a detached snapshot"""
+    db = SessionLocal()
+    try:
+        user = get_user_by_username(db, username=username)
+        return UserResponse.model_validate(user) if user else None
+    finally:
+        db.close()
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserResponse:
+    """Authenticate the bearer token.
+
+    Verified tokens are served from token_cache without decoding them again; on a miss
+    the user lookup runs in the thread pool so the event loop is never blocked on the database.
+    """
+    principal = token_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -71,10 +92,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = get_user_by_username(db, username=username)
-    if user is None:
+    principal = await run_in_threadpool(load_principal, username)
+    if principal is None:
         raise credentials_exception
-    return user
+    token_cache.set(token, principal, payload.get("exp"))
+    return principal
 
 
 @router.post("/register", response_model=UserResponse)
@@ -155,7 +177,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 
 @router.get("/me", response_model=UserResponse)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: UserResponse = Depends(get_current_user)):
     """Get current user information"""
     return current_user
 
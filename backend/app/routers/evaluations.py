@@ -1,18 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
-from ..database import get_db
-from ..models import Evaluation, EvaluationScore, User
-from ..schemas import EvaluationCreate, EvaluationResponse, RubricWithScores
+from typing import List, Optional, Union
+from ..database import get_async_db, get_db
+from ..pagination import MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE, NEXT_CURSOR_HEADER, apaginate, apply_keyset, stream_ndjson
+from ..models import Evaluation, EvaluationScore
+from ..schemas import (
+    EvaluationCreate, EvaluationResponse, EvaluationSummaryResponse, RubricWithScores, StudentSummary, ReportTypeSummary,
+    UserResponse
+)
 from ..services.evaluation_service import EvaluationService
+from ..services.import_utils import open_import, stream_import_results
+from ..services.rubric_cache import rubric_cache
 from ..services.report_service import ReportService
+from ..services.llm_cache import llm_cache
+from ..services.job_service import EvaluationJobService, JOB_TYPES
+from ..services.pdf_renderer import PDFRenderBusyError
 from ..routers.auth import get_current_user
 from pydantic import BaseModel
+from datetime import date, datetime
+import os
+import time
 
 router = APIRouter(prefix="/api/evaluations", tags=["evaluations"])
 
 evaluation_service = EvaluationService()
 report_service = ReportService()
+evaluation_job_service = EvaluationJobService(evaluation_service)
+
+# Maximum number of submissions accepted by a single batch request
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", "500"))
+RULE_BASED_BATCH_MAX_SIZE = int(os.getenv("RULE_BASED_BATCH_MAX_SIZE", "5000"))
+# Maximum number of reports combined into a single exported PDF; the combined PDF is laid
+# out by one render worker within PDF_BOOKLET_TIMEOUT, larger cohorts go through format=zip
+EXPORT_BOOKLET_MAX_REPORTS = int(os.getenv("EXPORT_BOOKLET_MAX_REPORTS", "50"))
 
 
 def format_evaluation_response(evaluation: Evaluation) -> EvaluationResponse:
@@ -47,11 +69,86 @@ def format_evaluation_response(evaluation: Evaluation) -> EvaluationResponse:
     )
 
 
+def format_evaluation_summary(row) -> EvaluationSummaryResponse:
+    """Format a row of EvaluationService.query_evaluation_summaries for response"""
+    return EvaluationSummaryResponse(
+        id=row.id,
+        student=StudentSummary(
+            id=row.student_id,
+            first_name=row.first_name,
+            last_name=row.last_name,
+            matriculation_number=row.matriculation_number
+        ),
+        report_type=ReportTypeSummary(id=row.report_type_id, name=row.report_type_name),
+        report_title=row.report_title,
+        oberseminar_date=row.oberseminar_date,
+        oberseminar_time=row.oberseminar_time,
+        total_score=row.total_score,
+        max_possible_score=row.max_possible_score,
+        evaluation_method=row.evaluation_method,
+        created_at=row.created_at
+    )
+
+
+async def list_evaluations(db: AsyncSession, response: Response, filter_criterion, cursor: Optional[str],
+                           limit: Optional[int], format: str, fields: str):
+    """Shared implementation of the paginated / streamed evaluation list routes"""
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'ndjson'")
+    if fields not in ("full", "summary"):
+        raise HTTPException(status_code=400, detail="fields must be 'full' or 'summary'")
+    
+    if fields == "summary":
+        build_base_query, formatter = EvaluationService.query_evaluation_summaries, format_evaluation_summary
+        statement = EvaluationService.select_evaluation_summaries()
+    else:
+        build_base_query, formatter = EvaluationService.query_evaluations_with_scores, format_evaluation_response
+        statement = EvaluationService.select_evaluations_with_scores()
+    
+    if format == "ndjson":
+        def build_query(stream_db: Session):
+            query = apply_keyset(build_base_query(stream_db).filter(filter_criterion), Evaluation, cursor, descending=True)
+            return query.limit(limit) if limit else query
+        return stream_ndjson(build_query, formatter)
+    
+    evaluations, next_cursor = await apaginate(
+        db, statement.where(filter_criterion), Evaluation, limit or DEFAULT_PAGE_SIZE, cursor,
+        descending=True, scalars=fields == "full"
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [formatter(e) for e in evaluations]
+
+
 class LLMEvaluationRequest(BaseModel):
     student_id: int
     report_type_id: int
     report_title: str
     report_content: str
+    use_cache: bool = True
+
+
+class LLMBatchEvaluationRequest(BaseModel):
+    submissions: List[LLMEvaluationRequest]
+    max_concurrency: Optional[int] = None
+
+
+class BatchEvaluationItemResult(BaseModel):
+    index: int
+    student_id: int
+    report_title: str
+    success: bool
+    evaluation_id: Optional[int] = None
+    total_score: Optional[float] = None
+    max_possible_score: Optional[float] = None
+    error: Optional[str] = None
+
+
+class BatchEvaluationResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchEvaluationItemResult]
 
 
 class RuleBasedEvaluationRequest(BaseModel):
@@ -61,42 +158,165 @@ class RuleBasedEvaluationRequest(BaseModel):
     report_content: str
 
 
-@router.get("/my", response_model=List[EvaluationResponse])
-def get_my_evaluations(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """Get all evaluations created by the current user"""
-    evaluations = db.query(Evaluation)\
-        .options(
-            joinedload(Evaluation.student),
-            joinedload(Evaluation.report_type),
-            joinedload(Evaluation.scores).joinedload(EvaluationScore.rubric)
-        )\
-        .filter(Evaluation.evaluator_id == current_user.id)\
-        .order_by(Evaluation.created_at.desc())\
-        .all()
-    return [format_evaluation_response(e) for e in evaluations]
+class RuleBasedBatchEvaluationRequest(BaseModel):
+    submissions: List[RuleBasedEvaluationRequest]
+
+
+class RuleBasedBatchEvaluationResponse(BatchEvaluationResponse):
+    elapsed_seconds: float
+    documents_per_second: float
+
+
+class EvaluationJobRequest(BaseModel):
+    method: str  # llm or rule-based
+    student_id: int
+    report_type_id: int
+    report_title: str
+    report_content: str
+    use_cache: bool = True
+
+
+class EvaluationJobResponse(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    status_url: str
+    evaluation_id: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    evaluation: Optional[EvaluationResponse] = None
+
+
+def format_job_response(job, evaluation: Optional[Evaluation] = None) -> EvaluationJobResponse:
+    """Format evaluation job status for response"""
+    return EvaluationJobResponse(
+        id=job.id,
+        job_type=job.job_type,
+        status=job.status,
+        status_url=f"/api/evaluations/jobs/{job.id}",
+        evaluation_id=job.evaluation_id,
+        error=job.error,
+        attempts=job.attempts or 0,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        evaluation=format_evaluation_response(evaluation) if evaluation else None
+    )
+
+
+@router.get("/my", response_model=List[Union[EvaluationResponse, EvaluationSummaryResponse]])
+async def get_my_evaluations(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: str = "json",
+    fields: str = "full",
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Get evaluations created by the current user, newest first.
+
+    Returns one page per request; the cursor for the next page is sent in the X-Next-Cursor
+    header. With format=ndjson all evaluations after the cursor (up to limit) are streamed.
+    fields=summary leaves out rubrics and scores.
+    """
+    return await list_evaluations(
+        db, response, Evaluation.evaluator_id == current_user.id, cursor, limit, format, fields
+    )
+
+
+@router.get("/export")
+def export_reports(
+    report_type_id: Optional[int] = None,
+    evaluator_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    format: str = "zip",
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Export the PDF reports of many evaluations as a streamed ZIP archive or one combined PDF"""
+    if format not in ("zip", "pdf"):
+        raise HTTPException(status_code=400, detail="format must be 'zip' or 'pdf'")
+    
+    evaluation_ids = report_service.find_evaluation_ids(
+        db, report_type_id=report_type_id, evaluator_id=evaluator_id, date_from=date_from, date_to=date_to
+    )
+    if not evaluation_ids:
+        raise HTTPException(status_code=404, detail="No evaluations match the given filters")
+    
+    if format == "pdf":
+        if len(evaluation_ids) > EXPORT_BOOKLET_MAX_REPORTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many reports for one PDF (maximum {EXPORT_BOOKLET_MAX_REPORTS}), use format=zip"
+            )
+        return StreamingResponse(
+            report_service.stream_pdf_booklet(evaluation_ids),
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="evaluation_reports.pdf"'}
+        )
+    
+    return StreamingResponse(
+        report_service.stream_pdf_zip(evaluation_ids),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="evaluation_reports.zip"'}
+    )
 
 
 @router.post("/", response_model=EvaluationResponse)
-def create_evaluation(evaluation: EvaluationCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_evaluation(evaluation: EvaluationCreate, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     """Create a new manual evaluation"""
     evaluation_obj = evaluation_service.create_evaluation(db, evaluation, evaluator_id=current_user.id)
-    
-    db.refresh(evaluation_obj)
     return format_evaluation_response(evaluation_obj)
 
 
+@router.post("/import")
+def import_evaluations(
+    report_type_id: int,
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Create evaluations of one report type from a CSV or Excel (.xlsx) file.
+
+    One row per evaluation with matriculation_number, report_title and a score column per
+    rubric section (named like the section, e.g. "General Aspects"); "<section> feedback",
+    evaluation_method, evaluated_at, oberseminar_date and oberseminar_time are optional.
+    The response streams one NDJSON result per row and ends with a summary line.
+    """
+    rubric_entry = rubric_cache.get(db, report_type_id)
+    if not rubric_entry.rubrics:
+        raise HTTPException(status_code=404, detail="No rubrics found for this report type")
+    
+    try:
+        chunks = open_import(file, EvaluationService.evaluation_import_columns(rubric_entry), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return stream_import_results(
+        lambda stream_db: evaluation_service.bulk_create_evaluations(
+            stream_db, report_type_id, chunks, evaluator_id=current_user.id
+        )
+    )
+
+
 @router.post("/llm", response_model=EvaluationResponse)
-def create_llm_evaluation(request: LLMEvaluationRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """Create an evaluation using language model"""
+async def create_llm_evaluation(request: LLMEvaluationRequest, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+    """Create an evaluation using language model (the model call is awaited, not run in a worker thread)"""
     import traceback
     try:
-        evaluation = evaluation_service.evaluate_with_llm(
+        evaluation = await evaluation_service.evaluate_with_llm_async(
             db,
             request.student_id,
             request.report_type_id,
             request.report_title,
             request.report_content,
-            evaluator_id=current_user.id
+            evaluator_id=current_user.id,
+            use_cache=request.use_cache
         )
         if not evaluation:
             raise HTTPException(status_code=500, detail="Language model evaluation failed")
@@ -109,8 +329,55 @@ def create_llm_evaluation(request: LLMEvaluationRequest, db: Session = Depends(g
         raise HTTPException(status_code=500, detail=f"Language model evaluation failed: {error_detail}")
 
 
+@router.post("/llm/batch", response_model=BatchEvaluationResponse)
+def create_llm_evaluations_batch(request: LLMBatchEvaluationRequest, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+    """Evaluate many submissions using language model with concurrent model calls"""
+    if not request.submissions:
+        raise HTTPException(status_code=400, detail="No submissions provided")
+    if len(request.submissions) > LLM_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many submissions in one batch (maximum {LLM_BATCH_MAX_SIZE})"
+        )
+    if request.max_concurrency is not None and request.max_concurrency < 1:
+        raise HTTPException(status_code=400, detail="max_concurrency must be at least 1")
+    
+    try:
+        results = evaluation_service.evaluate_batch_with_llm(
+            db,
+            [submission.dict() for submission in request.submissions],
+            evaluator_id=current_user.id,
+            max_concurrency=request.max_concurrency
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Language model evaluation failed: {str(e)}")
+    
+    succeeded = sum(1 for result in results if result["success"])
+    return BatchEvaluationResponse(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
+
+
+@router.get("/llm/cache/stats")
+def get_llm_cache_stats(current_user: UserResponse = Depends(get_current_user)):
+    """Get language model result cache statistics"""
+    return llm_cache.stats()
+
+
+@router.delete("/llm/cache")
+def clear_llm_cache(current_user: UserResponse = Depends(get_current_user)):
+    """Clear the language model result cache (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    llm_cache.clear()
+    return {"status": "cleared"}
+
+
 @router.post("/rule-based", response_model=EvaluationResponse)
-def create_rule_based_evaluation(request: RuleBasedEvaluationRequest, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_rule_based_evaluation(request: RuleBasedEvaluationRequest, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
     """Create a rule-based evaluation"""
     try:
         evaluation = evaluation_service.evaluate_rule_based(
@@ -128,20 +395,82 @@ def create_rule_based_evaluation(request: RuleBasedEvaluationRequest, db: Sessio
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/rule-based/batch", response_model=RuleBasedBatchEvaluationResponse)
+def create_rule_based_evaluations_batch(request: RuleBasedBatchEvaluationRequest, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+    """Evaluate many submissions using rule-based approach, scored in parallel worker processes"""
+    if not request.submissions:
+        raise HTTPException(status_code=400, detail="No submissions provided")
+    if len(request.submissions) > RULE_BASED_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many submissions in one batch (maximum {RULE_BASED_BATCH_MAX_SIZE})"
+        )
+    
+    start = time.perf_counter()
+    try:
+        results = [
+            result
+            for chunk_results in evaluation_service.evaluate_batch_rule_based(
+                db,
+                [submission.dict() for submission in request.submissions],
+                evaluator_id=current_user.id
+            )
+            for result in chunk_results
+        ]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rule-based evaluation failed: {str(e)}")
+    elapsed = time.perf_counter() - start
+    
+    results.sort(key=lambda result: result["index"])
+    succeeded = sum(1 for result in results if result["success"])
+    return RuleBasedBatchEvaluationResponse(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+        elapsed_seconds=round(elapsed, 3),
+        documents_per_second=round(len(results) / elapsed, 1) if elapsed > 0 else 0.0
+    )
+
+
+@router.post("/jobs", response_model=EvaluationJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_evaluation_job(request: EvaluationJobRequest, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+    """Queue a language model or rule-based evaluation and return immediately with a job id"""
+    if request.method not in JOB_TYPES:
+        raise HTTPException(status_code=400, detail=f"method must be one of: {', '.join(JOB_TYPES)}")
+    
+    payload = request.dict(exclude={"method"})
+    job = evaluation_job_service.enqueue(db, request.method, payload, evaluator_id=current_user.id)
+    return format_job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=EvaluationJobResponse)
+def get_evaluation_job(job_id: int, db: Session = Depends(get_db), current_user: UserResponse = Depends(get_current_user)):
+    """Get the status of an evaluation job, including the evaluation once it has succeeded"""
+    job = evaluation_job_service.get_job(db, job_id)
+    if not job or (job.evaluator_id != current_user.id and not current_user.is_admin):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    evaluation = None
+    if job.status == "succeeded" and job.evaluation_id:
+        evaluation = evaluation_service.get_evaluation(db, job.evaluation_id)
+    return format_job_response(job, evaluation)
+
+
 @router.get("/{evaluation_id}", response_model=EvaluationResponse)
-def get_evaluation(evaluation_id: int, db: Session = Depends(get_db)):
+async def get_evaluation(evaluation_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get evaluation by ID"""
-    evaluation = evaluation_service.get_evaluation(db, evaluation_id)
+    evaluation = await evaluation_service.aget_evaluation(db, evaluation_id)
     if not evaluation:
         raise HTTPException(status_code=404, detail="Evaluation not found")
     return format_evaluation_response(evaluation)
 
 
 @router.get("/{evaluation_id}/report/html")
-def get_html_report(evaluation_id: int, db: Session = Depends(get_db)):
+async def get_html_report(evaluation_id: int, db: AsyncSession = Depends(get_async_db)):
     """Generate and return HTML evaluation report"""
     try:
-        html_content = report_service.generate_html_report(db, evaluation_id)
+        html_content = await report_service.agenerate_html_report(db, evaluation_id)
         return Response(content=html_content, media_type="text/html")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -149,12 +478,12 @@ def get_html_report(evaluation_id: int, db: Session = Depends(get_db)):
 
 @router.get("/{evaluation_id}/report/pdf")
 def get_pdf_report(evaluation_id: int, db: Session = Depends(get_db)):
-    """Generate and return PDF evaluation report"""
+    """Return PDF evaluation report, served from the report cache when unchanged"""
     try:
-        pdf_path = report_service.generate_pdf_report(db, evaluation_id)
-        with open(pdf_path, "rb") as f:
-            pdf_content = f.read()
-        return Response(content=pdf_content, media_type="application/pdf")
+        pdf_path = report_service.get_cached_pdf_report(db, evaluation_id)
+        return FileResponse(pdf_path, media_type="application/pdf")
+    except PDFRenderBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
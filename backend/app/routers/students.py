@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
+from typing import List, Optional, Union
+from ..database import get_async_db, get_db
 from ..models import Student
-from ..schemas import StudentCreate, StudentResponse, EvaluationResponse, ReportTypeResponse, RubricWithScores
+from ..pagination import MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE, NEXT_CURSOR_HEADER, apaginate, apply_keyset, stream_ndjson
+from ..schemas import StudentCreate, StudentResponse, EvaluationResponse, EvaluationSummaryResponse, UserResponse
+from ..services.import_utils import open_import, stream_import_results
+from ..services.student_service import STUDENT_IMPORT_COLUMNS, StudentService
+from ..routers.auth import get_current_user
 
 router = APIRouter(prefix="/api/students", tags=["students"])
 
@@ -39,85 +45,92 @@ def create_student(student: StudentCreate, db: Session = Depends(get_db)):
     return db_student
 
 
+@router.post("/import")
+def import_students(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Create or update students from a CSV, Excel (.xlsx) or NDJSON file (admin only).
+
+    Needs matriculation_number, first_name and last_name columns (or keys). The file is
+    read and upserted in chunks; the response streams one NDJSON result per row
+    ("created", "updated", "unchanged" or "error" with a message) and ends with a summary line.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    
+    try:
+        chunks = open_import(file, STUDENT_IMPORT_COLUMNS, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return stream_import_results(lambda db: StudentService.import_students(db, chunks))
+
+
 @router.get("/", response_model=List[StudentResponse])
-def get_students(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all students"""
-    students = db.query(Student).offset(skip).limit(limit).all()
+async def get_students(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = 0,
+    format: str = "json",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get students, oldest first.
+
+    Pass the X-Next-Cursor response header back as cursor to get the next page.
+    skip is still accepted for offset paging but gets slower the deeper it pages.
+    With format=ndjson all students after the cursor are streamed.
+    """
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'ndjson'")
+    
+    if format == "ndjson":
+        return stream_ndjson(
+            lambda stream_db: apply_keyset(stream_db.query(Student), Student, cursor),
+            StudentResponse.model_validate
+        )
+    
+    if skip and not cursor:
+        statement = apply_keyset(select(Student), Student, dialect_name=db.bind.dialect.name)
+        return (await db.scalars(statement.offset(skip).limit(limit))).all()
+    
+    students, next_cursor = await apaginate(db, select(Student), Student, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return students
 
 
 @router.get("/{student_id}", response_model=StudentResponse)
-def get_student(student_id: int, db: Session = Depends(get_db)):
+async def get_student(student_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get student by ID"""
-    student = db.query(Student).filter(Student.id == student_id).first()
+    student = await db.get(Student, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     return student
 
 
-@router.get("/{student_id}/evaluations")
-def get_student_evaluations(student_id: int, db: Session = Depends(get_db)):
-    """Get all evaluations for a specific student"""
-    from ..models import Evaluation, EvaluationScore
-    from sqlalchemy.orm import joinedload
-    from ..schemas import EvaluationResponse, RubricWithScores
+@router.get("/{student_id}/evaluations", response_model=List[Union[EvaluationResponse, EvaluationSummaryResponse]])
+async def get_student_evaluations(
+    student_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: str = "json",
+    fields: str = "full",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get evaluations for a specific student, newest first.
+
+    Returns one page per request with the next page's cursor in the X-Next-Cursor header;
+    format=ndjson streams all evaluations after the cursor (up to limit).
+    fields=summary leaves out rubrics and scores.
+    """
+    from ..models import Evaluation
+    from .evaluations import list_evaluations
     
-    student = db.query(Student).filter(Student.id == student_id).first()
+    student = await db.get(Student, student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    evaluations = db.query(Evaluation)\
-        .options(
-            joinedload(Evaluation.student),
-            joinedload(Evaluation.report_type),
-            joinedload(Evaluation.scores).joinedload(EvaluationScore.rubric)
-        )\
-        .filter(Evaluation.student_id == student_id)\
-        .order_by(Evaluation.created_at.desc())\
-        .all()
-    
-    result = []
-    for eval in evaluations:
-        rubrics_with_scores = []
-        for score in eval.scores:
-            rubrics_with_scores.append(RubricWithScores(
-                id=score.rubric.id,
-                report_type_id=score.rubric.report_type_id,
-                section_name=score.rubric.section_name,
-                max_points=score.rubric.max_points,
-                description=score.rubric.description,
-                criteria=score.rubric.criteria,
-                order=score.rubric.order,
-                created_at=score.rubric.created_at,
-                score=score.score,
-                feedback=score.feedback
-            ))
-        
-        result.append(EvaluationResponse(
-            id=eval.id,
-            student=StudentResponse(
-                id=eval.student.id,
-                first_name=eval.student.first_name,
-                last_name=eval.student.last_name,
-                matriculation_number=eval.student.matriculation_number,
-                created_at=eval.student.created_at
-            ),
-            report_type=ReportTypeResponse(
-                id=eval.report_type.id,
-                name=eval.report_type.name,
-                description=eval.report_type.description,
-                created_at=eval.report_type.created_at
-            ),
-            report_title=eval.report_title,
-            oberseminar_date=eval.oberseminar_date,
-            oberseminar_time=eval.oberseminar_time,
-            total_score=eval.total_score,
-            max_possible_score=eval.max_possible_score,
-            evaluation_method=eval.evaluation_method,
-            created_at=eval.created_at,
-            rubrics=rubrics_with_scores
-        ))
-    
-    return result
-
-
+    return await list_evaluations(db, response, Evaluation.student_id == student_id, cursor, limit, format, fields)
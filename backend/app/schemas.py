@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 
 
@@ -94,6 +94,22 @@ class RubricWithScores(RubricResponse):
     feedback: Optional[str] = None
 
 
+class RubricImportResult(BaseModel):
+    row: int
+    report_type: str
+    section_name: str
+    status: str  # created, updated, unchanged, error
+    rubric_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class RubricImportResponse(BaseModel):
+    applied: bool
+    report_types_created: List[str]
+    results: List[RubricImportResult]
+    summary: Dict[str, int]
+
+
 # Evaluation Schemas
 class EvaluationScoreCreate(BaseModel):
     rubric_id: int
@@ -128,6 +144,32 @@ class EvaluationResponse(BaseModel):
         from_attributes = True
 
 
+class StudentSummary(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+    matriculation_number: str
+
+
+class ReportTypeSummary(BaseModel):
+    id: int
+    name: str
+
+
+class EvaluationSummaryResponse(BaseModel):
+    """Evaluation without rubrics and scores, for overview lists"""
+    id: int
+    student: StudentSummary
+    report_type: ReportTypeSummary
+    report_title: str
+    oberseminar_date: Optional[str]
+    oberseminar_time: Optional[str]
+    total_score: float
+    max_possible_score: float
+    evaluation_method: str
+    created_at: datetime
+
+
 # Auth Schemas
 class Token(BaseModel):
     access_token: str
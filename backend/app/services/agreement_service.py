@@ -0,0 +1,259 @@
+from sqlalchemy import func, select, case
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from ..models import Evaluation, EvaluationScore, Rubric
+from .rubric_cache import parse_score_bands
+import threading
+import numpy as np
+
+AGREEMENT_COMPARE = ("method", "evaluator")
+AGREEMENT_METHODS = ("manual", "rule-based", "llm")
+AGREEMENT_FETCH_CHUNK_SIZE = 100000
+
+# Columns of the score matrix pulled from the database
+_EVALUATION_ID, _STUDENT_ID, _REPORT_TYPE_ID, _RATER, _RUBRIC_ID, _SCORE = range(6)
+
+
+def criteria_bands(criteria: Optional[dict]) -> Tuple[List[float], float]:
+    """Ascending lower bounds of the criteria score bands and the scale they are defined on"""
+    bands, scale = parse_score_bands(criteria)
+    return sorted({low for low, _, _ in bands}), scale
+
+
+class AgreementService:
+    """Agreement between raters who scored the same student and report type.
+
+    Raters are evaluation methods (manual, rule-based, llm) or evaluators. For every
+    pair of raters and rubric section the engine reports Cohen's kappa on the criteria
+    bands (unweighted and quadratic weighted), ICC(2,1) and the mean absolute deviation.
+    When a rater evaluated the same student and report type more than once, the latest
+    evaluation is used. Results are cached until evaluations are added or changed.
+    """
+
+    def __init__(self):
+        self._cache: Dict[tuple, Tuple[tuple, dict]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _data_version(db: Session) -> tuple:
+        """Cheap fingerprint of the evaluation data; changes when evaluations are added, removed or updated"""
+        count, max_id, last_update = db.query(
+            func.count(Evaluation.id), func.max(Evaluation.id), func.max(Evaluation.updated_at)
+        ).one()
+        return count, max_id, str(last_update)
+
+    @staticmethod
+    def _load_score_matrix(db: Session, compare: str, report_type_id: Optional[int] = None) -> np.ndarray:
+        """Fetch (evaluation, student, report type, rater, rubric, score) rows into a float64 array"""
+        if compare == "method":
+            rater = case(
+                *[(Evaluation.evaluation_method == method, index) for index, method in enumerate(AGREEMENT_METHODS)],
+                else_=-1
+            )
+        else:
+            rater = Evaluation.evaluator_id
+
+        stmt = select(
+            Evaluation.id,
+            Evaluation.student_id,
+            Evaluation.report_type_id,
+            rater,
+            EvaluationScore.rubric_id,
+            EvaluationScore.score
+        ).join(Evaluation, Evaluation.id == EvaluationScore.evaluation_id)
+        if compare == "evaluator":
+            stmt = stmt.where(Evaluation.evaluator_id.isnot(None))
+        if report_type_id is not None:
+            stmt = stmt.where(Evaluation.report_type_id == report_type_id)
+
+        result = db.connection().execute(stmt.execution_options(yield_per=AGREEMENT_FETCH_CHUNK_SIZE))
+        chunks = [np.array(list(map(tuple, chunk)), dtype=np.float64) for chunk in result.partitions()]
+        if not chunks:
+            return np.empty((0, 6), dtype=np.float64)
+        matrix = np.concatenate(chunks)
+        return matrix[matrix[:, _RATER] >= 0]
+
+    @staticmethod
+    def _latest_scores(matrix: np.ndarray) -> np.ndarray:
+        """Keep the latest score per (student, report type, rubric, rater), sorted by item and rater"""
+        order = np.lexsort((
+            -matrix[:, _EVALUATION_ID],
+            matrix[:, _RATER],
+            matrix[:, _RUBRIC_ID],
+            matrix[:, _REPORT_TYPE_ID],
+            matrix[:, _STUDENT_ID]
+        ))
+        matrix = matrix[order]
+        keys = matrix[:, [_STUDENT_ID, _REPORT_TYPE_ID, _RUBRIC_ID, _RATER]]
+        first = np.ones(matrix.shape[0], dtype=bool)
+        first[1:] = np.any(keys[1:] != keys[:-1], axis=1)
+        return matrix[first]
+
+    @staticmethod
+    def _pair_scores(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """All pairs of raters that scored the same item: rubric, rater a, rater b, score a, score b"""
+        items = matrix[:, [_STUDENT_ID, _REPORT_TYPE_ID, _RUBRIC_ID]]
+        new_item = np.ones(matrix.shape[0], dtype=bool)
+        new_item[1:] = np.any(items[1:] != items[:-1], axis=1)
+        item_index = np.cumsum(new_item) - 1
+        item_sizes = np.bincount(item_index)
+
+        parts = []
+        # Rows of one item are adjacent, so pairing row i with row i + offset covers every rater pair
+        for offset in range(1, int(item_sizes.max()) if item_sizes.size else 0):
+            same_item = item_index[offset:] == item_index[:-offset]
+            first = np.nonzero(same_item)[0]
+            parts.append((first, first + offset))
+        if not parts:
+            empty = np.empty(0)
+            return empty, empty, empty, empty, empty
+        left = np.concatenate([p[0] for p in parts])
+        right = np.concatenate([p[1] for p in parts])
+        return (
+            matrix[left, _RUBRIC_ID].astype(np.int64),
+            matrix[left, _RATER].astype(np.int64),
+            matrix[right, _RATER].astype(np.int64),
+            matrix[left, _SCORE],
+            matrix[right, _SCORE]
+        )
+
+    @staticmethod
+    def _band_indices(rubric_ids: np.ndarray, scores: np.ndarray, rubrics: Dict[int, Rubric]) -> Tuple[np.ndarray, int]:
+        """Map scores to criteria band indices, vectorized with a padded per-rubric bound table"""
+        unique_ids, rubric_index = np.unique(rubric_ids, return_inverse=True)
+        band_tables = []
+        scale_factors = np.empty(unique_ids.shape[0])
+        for i, rubric_id in enumerate(unique_ids):
+            rubric = rubrics.get(int(rubric_id))
+            bounds, scale = criteria_bands(rubric.criteria if rubric else None)
+            band_tables.append(bounds)
+            max_points = rubric.max_points if rubric and rubric.max_points else scale
+            scale_factors[i] = scale / max_points
+        band_count = max(len(bounds) for bounds in band_tables)
+        table = np.full((unique_ids.shape[0], band_count), np.inf)
+        for i, bounds in enumerate(band_tables):
+            table[i, :len(bounds)] = bounds
+            # Scores below the lowest bound still fall into the lowest band
+            table[i, 0] = -np.inf
+
+        normalized = scores * scale_factors[rubric_index]
+        bands = np.sum(normalized[:, None] >= table[rubric_index], axis=1) - 1
+        return bands, band_count
+
+    @staticmethod
+    def _compute(matrix: np.ndarray, rubrics: Dict[int, Rubric]) -> List[dict]:
+        if matrix.shape[0] == 0:
+            return []
+        rubric_ids, rater_a, rater_b, scores_a, scores_b = AgreementService._pair_scores(
+            AgreementService._latest_scores(matrix)
+        )
+        if rubric_ids.size == 0:
+            return []
+
+        # One cell per (rater a, rater b, rubric section)
+        cell_keys = np.stack([rater_a, rater_b, rubric_ids], axis=1)
+        cells, inverse, counts = np.unique(cell_keys, axis=0, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+        cell_count = cells.shape[0]
+
+        def cell_sum(values):
+            return np.bincount(inverse, weights=values, minlength=cell_count)
+
+        n = counts.astype(np.float64)
+        mean_absolute_deviations = cell_sum(np.abs(scores_a - scores_b)) / n
+
+        # Cohen's kappa from per-cell confusion matrices over the criteria bands
+        bands_a, band_count = AgreementService._band_indices(rubric_ids, scores_a, rubrics)
+        bands_b, _ = AgreementService._band_indices(rubric_ids, scores_b, rubrics)
+        confusion = np.bincount(
+            (inverse * band_count + bands_a) * band_count + bands_b, minlength=cell_count * band_count * band_count
+        ).reshape(cell_count, band_count, band_count).astype(np.float64)
+        observed = confusion / n[:, None, None]
+        expected = observed.sum(axis=2)[:, :, None] * observed.sum(axis=1)[:, None, :]
+        grid = np.arange(band_count)
+        quadratic_weights = (grid[:, None] - grid[None, :]) ** 2 / max(band_count - 1, 1) ** 2
+        kappas = AgreementService._kappa(
+            np.trace(observed, axis1=1, axis2=2), np.trace(expected, axis1=1, axis2=2)
+        )
+        weighted_kappas = AgreementService._kappa(
+            1 - (observed * quadratic_weights).sum(axis=(1, 2)), 1 - (expected * quadratic_weights).sum(axis=(1, 2))
+        )
+
+        # ICC(2,1): two-way random effects, absolute agreement, single rater (k = 2)
+        grand_means = cell_sum(scores_a + scores_b) / (2 * n)
+        mean_a = cell_sum(scores_a) / n
+        mean_b = cell_sum(scores_b) / n
+        subject_means = (scores_a + scores_b) / 2
+        ss_rows = 2 * cell_sum((subject_means - grand_means[inverse]) ** 2)
+        ss_columns = n * ((mean_a - grand_means) ** 2 + (mean_b - grand_means) ** 2)
+        ss_total = cell_sum((scores_a - grand_means[inverse]) ** 2 + (scores_b - grand_means[inverse]) ** 2)
+        ss_error = ss_total - ss_rows - ss_columns
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ms_rows = ss_rows / (n - 1)
+            ms_columns = ss_columns
+            ms_error = ss_error / (n - 1)
+            iccs = (ms_rows - ms_error) / (ms_rows + ms_error + 2 * (ms_columns - ms_error) / n)
+        iccs = np.where((n >= 2) & np.isfinite(iccs), iccs, np.nan)
+
+        pairs = {}
+        for i in range(cell_count):
+            a, b, rubric_id = (int(v) for v in cells[i])
+            rubric = rubrics.get(rubric_id)
+            max_points = rubric.max_points if rubric else None
+            pairs.setdefault((a, b), []).append({
+                "rubric_id": rubric_id,
+                "report_type_id": rubric.report_type_id if rubric else None,
+                "section_name": rubric.section_name if rubric else None,
+                "max_points": max_points,
+                "n": int(counts[i]),
+                "kappa": AgreementService._round(kappas[i]),
+                "weighted_kappa": AgreementService._round(weighted_kappas[i]),
+                "icc": AgreementService._round(iccs[i]),
+                "mean_absolute_deviation": AgreementService._round(mean_absolute_deviations[i]),
+                "mean_absolute_deviation_percentage": AgreementService._round(
+                    mean_absolute_deviations[i] / max_points * 100 if max_points else np.nan
+                )
+            })
+        return [{"rater_a": a, "rater_b": b, "sections": sections} for (a, b), sections in pairs.items()]
+
+    @staticmethod
+    def _kappa(observed_agreement: np.ndarray, expected_agreement: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kappa = (observed_agreement - expected_agreement) / (1 - expected_agreement)
+        # All ratings in a single band on both sides: perfect agreement by convention
+        return np.where(np.isclose(expected_agreement, 1.0), np.where(np.isclose(observed_agreement, 1.0), 1.0, 0.0), kappa)
+
+    @staticmethod
+    def _round(value) -> Optional[float]:
+        value = float(value)
+        return None if np.isnan(value) else round(value, 3)
+
+    def get_agreement(self, db: Session, compare: str = "method", report_type_id: Optional[int] = None) -> dict:
+        """Agreement per rater pair and rubric section, served from cache while the data is unchanged"""
+        if compare not in AGREEMENT_COMPARE:
+            raise ValueError(f"compare must be one of: {', '.join(AGREEMENT_COMPARE)}")
+
+        cache_key = (compare, report_type_id)
+        version = self._data_version(db)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        matrix = self._load_score_matrix(db, compare, report_type_id)
+        rubric_ids = np.unique(matrix[:, _RUBRIC_ID]).astype(np.int64).tolist() if matrix.shape[0] else []
+        rubrics = {rubric.id: rubric for rubric in db.query(Rubric).filter(Rubric.id.in_(rubric_ids)).all()}
+        pairs = self._compute(matrix, rubrics)
+        for pair in pairs:
+            if compare == "method":
+                pair["rater_a"] = AGREEMENT_METHODS[pair["rater_a"]]
+                pair["rater_b"] = AGREEMENT_METHODS[pair["rater_b"]]
+            pair["sections"].sort(key=lambda section: (section["report_type_id"] or 0, section["rubric_id"]))
+
+        result = {"compare": compare, "report_type_id": report_type_id, "pairs": pairs}
+        with self._lock:
+            self._cache[cache_key] = (version, result)
+        return result
+
+
+agreement_service = AgreementService()
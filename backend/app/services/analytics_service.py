@@ -0,0 +1,199 @@
+from sqlalchemy import func, select, extract
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from ..models import Evaluation, EvaluationScore, Rubric
+import re
+import numpy as np
+
+ANALYTICS_FETCH_CHUNK_SIZE = 100000
+ANALYTICS_GROUP_BY = ("report_type", "evaluator", "semester")
+ANALYTICS_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Columns of the score matrix pulled from the database; the group columns depend on group_by
+_SCORE, _MAX_POINTS, _RUBRIC_ID, _GROUP = range(4)
+
+
+def semester_label(code: int) -> Optional[str]:
+    """Format a semester code (year * 2, plus 1 for winter) as e.g. 'SS 2026' or 'WS 2025/26'"""
+    year, winter = divmod(int(code), 2)
+    if year <= 0:
+        return None
+    if winter:
+        return f"WS {year}/{(year + 1) % 100:02d}"
+    return f"SS {year}"
+
+
+def semester_date_range(label: str) -> Tuple[date, date]:
+    """Return the first and last day of a semester given as 'SS 2026' or 'WS 2025/26'"""
+    match = re.fullmatch(r"\s*(SS|WS)\s*(\d{4})(?:/\d{2})?\s*", label or "", re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid semester: {label}. Use e.g. 'SS 2026' or 'WS 2025/26'")
+    year = int(match.group(2))
+    if match.group(1).upper() == "SS":
+        return date(year, 4, 1), date(year, 9, 30)
+    return date(year, 10, 1), date(year + 1, 3, 31)
+
+
+class AnalyticsService:
+    """Per-rubric-section score distributions computed with NumPy.
+
+    Scores are streamed from one joined query into a float matrix (one column per field)
+    and all statistics are computed with array operations over the whole matrix, so the
+    cost per score row is a few vectorized passes rather than Python object handling.
+    """
+
+    @staticmethod
+    def _load_score_matrix(db: Session, group_by: str, report_type_id: Optional[int] = None,
+                           evaluator_id: Optional[int] = None, date_from: Optional[date] = None,
+                           date_to: Optional[date] = None) -> np.ndarray:
+        """Fetch score rows in chunks into a float64 array (score, max points, rubric id, group columns)"""
+        if group_by == "report_type":
+            group_columns = [Evaluation.report_type_id]
+        elif group_by == "evaluator":
+            group_columns = [func.coalesce(Evaluation.evaluator_id, 0)]
+        else:
+            group_columns = [
+                func.coalesce(extract("year", Evaluation.created_at), 0),
+                func.coalesce(extract("month", Evaluation.created_at), 0)
+            ]
+        column_count = 3 + len(group_columns)
+        stmt = select(
+            EvaluationScore.score,
+            Rubric.max_points,
+            Rubric.id,
+            *group_columns
+        ).join(Rubric, Rubric.id == EvaluationScore.rubric_id)\
+            .join(Evaluation, Evaluation.id == EvaluationScore.evaluation_id)
+
+        if report_type_id is not None:
+            stmt = stmt.where(Evaluation.report_type_id == report_type_id)
+        if evaluator_id is not None:
+            stmt = stmt.where(Evaluation.evaluator_id == evaluator_id)
+        if date_from:
+            stmt = stmt.where(Evaluation.created_at >= datetime.combine(date_from, time.min))
+        if date_to:
+            stmt = stmt.where(Evaluation.created_at < datetime.combine(date_to + timedelta(days=1), time.min))
+
+        result = db.connection().execute(stmt.execution_options(yield_per=ANALYTICS_FETCH_CHUNK_SIZE))
+        # Plain tuples convert to an array far faster than Row objects
+        chunks = [np.array(list(map(tuple, chunk)), dtype=np.float64) for chunk in result.partitions()]
+        if not chunks:
+            return np.empty((0, column_count), dtype=np.float64)
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def _semester_codes(years: np.ndarray, months: np.ndarray) -> np.ndarray:
+        """Summer semester: April to September; winter semester: October to March (counted from its start year)"""
+        years = years.astype(np.int64)
+        months = months.astype(np.int64)
+        winter = (months >= 10) | (months <= 3)
+        start_year = np.where(months <= 3, years - 1, years)
+        return np.where(years > 0, start_year * 2 + winter, 0)
+
+    @staticmethod
+    def _group_percentiles(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray,
+                           percentile: float) -> np.ndarray:
+        """Linear-interpolated percentile of every group in a group-sorted value array"""
+        position = starts + (counts - 1) * (percentile / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, starts + counts - 1)
+        fraction = position - lower
+        return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+    @staticmethod
+    def get_section_distributions(db: Session, group_by: str = "report_type", report_type_id: Optional[int] = None,
+                                  evaluator_id: Optional[int] = None, semester: Optional[str] = None,
+                                  bins: int = 10) -> dict:
+        """Histogram, percentiles, mean/std and percentage of max per rubric section and group"""
+        if group_by not in ANALYTICS_GROUP_BY:
+            raise ValueError(f"group_by must be one of: {', '.join(ANALYTICS_GROUP_BY)}")
+        if bins < 1 or bins > 100:
+            raise ValueError("bins must be between 1 and 100")
+
+        date_from, date_to = semester_date_range(semester) if semester else (None, None)
+        matrix = AnalyticsService._load_score_matrix(db, group_by, report_type_id, evaluator_id, date_from, date_to)
+        bin_edges = np.linspace(0.0, 100.0, bins + 1)
+        response = {
+            "group_by": group_by,
+            "total_scores": int(matrix.shape[0]),
+            "histogram_bin_edges_percentage": [round(float(edge), 2) for edge in bin_edges],
+            "groups": []
+        }
+        if matrix.shape[0] == 0:
+            return response
+
+        scores = matrix[:, _SCORE]
+        max_points = matrix[:, _MAX_POINTS]
+        rubric_ids = matrix[:, _RUBRIC_ID].astype(np.int64)
+        if group_by == "semester":
+            group_keys = AnalyticsService._semester_codes(matrix[:, _GROUP], matrix[:, _GROUP + 1])
+        else:
+            group_keys = matrix[:, _GROUP].astype(np.int64)
+
+        # One integer key per (group, rubric section); inverse maps every score row to its cell
+        combined = group_keys * (int(rubric_ids.max()) + 1) + rubric_ids
+        cells, inverse, counts = np.unique(combined, return_inverse=True, return_counts=True)
+        cell_count = cells.shape[0]
+
+        percentages = np.divide(scores * 100.0, max_points, out=np.zeros_like(scores), where=max_points > 0)
+        sums = np.bincount(inverse, weights=scores, minlength=cell_count)
+        sum_squares = np.bincount(inverse, weights=scores * scores, minlength=cell_count)
+        percentage_sums = np.bincount(inverse, weights=percentages, minlength=cell_count)
+        means = sums / counts
+        std_devs = np.sqrt(np.maximum(sum_squares / counts - means * means, 0.0))
+        mean_percentages = percentage_sums / counts
+
+        # Sort scores within each cell once; min, max and percentiles are then index lookups
+        order = np.lexsort((scores, inverse))
+        sorted_scores = scores[order]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        minimums = sorted_scores[starts]
+        maximums = sorted_scores[starts + counts - 1]
+        percentiles = {
+            p: AnalyticsService._group_percentiles(sorted_scores, starts, counts, p) for p in ANALYTICS_PERCENTILES
+        }
+
+        bin_index = np.clip((percentages / 100.0 * bins).astype(np.int64), 0, bins - 1)
+        histograms = np.bincount(inverse * bins + bin_index, minlength=cell_count * bins).reshape(cell_count, bins)
+
+        cell_group_keys = group_keys[order][starts]
+        cell_rubric_ids = rubric_ids[order][starts]
+        rubrics = {
+            rubric.id: rubric for rubric in db.query(Rubric).filter(Rubric.id.in_(np.unique(cell_rubric_ids).tolist())).all()
+        }
+
+        groups = {}
+        for i in range(cell_count):
+            group_key = int(cell_group_keys[i])
+            if group_key not in groups:
+                if group_by == "report_type":
+                    groups[group_key] = {"report_type_id": group_key, "sections": []}
+                elif group_by == "evaluator":
+                    groups[group_key] = {"evaluator_id": group_key or None, "sections": []}
+                else:
+                    groups[group_key] = {"semester": semester_label(group_key), "sections": []}
+
+            rubric = rubrics.get(int(cell_rubric_ids[i]))
+            groups[group_key]["sections"].append({
+                "rubric_id": int(cell_rubric_ids[i]),
+                "report_type_id": rubric.report_type_id if rubric else None,
+                "section_name": rubric.section_name if rubric else None,
+                "max_points": rubric.max_points if rubric else None,
+                "count": int(counts[i]),
+                "mean": round(float(means[i]), 2),
+                "std_dev": round(float(std_devs[i]), 2),
+                "min": round(float(minimums[i]), 2),
+                "max": round(float(maximums[i]), 2),
+                "mean_percentage": round(float(mean_percentages[i]), 2),
+                "percentiles": {f"p{p}": round(float(values[i]), 2) for p, values in percentiles.items()},
+                "histogram": histograms[i].tolist()
+            })
+
+        for group in groups.values():
+            group["sections"].sort(key=lambda section: (
+                (rubrics[section["rubric_id"]].order or 0) if section["rubric_id"] in rubrics else 0,
+                section["rubric_id"]
+            ))
+        response["groups"] = list(groups.values())
+        return response
@@ -1,9 +1,26 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from ..models import Evaluation, EvaluationScore, Student, Rubric
-from ..schemas import EvaluationCreate, EvaluationScoreCreate
+from sqlalchemy import String, bindparam, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Dict, Iterable, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ..database import SQLITE_TIMESTAMP_FORMAT
+from ..models import Evaluation, EvaluationScore, Student, Rubric, ReportType
+from ..schemas import EvaluationCreate, EvaluationScoreCreate, RubricResponse
+from .llm_cache import llm_cache, LLM_CACHE_ENABLED
+from .llm_client import get_openai_api_key, get_async_openai_client, GROQ_BASE_URL
+from .statistics_service import StatisticsService
+from .rubric_cache import RubricCacheEntry, rubric_cache
+from .rule_engine import compiled_rules
+from .rule_grading import RULE_GRADING_CHUNK_SIZE, ReportScores, rule_grading_pool
+from .import_utils import column, first_errors, normalize_column_name
+from datetime import datetime
 import os
 import json
+import asyncio
+import sqlite3
+import threading
+import pandas as pd
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,19 +31,90 @@ for path in ("/app/backend/.env", "/app/.env", os.path.join(os.path.dirname(__fi
         load_dotenv(path, override=True)
         break
 
+# Upper bound for concurrent language model calls in batch evaluations
+LLM_BATCH_MAX_CONCURRENCY = int(os.getenv("LLM_BATCH_MAX_CONCURRENCY", "8"))
+
+LLM_TEMPERATURE = 0.2
+OPENAI_MODEL = "gpt-4"
+GROQ_MODELS = [
+    "llama-3.3-70b-versatile",
+    "llama-3.1-8b-instant",
+    "gemma2-9b-it",
+    "llama-3.2-3b-instruct"
+]
+LLM_SYSTEM_PROMPT = (
+    "You are an expert academic evaluator. You evaluate student reports based on detailed rubrics "
+    "and criteria. Always respond with valid JSON only, no additional text."
+)
+LLM_FALLBACK_SYSTEM_PROMPT = (
+    LLM_SYSTEM_PROMPT + " Your response must be a valid JSON object with a 'scores' array."
+)
+
+EVALUATION_METHODS = ("manual", "rule-based", "llm")
+# Besides these, an evaluation import has one score column per rubric section (named like
+# the section) and optionally "<section> feedback", evaluation_method, evaluated_at,
+# oberseminar_date and oberseminar_time columns
+EVALUATION_IMPORT_COLUMNS = ("matriculation_number", "report_title")
+
+
+
+def _evaluation_detail_options():
+    """Eager loads for a single evaluation with student, report type and scored rubrics"""
+    return (
+        joinedload(Evaluation.student),
+        joinedload(Evaluation.report_type),
+        joinedload(Evaluation.scores).joinedload(EvaluationScore.rubric)
+    )
+
+
+def _evaluation_list_options():
+    """Like _evaluation_detail_options, but scores come from a separate IN query so LIMIT applies to evaluations"""
+    return (
+        joinedload(Evaluation.student),
+        joinedload(Evaluation.report_type),
+        selectinload(Evaluation.scores).joinedload(EvaluationScore.rubric)
+    )
+
+
+def _evaluation_summary_columns():
+    return (
+        Evaluation.id.label("id"),
+        Evaluation.report_title,
+        Evaluation.oberseminar_date,
+        Evaluation.oberseminar_time,
+        Evaluation.total_score,
+        Evaluation.max_possible_score,
+        Evaluation.evaluation_method,
+        Evaluation.created_at.label("created_at"),
+        Student.id.label("student_id"),
+        Student.first_name,
+        Student.last_name,
+        Student.matriculation_number,
+        ReportType.id.label("report_type_id"),
+        ReportType.name.label("report_type_name")
+    )
+
 
 class EvaluationService:
     def __init__(self):
         self.openai_client = None
+        self._client_lock = threading.Lock()
 
     def create_evaluation(
         self, db: Session, evaluation_data: EvaluationCreate, evaluator_id: Optional[int] = None
     ) -> Evaluation:
-        """Create a new evaluation"""
+        """Create a new evaluation with its scores in a single transaction.
+
+        The evaluation is inserted with its server defaults (id, created_at) returned by the
+        INSERT itself, the scores follow as one executemany INSERT, and both are committed
+        together with the statistics rollup. The returned evaluation has its student, report
+        type and scored rubrics attached, so it can be formatted without further queries.
+        """
         total_score = sum(score.score for score in evaluation_data.scores)
         
         rubric_ids = [score.rubric_id for score in evaluation_data.scores]
         rubrics = db.query(Rubric).filter(Rubric.id.in_(rubric_ids)).all()
+        rubrics_by_id = {rubric.id: rubric for rubric in rubrics}
         max_possible_score = sum(rubric.max_points for rubric in rubrics)
         
         evaluation = Evaluation(
@@ -38,79 +126,244 @@ class EvaluationService:
             total_score=total_score,
             max_possible_score=max_possible_score,
             evaluation_method=evaluation_data.evaluation_method,
-            evaluator_id=evaluator_id
+            evaluator_id=evaluator_id,
+            student=db.get(Student, evaluation_data.student_id),
+            report_type=db.get(ReportType, evaluation_data.report_type_id)
         )
         db.add(evaluation)
-        db.commit()
-        db.refresh(evaluation)
+        db.flush()
         
-        for score_data in evaluation_data.scores:
-            score = EvaluationScore(
-                evaluation_id=evaluation.id,
-                rubric_id=score_data.rubric_id,
-                score=score_data.score,
-                feedback=score_data.feedback
-            )
-            db.add(score)
+        score_rows = [
+            {
+                "evaluation_id": evaluation.id,
+                "rubric_id": score_data.rubric_id,
+                "score": score_data.score,
+                "feedback": score_data.feedback
+            }
+            for score_data in evaluation_data.scores
+        ]
+        if score_rows:
+            db.execute(insert(EvaluationScore), score_rows)
+        StatisticsService.record_evaluation(db, evaluation)
         
-        db.commit()
-        from sqlalchemy.orm import joinedload
-        evaluation = db.query(Evaluation)\
-            .options(joinedload(Evaluation.student),
-                    joinedload(Evaluation.report_type),
-                    joinedload(Evaluation.scores).joinedload(EvaluationScore.rubric))\
-            .filter(Evaluation.id == evaluation.id).first()
+        # Keep the flushed state instead of expiring it, so building the response needs no reload
+        expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+        try:
+            db.commit()
+        finally:
+            db.expire_on_commit = expire_on_commit
+        
+        scores = []
+        for row in score_rows:
+            score = EvaluationScore(**row)
+            set_committed_value(score, "rubric", rubrics_by_id.get(row["rubric_id"]))
+            scores.append(score)
+        set_committed_value(evaluation, "scores", scores)
         return evaluation
 
-    def evaluate_with_llm(
-        self, db: Session, student_id: int, report_type_id: int, 
-        report_title: str, report_content: str, evaluator_id: Optional[int] = None
-    ) -> Optional[Evaluation]:
-        """Evaluate using language model based on defined criteria"""
-        try:
-            import sys
-            import importlib.util
-            
+    @staticmethod
+    def evaluation_import_columns(rubric_entry: RubricCacheEntry) -> List[str]:
+        """Columns an evaluation import file for the entry's report type must have"""
+        return [*EVALUATION_IMPORT_COLUMNS, *(normalize_column_name(r.section_name) for r in rubric_entry.rubrics)]
+
+    def bulk_create_evaluations(
+        self, db: Session, report_type_id: int, chunks: Iterable[pd.DataFrame], evaluator_id: Optional[int] = None
+    ) -> Iterator[List[Dict]]:
+        """Create evaluations from import chunks, one transaction per chunk, yielding the per-row results of each chunk.
+
+        Each row is one evaluation of the report type. Students are looked up by matriculation
+        number with one query per chunk and rubric sections are matched to columns by name, so
+        a chunk is written with an INSERT for the evaluations, one executemany for their scores
+        and one rollup upsert per statistics group. Rows with unknown students, missing or
+        out-of-range scores are reported with status "error" and skipped.
+        """
+        rubric_entry = rubric_cache.get(db, report_type_id)
+        rubrics_by_column = {
+            normalize_column_name(section_name): rubric
+            for section_name, rubric in rubric_entry.rubrics_by_section.items()
+        }
+        for chunk in chunks:
+            yield self._import_evaluation_chunk(db, chunk, report_type_id, rubrics_by_column, evaluator_id)
+
+    @staticmethod
+    def _import_evaluation_chunk(
+        db: Session, chunk: pd.DataFrame, report_type_id: int, rubrics_by_column: Dict[str, RubricResponse],
+        evaluator_id: Optional[int]
+    ) -> List[Dict]:
+        matriculation_numbers = column(chunk, "matriculation_number")
+        report_titles = column(chunk, "report_title")
+        methods = column(chunk, "evaluation_method").mask(lambda methods: methods == "", "manual")
+        evaluated_at_text = column(chunk, "evaluated_at")
+        # Naive UTC, like the server-side created_at default
+        evaluated_at = pd.to_datetime(evaluated_at_text.mask(evaluated_at_text == ""), errors="coerce",
+                                      format="mixed", utc=True).dt.tz_localize(None)
+        students = dict(db.execute(
+            select(Student.matriculation_number, Student.id)
+            .where(Student.matriculation_number.in_(matriculation_numbers.unique().tolist()))
+        ).all())
+        student_ids = matriculation_numbers.map(students)
+        scores = pd.DataFrame(
+            {rubric.id: pd.to_numeric(column(chunk, name), errors="coerce") for name, rubric in rubrics_by_column.items()},
+            index=chunk.index
+        )
+
+        checks = [
+            (matriculation_numbers == "", "matriculation_number is required"),
+            (report_titles == "", "report_title is required"),
+            (~methods.isin(EVALUATION_METHODS), f"evaluation_method must be one of: {', '.join(EVALUATION_METHODS)}"),
+            ((evaluated_at_text != "") & evaluated_at.isna(), "evaluated_at must be a date or date and time"),
+        ]
+        for rubric in rubrics_by_column.values():
+            score = scores[rubric.id]
+            checks.append((score.isna(), f"Score for '{rubric.section_name}' is missing or not a number"))
+            checks.append(((score < 0) | (score > rubric.max_points),
+                           f"Score for '{rubric.section_name}' must be between 0 and {rubric.max_points}"))
+        checks.append((student_ids.isna(), "No student with this matriculation number"))
+        errors = first_errors(chunk, checks)
+        valid = errors == ""
+
+        total_scores = scores.sum(axis=1)
+        evaluation_ids = pd.Series(None, index=chunk.index, dtype=object)
+        if valid.any():
             try:
-                import httpx
-                import inspect
-                client_init = inspect.signature(httpx.Client.__init__)
-                if 'proxies' not in client_init.parameters:
+                evaluation_ids[valid] = EvaluationService._insert_imported_evaluations(
+                    db, chunk[valid], report_type_id, rubrics_by_column, evaluator_id,
+                    student_ids[valid], methods[valid], evaluated_at[valid], scores[valid], total_scores[valid]
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Evaluation import chunk failed: {e}")
+                errors[valid] = f"Could not save the row: {e}"
+                valid[:] = False
+
+        results = []
+        for row, is_valid, matriculation_number, evaluation_id, total_score, error in zip(
+                chunk.index, valid, matriculation_numbers, evaluation_ids, total_scores, errors):
+            result = {"row": int(row), "status": "created" if is_valid else "error",
+                      "matriculation_number": matriculation_number}
+            if is_valid:
+                result.update({"evaluation_id": int(evaluation_id), "total_score": float(total_score)})
+            else:
+                result["error"] = error
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _insert_imported_evaluations(
+        db: Session, rows: pd.DataFrame, report_type_id: int, rubrics_by_column: Dict[str, RubricResponse],
+        evaluator_id: Optional[int], student_ids: pd.Series, methods: pd.Series, evaluated_at: pd.Series,
+        scores: pd.DataFrame, total_scores: pd.Series
+    ) -> pd.Series:
+        """Insert validated import rows with their scores and rollups (does not commit); returns the evaluation ids"""
+        max_possible_score = sum(rubric.max_points for rubric in rubrics_by_column.values())
+        evaluations = pd.DataFrame({
+            "student_id": student_ids.astype(int),
+            "report_type_id": report_type_id,
+            "report_title": rows["report_title"],
+            "oberseminar_date": column(rows, "oberseminar_date").where(lambda values: values != "", None),
+            "oberseminar_time": column(rows, "oberseminar_time").where(lambda values: values != "", None),
+            "total_score": total_scores,
+            "max_possible_score": max_possible_score,
+            "evaluation_method": methods,
+            "evaluator_id": evaluator_id,
+        })
+
+        evaluation_ids = pd.Series(None, index=rows.index, dtype=object)
+        table = Evaluation.__table__
+        has_date = evaluated_at.notna()
+        # Rows without evaluated_at keep the server's created_at default, so they go in a
+        # statement without that column
+        for dated in (False, True):
+            group = has_date == dated
+            if not group.any():
+                continue
+            records = evaluations[group]
+            statement = insert(table)
+            if dated:
+                created_at = [value.to_pydatetime().replace(microsecond=0) for value in evaluated_at[group]]
+                if db.get_bind().dialect.name == "sqlite":
+                    # Store the text the CURRENT_TIMESTAMP default produces: a bound datetime gets
+                    # ".000000" appended and then sorts apart from server-written rows of the same second
+                    created_at = [value.strftime(SQLITE_TIMESTAMP_FORMAT) for value in created_at]
+                    statement = statement.values(created_at=bindparam("created_at", type_=String))
+                records = records.assign(created_at=created_at)
+            ids = list(db.execute(
+                statement.returning(table.c.id, sort_by_parameter_order=True), records.to_dict("records")
+            ).scalars())
+            evaluation_ids[group] = ids
+
+        feedback = {
+            rubric.id: column(rows, f"{name}_feedback").where(lambda values: values != "", None)
+            for name, rubric in rubrics_by_column.items()
+        }
+        score_rows = [
+            {"evaluation_id": evaluation_id, "rubric_id": rubric_id, "score": score, "feedback": feedback_text}
+            for rubric_id in scores.columns
+            for evaluation_id, score, feedback_text in zip(evaluation_ids, scores[rubric_id], feedback[rubric_id])
+        ]
+        db.execute(insert(EvaluationScore.__table__), score_rows)
+
+        today = datetime.utcnow().date()
+        StatisticsService.record_evaluations(db, [
+            {
+                "report_type_id": report_type_id,
+                "evaluator_id": evaluator_id,
+                "evaluation_method": method,
+                "day": created_at.date() if dated else today,
+                "total_score": total_score,
+                "max_possible_score": max_possible_score
+            }
+            for method, created_at, dated, total_score in zip(methods, evaluated_at, has_date, total_scores)
+        ])
+        return evaluation_ids
+
+    def _get_openai_client(self):
+        """Lazily initialize the language model client (shared across threads)"""
+        if self.openai_client:
+            return self.openai_client
+
+        with self._client_lock:
+            if self.openai_client:
+                return self.openai_client
+
+            try:
+                import sys
+                import importlib.util
+                
+                try:
+                    import httpx
+                    import inspect
+                    client_init = inspect.signature(httpx.Client.__init__)
+                    if 'proxies' not in client_init.parameters:
+                        pass
+                except Exception:
                     pass
-            except Exception:
-                pass
+                
+                from openai import OpenAI
+            except ImportError:
+                raise Exception("OpenAI package not installed. Please install it with: pip install openai")
+            except Exception as import_error:
+                if "proxies" in str(import_error) or "httpx" in str(import_error).lower():
+                    raise Exception(
+                        "OpenAI package compatibility issue detected. "
+                        "Please update packages by running: "
+                        "pip install --upgrade openai httpx>=0.27.0"
+                    )
+                raise Exception(f"Failed to import OpenAI: {str(import_error)}")
             
-            from openai import OpenAI
-        except ImportError:
-            raise Exception("OpenAI package not installed. Please install it with: pip install openai")
-        except Exception as import_error:
-            if "proxies" in str(import_error) or "httpx" in str(import_error).lower():
-                raise Exception(
-                    "OpenAI package compatibility issue detected. "
-                    "Please update packages by running: "
-                    "pip install --upgrade openai httpx>=0.27.0"
-                )
-            raise Exception(f"Failed to import OpenAI: {str(import_error)}")
-        
-        if not self.openai_client:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                for env_path in ("/app/backend/.env", os.path.join(os.path.dirname(__file__), "..", "..", ".env")):
-                    if env_path and os.path.isfile(env_path):
-                        load_dotenv(env_path, override=True)
-                        api_key = os.getenv("OPENAI_API_KEY")
-                        if api_key:
-                            break
-            if not api_key:
-                raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
+            api_key = get_openai_api_key()
+            
+            # Batch evaluations keep up to LLM_BATCH_MAX_CONCURRENCY requests in flight
+            max_connections = max(10, LLM_BATCH_MAX_CONCURRENCY)
             
             if api_key.startswith("gsk_"):
-                base_url = "https://api.groq.com/openai/v1"
+                base_url = GROQ_BASE_URL
                 try:
                     import httpx
                     http_client = httpx.Client(
                         timeout=httpx.Timeout(60.0, connect=10.0),
-                        limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+                        limits=httpx.Limits(max_keepalive_connections=5, max_connections=max_connections)
                     )
                     self.openai_client = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
                 except Exception as e1:
@@ -125,7 +378,7 @@ class EvaluationService:
                     import httpx
                     http_client = httpx.Client(
                         timeout=httpx.Timeout(60.0, connect=10.0),
-                        limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+                        limits=httpx.Limits(max_keepalive_connections=5, max_connections=max_connections)
                     )
                     self.openai_client = OpenAI(api_key=api_key, http_client=http_client)
                 except Exception as e1:
@@ -140,32 +393,15 @@ class EvaluationService:
                             f"Please update packages: pip install --upgrade openai httpx>=0.27.0\n"
                             f"Errors: {'; '.join(initialization_errors)}"
                         )
-        
-        rubrics = db.query(Rubric).filter(
-            Rubric.report_type_id == report_type_id
-        ).order_by(Rubric.order).all()
-        
-        if not rubrics:
-            raise Exception("No rubrics found for this report type")
-        
-        rubric_sections = []
-        for r in rubrics:
-            section_text = f"## {r.section_name} (Max: {r.max_points} points)\n"
-            section_text += f"Description: {r.description or 'No description provided'}\n"
-            
-            if r.criteria and isinstance(r.criteria, dict):
-                section_text += "\nEvaluation Criteria:\n"
-                for score_range, criterion_desc in r.criteria.items():
-                    section_text += f"- Score {score_range}: {criterion_desc}\n"
-            
-            rubric_sections.append(section_text)
-        
-        rubric_text = "\n\n".join(rubric_sections)
-        
+            return self.openai_client
+
+    @staticmethod
+    def _build_llm_prompt(rubric_text: str, report_title: str, report_content: str) -> str:
+        """Build the evaluation prompt from the report and the pre-rendered rubric block"""
         content_length = min(len(report_content), 8000)
         report_content_limited = report_content[:content_length]
         
-        prompt = f"""You are an academic evaluator. Evaluate the following report based on the detailed rubrics and criteria provided.
+        return f"""You are an academic evaluator. Evaluate the following report based on the detailed rubrics and criteria provided.
 
 Report Title: {report_title}
 
@@ -206,225 +442,553 @@ Format your response as valid JSON:
   ]
 }}
 """
-        
+
+    @staticmethod
+    def _llm_models() -> List[str]:
+        """Models to try in order: the Groq fallback chain for Groq keys, otherwise the OpenAI model"""
+        if os.getenv("OPENAI_API_KEY", "").startswith("gsk_"):
+            return list(GROQ_MODELS)
+        return [OPENAI_MODEL]
+
+    @staticmethod
+    def _llm_cache_key(prompt: str, models: List[str], rubric_version: Optional[str]) -> Optional[str]:
+        """Result cache key for a prompt, or None when the result is not cached"""
+        if rubric_version is None or not LLM_CACHE_ENABLED:
+            return None
+        return llm_cache.make_key(prompt, models[0], LLM_TEMPERATURE, rubric_version)
+
+    @staticmethod
+    def _cached_llm_result(cache_key: str) -> Optional[dict]:
         try:
-            api_key = os.getenv("OPENAI_API_KEY", "")
-            if api_key.startswith("gsk_"):
-                groq_models = [
-                    "llama-3.3-70b-versatile",
-                    "llama-3.1-8b-instant",
-                    "gemma2-9b-it",
-                    "llama-3.2-3b-instruct"
-                ]
-                model = groq_models[0]
-            else:
-                model = "gpt-4"
-            
-            response = None
-            last_error = None
-            
-            for attempt_model in (groq_models if api_key.startswith("gsk_") else [model]):
-                try:
-                    try:
-                        response = self.openai_client.chat.completions.create(
-                            model=attempt_model,
-                            messages=[
-                                {
-                                    "role": "system", 
-                                    "content": "You are an expert academic evaluator. You evaluate student reports based on detailed rubrics and criteria. Always respond with valid JSON only, no additional text."
-                                },
-                                {"role": "user", "content": prompt}
-                            ],
-                            temperature=0.2,
-                            response_format={"type": "json_object"}
-                        )
-                        model = attempt_model
-                        break
-                    except Exception as format_error:
-                        if "response_format" in str(format_error).lower() or "json_object" in str(format_error).lower():
-                            print(f"Warning: response_format not supported for {attempt_model}, using fallback: {format_error}")
-                            response = self.openai_client.chat.completions.create(
-                                model=attempt_model,
-                                messages=[
-                                    {
-                                        "role": "system", 
-                                        "content": "You are an expert academic evaluator. You evaluate student reports based on detailed rubrics and criteria. Always respond with valid JSON only, no additional text. Your response must be a valid JSON object with a 'scores' array."
-                                    },
-                                    {"role": "user", "content": prompt}
-                                ],
-                                temperature=0.2
-                            )
-                            model = attempt_model
-                            break
-                        else:
-                            last_error = format_error
-                            if "decommissioned" in str(format_error).lower():
-                                print(f"Model {attempt_model} is decommissioned, trying next model...")
-                                continue
-                            raise
-                except Exception as e:
-                    last_error = e
-                    if "decommissioned" in str(e).lower() and attempt_model != groq_models[-1]:
-                        print(f"Model {attempt_model} failed: {e}, trying next model...")
-                        continue
-                    raise
-            
-            if response is None:
-                raise Exception(f"All models failed. Last error: {str(last_error)}")
+            return llm_cache.get(cache_key)
+        except sqlite3.Error as e:
+            print(f"Warning: LLM cache lookup failed: {e}")
+            return None
+
+    @staticmethod
+    def _store_llm_result(cache_key: str, model: str, result: dict):
+        try:
+            llm_cache.set(cache_key, model, result)
+        except sqlite3.Error as e:
+            print(f"Warning: LLM cache store failed: {e}")
+
+    @staticmethod
+    def _llm_attempts(prompt: str, models: List[str]):
+        """Model fallbacks for one prompt, shared by the sync and async requests.
+
+        Yields the keyword arguments of each chat completion call to make and is sent the
+        exception that call raised (None on success). Falls back to a plain-text request when
+        a model rejects JSON mode and to the next model when one is decommissioned; returns
+        the model that answered.
+        """
+        for model in models:
+            error = yield {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": LLM_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": LLM_TEMPERATURE,
+                "response_format": {"type": "json_object"}
+            }
+            if error is not None and ("response_format" in str(error).lower() or "json_object" in str(error).lower()):
+                print(f"Warning: response_format not supported for {model}, using fallback: {error}")
+                error = yield {
+                    "model": model,
+                    "messages": [
+                        {"role": "system", "content": LLM_FALLBACK_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": LLM_TEMPERATURE
+                }
+            if error is None:
+                return model
+            if "decommissioned" not in str(error).lower():
+                raise error
+            if model == models[-1]:
+                raise Exception(f"All models failed. Last error: {str(error)}")
+            print(f"Model {model} is decommissioned, trying next model...")
+
+    def _request_llm_scores(self, prompt: str, rubric_version: Optional[str] = None) -> dict:
+        """Send the prompt to the language model and return the parsed JSON result.
+
+        When rubric_version is given, results are served from and stored in the LLM result cache.
+        """
+        models = self._llm_models()
+        cache_key = self._llm_cache_key(prompt, models, rubric_version)
+        if cache_key is not None:
+            cached_result = self._cached_llm_result(cache_key)
+            if cached_result is not None:
+                return cached_result
+        
+        client = self._get_openai_client()
+        attempts = self._llm_attempts(prompt, models)
+        request = next(attempts)
+        while True:
+            try:
+                response, error = client.chat.completions.create(**request), None
+            except Exception as e:
+                error = e
+            try:
+                request = attempts.send(error)
+            except StopIteration as answered:
+                model = answered.value
+                break
+        
+        result = self._parse_llm_response(response.choices[0].message.content)
+        if cache_key is not None:
+            self._store_llm_result(cache_key, model, result)
+        return result
+
+    async def _arequest_llm_scores(self, prompt: str, rubric_version: Optional[str] = None) -> dict:
+        """Async variant of _request_llm_scores using the shared AsyncOpenAI client"""
+        models = self._llm_models()
+        cache_key = self._llm_cache_key(prompt, models, rubric_version)
+        if cache_key is not None:
+            cached_result = await asyncio.to_thread(self._cached_llm_result, cache_key)
+            if cached_result is not None:
+                return cached_result
+        
+        client = get_async_openai_client()
+        attempts = self._llm_attempts(prompt, models)
+        request = next(attempts)
+        while True:
+            try:
+                response, error = await client.chat.completions.create(**request), None
+            except Exception as e:
+                error = e
+            try:
+                request = attempts.send(error)
+            except StopIteration as answered:
+                model = answered.value
+                break
+        
+        result = self._parse_llm_response(response.choices[0].message.content)
+        if cache_key is not None:
+            await asyncio.to_thread(self._store_llm_result, cache_key, model, result)
+        return result
+
+    @staticmethod
+    def _parse_llm_response(response_content) -> dict:
+        """Extract and validate the JSON scores object from a model response"""
+        if not response_content:
+            raise Exception("Empty response from language model")
+        
+        if isinstance(response_content, str):
+            if "```json" in response_content:
+                response_content = response_content.split("```json")[1].split("```")[0].strip()
+            elif "```" in response_content:
+                response_content = response_content.split("```")[1].split("```")[0].strip()
             
-            response_content = response.choices[0].message.content
-            if not response_content:
-                raise Exception("Empty response from language model")
+            response_content = response_content.strip()
             
-            if isinstance(response_content, str):
-                if "```json" in response_content:
-                    response_content = response_content.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_content:
-                    response_content = response_content.split("```")[1].split("```")[0].strip()
+            try:
+                result = json.loads(response_content)
+            except json.JSONDecodeError as json_err:
+                print(f"JSON parsing error. Content preview: {response_content[:500]}")
+                raise Exception(f"Invalid JSON response from language model: {str(json_err)}")
+        else:
+            result = response_content
+        
+        if "scores" not in result:
+            raise Exception(f"Invalid response format: missing 'scores' field. Response: {str(result)[:200]}")
+        
+        if not isinstance(result["scores"], list):
+            raise Exception(f"Invalid response format: 'scores' must be a list. Got: {type(result['scores'])}")
+        
+        return result
+
+    @staticmethod
+    def _scores_from_llm_result(result: dict, rubrics: List[RubricResponse]) -> List[EvaluationScoreCreate]:
+        """Match the scores returned by the language model to the rubric sections"""
+        evaluation_scores = []
+        for score_data in result.get("scores", []):
+            if not isinstance(score_data, dict):
+                continue
                 
-                response_content = response_content.strip()
+            section_name = score_data.get("section_name")
+            if not section_name:
+                continue
                 
+            rubric = next((r for r in rubrics if r.section_name == section_name), None)
+            if rubric:
                 try:
-                    result = json.loads(response_content)
-                except json.JSONDecodeError as json_err:
-                    print(f"JSON parsing error. Content preview: {response_content[:500]}")
-                    raise Exception(f"Invalid JSON response from language model: {str(json_err)}")
-            else:
-                result = response_content
-            
-            if "scores" not in result:
-                raise Exception(f"Invalid response format: missing 'scores' field. Response: {str(result)[:200]}")
-            
-            if not isinstance(result["scores"], list):
-                raise Exception(f"Invalid response format: 'scores' must be a list. Got: {type(result['scores'])}")
-            
-            evaluation_scores = []
-            for score_data in result.get("scores", []):
-                if not isinstance(score_data, dict):
+                    score = max(0.0, min(float(score_data.get("score", 0)), rubric.max_points))
+                    evaluation_scores.append(EvaluationScoreCreate(
+                        rubric_id=rubric.id,
+                        score=score,
+                        feedback=score_data.get("feedback", "")
+                    ))
+                except (ValueError, TypeError) as e:
+                    print(f"Error processing score for {section_name}: {e}")
                     continue
-                    
-                section_name = score_data.get("section_name")
-                if not section_name:
-                    continue
-                    
-                rubric = next((r for r in rubrics if r.section_name == section_name), None)
-                if rubric:
-                    try:
-                        score = max(0.0, min(float(score_data.get("score", 0)), rubric.max_points))
-                        evaluation_scores.append(EvaluationScoreCreate(
-                            rubric_id=rubric.id,
-                            score=score,
-                            feedback=score_data.get("feedback", "")
-                        ))
-                    except (ValueError, TypeError) as e:
-                        print(f"Error processing score for {section_name}: {e}")
-                        continue
-            
-            if len(evaluation_scores) < len(rubrics):
-                evaluated_sections = {s.get("section_name") for s in result.get("scores", []) if isinstance(s, dict)}
-                missing_sections = [r.section_name for r in rubrics if r.section_name not in evaluated_sections]
-                if missing_sections:
-                    raise Exception(f"Missing evaluations for sections: {', '.join(missing_sections)}. Received {len(evaluation_scores)} scores for {len(rubrics)} rubrics.")
-            
-            evaluation_data = EvaluationCreate(
-                student_id=student_id,
-                report_type_id=report_type_id,
-                report_title=report_title,
-                evaluation_method="llm",
-                scores=evaluation_scores
-            )
-            
+        
+        if len(evaluation_scores) < len(rubrics):
+            evaluated_sections = {s.get("section_name") for s in result.get("scores", []) if isinstance(s, dict)}
+            missing_sections = [r.section_name for r in rubrics if r.section_name not in evaluated_sections]
+            if missing_sections:
+                raise Exception(f"Missing evaluations for sections: {', '.join(missing_sections)}. Received {len(evaluation_scores)} scores for {len(rubrics)} rubrics.")
+        
+        return evaluation_scores
+
+    def _llm_request_for(
+        self, rubric_entry: RubricCacheEntry, report_title: str, report_content: str, use_cache: bool
+    ) -> tuple:
+        """Prompt and cache version (None when not cached) of one report"""
+        if not rubric_entry.rubrics:
+            raise Exception("No rubrics found for this report type")
+        prompt = self._build_llm_prompt(rubric_entry.prompt_block, report_title, report_content)
+        return prompt, rubric_entry.fingerprint if use_cache else None
+
+    def _llm_evaluation_data(
+        self, rubric_entry: RubricCacheEntry, student_id: int, report_title: str, result: dict
+    ) -> EvaluationCreate:
+        """Evaluation to create from the language model result for one report"""
+        return EvaluationCreate(
+            student_id=student_id,
+            report_type_id=rubric_entry.report_type_id,
+            report_title=report_title,
+            evaluation_method="llm",
+            scores=self._scores_from_llm_result(result, rubric_entry.rubrics)
+        )
+
+    @staticmethod
+    def _llm_evaluation_error(error: Exception) -> Exception:
+        """Log a failed language model evaluation and return the error to raise instead"""
+        if isinstance(error, KeyError):
+            return Exception(f"Missing required field in LLM response: {str(error)}")
+        import traceback
+        error_msg = f"Language model evaluation failed: {str(error)}"
+        print(f"LLM Evaluation Error: {error_msg}")
+        traceback.print_exc()
+        return Exception(error_msg)
+
+    def evaluate_with_llm(
+        self, db: Session, student_id: int, report_type_id: int, 
+        report_title: str, report_content: str, evaluator_id: Optional[int] = None,
+        use_cache: bool = True
+    ) -> Optional[Evaluation]:
+        """Evaluate using language model based on defined criteria"""
+        self._get_openai_client()
+        
+        rubric_entry = rubric_cache.get(db, report_type_id)
+        prompt, rubric_version = self._llm_request_for(rubric_entry, report_title, report_content, use_cache)
+        
+        try:
+            result = self._request_llm_scores(prompt, rubric_version)
+            evaluation_data = self._llm_evaluation_data(rubric_entry, student_id, report_title, result)
             return self.create_evaluation(db, evaluation_data, evaluator_id=evaluator_id)
-            
-        except json.JSONDecodeError as e:
-            error_msg = f"Failed to parse LLM response as JSON: {str(e)}"
-            if 'response' in locals() and response.choices:
-                error_msg += f". Response preview: {response.choices[0].message.content[:300]}"
-            raise Exception(error_msg)
-        except KeyError as e:
-            raise Exception(f"Missing required field in LLM response: {str(e)}")
         except Exception as e:
-            import traceback
-            error_msg = f"Language model evaluation failed: {str(e)}"
-            print(f"LLM Evaluation Error: {error_msg}")
-            traceback.print_exc()
-            raise Exception(error_msg)
+            raise self._llm_evaluation_error(e)
 
-    def evaluate_rule_based(
+    async def evaluate_with_llm_async(
         self, db: Session, student_id: int, report_type_id: int,
-        report_title: str, report_content: str, evaluator_id: Optional[int] = None
+        report_title: str, report_content: str, evaluator_id: Optional[int] = None,
+        use_cache: bool = True
     ) -> Optional[Evaluation]:
-        """Evaluate using rule-based approach (simple keyword matching)"""
-        rubrics = db.query(Rubric).filter(
-            Rubric.report_type_id == report_type_id
-        ).order_by(Rubric.order).all()
+        """Evaluate using language model without holding a worker thread during the model call.
+
+        The model request is awaited on the shared async client; the short database
+        reads and writes run in a worker thread.
+        """
+        get_async_openai_client()
         
-        if not rubrics:
-            raise Exception("No rubrics found for this report type")
+        def load_rubrics():
+            entry = rubric_cache.get(db, report_type_id)
+            # End the transaction so no pooled connection is held while the model call is awaited
+            db.rollback()
+            return entry
         
-        evaluation_scores = []
-        content_lower = report_content.lower()
+        rubric_entry = await asyncio.to_thread(load_rubrics)
+        prompt, rubric_version = self._llm_request_for(rubric_entry, report_title, report_content, use_cache)
         
-        for rubric in rubrics:
-            score = 0.0
-            feedback = ""
-            
-            section_name_lower = rubric.section_name.lower()
-            if "introduction" in section_name_lower:
-                if any(word in content_lower for word in ["introduction", "introduce", "overview"]):
-                    score = rubric.max_points * 0.7  # Basic presence
-                    feedback = "Introduction section found."
-            
-            elif "objective" in section_name_lower or "overview" in section_name_lower:
-                if any(word in content_lower for word in ["objective", "goal", "aim", "purpose"]):
-                    score = rubric.max_points * 0.7
-                    feedback = "Objectives section found."
-            
-            elif "requirement" in section_name_lower:
-                if any(word in content_lower for word in ["requirement", "specification", "spec"]):
-                    score = rubric.max_points * 0.7
-                    feedback = "Requirements section found."
-            
-            elif "design" in section_name_lower:
-                if any(word in content_lower for word in ["design", "architecture", "structure"]):
-                    score = rubric.max_points * 0.7
-                    feedback = "Design section found."
-            
-            elif "result" in section_name_lower or "discussion" in section_name_lower:
-                if any(word in content_lower for word in ["result", "discussion", "finding"]):
-                    score = rubric.max_points * 0.7
-                    feedback = "Results/discussion section found."
-            
-            else:
-                if section_name_lower in content_lower:
-                    score = rubric.max_points * 0.5
-                    feedback = f"{rubric.section_name} section found."
+        try:
+            result = await self._arequest_llm_scores(prompt, rubric_version)
+            evaluation_data = self._llm_evaluation_data(rubric_entry, student_id, report_title, result)
+            return await asyncio.to_thread(self.create_evaluation, db, evaluation_data, evaluator_id)
+        except Exception as e:
+            raise self._llm_evaluation_error(e)
+
+    def evaluate_batch_with_llm(
+        self, db: Session, submissions: List[dict], evaluator_id: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[dict]:
+        """Evaluate many submissions using the language model with concurrent model calls.
+
+        Each submission is a dict with student_id, report_type_id, report_title,
+        report_content and optionally use_cache. Model calls run in a thread pool bounded by max_concurrency
+        (capped at LLM_BATCH_MAX_CONCURRENCY); results are persisted one by one through
+        create_evaluation as they complete. Returns one result per submission, in input order.
+        """
+        self._get_openai_client()
+        
+        concurrency = min(max_concurrency or LLM_BATCH_MAX_CONCURRENCY, LLM_BATCH_MAX_CONCURRENCY)
+        concurrency = max(1, concurrency)
+        
+        results = [
+            {
+                "index": index,
+                "student_id": submission["student_id"],
+                "report_title": submission["report_title"],
+                "success": False,
+                "evaluation_id": None,
+                "total_score": None,
+                "max_possible_score": None,
+                "error": None
+            }
+            for index, submission in enumerate(submissions)
+        ]
+        rubric_entries = {}
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # Build all prompts up front so worker threads never touch the session
+            futures = {}
+            for index, submission in enumerate(submissions):
+                report_type_id = submission["report_type_id"]
+                if report_type_id not in rubric_entries:
+                    rubric_entries[report_type_id] = rubric_cache.get(db, report_type_id)
+                
+                rubric_entry = rubric_entries[report_type_id]
+                if not rubric_entry.rubrics:
+                    results[index]["error"] = "No rubrics found for this report type"
+                    continue
+                
+                prompt = self._build_llm_prompt(
+                    rubric_entry.prompt_block, submission["report_title"], submission["report_content"]
+                )
+                rubric_version = rubric_entry.fingerprint if submission.get("use_cache", True) else None
+                futures[executor.submit(self._request_llm_scores, prompt, rubric_version)] = index
             
-            evaluation_scores.append(EvaluationScoreCreate(
-                rubric_id=rubric.id,
-                score=score,
-                feedback=feedback or f"Rule-based evaluation for {rubric.section_name}"
-            ))
+            for future in as_completed(futures):
+                index = futures[future]
+                submission = submissions[index]
+                try:
+                    evaluation = self.create_evaluation(db, self._llm_evaluation_data(
+                        rubric_entries[submission["report_type_id"]], submission["student_id"],
+                        submission["report_title"], future.result()
+                    ), evaluator_id=evaluator_id)
+                    results[index].update({
+                        "success": True,
+                        "evaluation_id": evaluation.id,
+                        "total_score": evaluation.total_score,
+                        "max_possible_score": evaluation.max_possible_score
+                    })
+                except Exception as e:
+                    db.rollback()
+                    print(f"LLM batch evaluation error (item {index}): {e}")
+                    results[index]["error"] = f"Language model evaluation failed: {str(e)}"
+        
+        return results
+
+    def evaluate_rule_based(
+        self, db: Session, student_id: int, report_type_id: int,
+        report_title: str, report_content: str, evaluator_id: Optional[int] = None
+    ) -> Optional[Evaluation]:
+        """Evaluate using rule-based approach (keyword rules, see rule_engine)"""
+        rubric_entry = rubric_cache.get(db, report_type_id)
+        
+        if not rubric_entry.rubrics:
+            raise Exception("No rubrics found for this report type")
         
         evaluation_data = EvaluationCreate(
             student_id=student_id,
             report_type_id=report_type_id,
             report_title=report_title,
             evaluation_method="rule-based",
-            scores=evaluation_scores
+            scores=compiled_rules(rubric_entry).score(report_content)
         )
         
         return self.create_evaluation(db, evaluation_data, evaluator_id=evaluator_id)
 
+    def evaluate_batch_rule_based(
+        self, db: Session, submissions: Iterable[dict], evaluator_id: Optional[int] = None,
+        chunk_size: int = RULE_GRADING_CHUNK_SIZE, dry_run: bool = False
+    ) -> Iterator[List[dict]]:
+        """Evaluate many submissions using the rule-based approach in the rule grading pool.
+
+        Each submission is a dict with student_id, report_type_id, report_title, report_content
+        and optionally evaluator_id (overriding evaluator_id). Submissions are scored in chunks
+        of one report type in worker processes; each scored chunk is written with one INSERT for
+        its evaluations, one executemany for their scores and the rollup upserts, in its own
+        transaction. Yields the results of each chunk as it is saved, so chunks may arrive out
+        of order: every result carries the index of its submission. With dry_run, scores are
+        computed but nothing is saved (results have no evaluation_id).
+        """
+        rubric_entries: Dict[int, RubricCacheEntry] = {}
+        failed: List[dict] = []
+
+        def result(index: int, submission: dict, error: Optional[str] = None) -> dict:
+            return {
+                "index": index,
+                "student_id": submission["student_id"],
+                "report_title": submission["report_title"],
+                "success": False,
+                "evaluation_id": None,
+                "total_score": None,
+                "max_possible_score": None,
+                "error": error
+            }
+
+        def chunks():
+            # Chunks carry the submissions without their content as key, the rubrics as
+            # plain dicts and the texts to score
+            pending: Dict[int, list] = {}
+            for index, submission in enumerate(submissions):
+                report_type_id = submission["report_type_id"]
+                if report_type_id not in rubric_entries:
+                    rubric_entries[report_type_id] = rubric_cache.get(db, report_type_id)
+                if not rubric_entries[report_type_id].rubrics:
+                    failed.append(result(index, submission, "No rubrics found for this report type"))
+                    continue
+                chunk = pending.setdefault(report_type_id, [])
+                chunk.append((index, submission))
+                if len(chunk) >= chunk_size:
+                    yield self._rule_grading_chunk(rubric_entries[report_type_id], pending.pop(report_type_id))
+            for report_type_id, chunk in pending.items():
+                yield self._rule_grading_chunk(rubric_entries[report_type_id], chunk)
+
+        for (report_type_id, items), scores in rule_grading_pool.score(chunks()):
+            results = [result(index, submission) for index, submission in items]
+            if dry_run:
+                max_possible_score = sum(rubric.max_points for rubric in rubric_entries[report_type_id].rubrics)
+                for item_result, report_scores in zip(results, scores):
+                    item_result.update({
+                        "success": True,
+                        "total_score": sum(score for _, score, _ in report_scores),
+                        "max_possible_score": max_possible_score
+                    })
+                yield failed + results
+                failed.clear()
+                continue
+            try:
+                saved = self._insert_rule_based_evaluations(
+                    db, rubric_entries[report_type_id], [submission for _, submission in items], scores, evaluator_id
+                )
+                db.commit()
+                for item_result, (evaluation_id, total_score, max_possible_score) in zip(results, saved):
+                    if evaluation_id is None:
+                        item_result["error"] = "Student not found"
+                    else:
+                        item_result.update({
+                            "success": True,
+                            "evaluation_id": evaluation_id,
+                            "total_score": total_score,
+                            "max_possible_score": max_possible_score
+                        })
+            except Exception as e:
+                db.rollback()
+                print(f"Rule-based batch evaluation chunk failed: {e}")
+                for item_result in results:
+                    item_result["error"] = f"Could not save the evaluation: {e}"
+            yield failed + results
+            failed.clear()
+        if failed:
+            yield list(failed)
+
+    @staticmethod
+    def _rule_grading_chunk(rubric_entry: RubricCacheEntry, items: List[tuple]) -> tuple:
+        key = (rubric_entry.report_type_id, [
+            (index, {name: value for name, value in submission.items() if name != "report_content"})
+            for index, submission in items
+        ])
+        rubrics = [rubric.dict() for rubric in rubric_entry.rubrics]
+        return key, rubric_entry.fingerprint, rubrics, [submission["report_content"] for _, submission in items]
+
+    @staticmethod
+    def _insert_rule_based_evaluations(
+        db: Session, rubric_entry: RubricCacheEntry, submissions: List[dict], scores: List[ReportScores],
+        evaluator_id: Optional[int]
+    ) -> List[tuple]:
+        """Insert scored submissions of one report type with their scores and rollups (does not commit).
+
+        Returns (evaluation_id, total_score, max_possible_score) per submission, with a None id
+        for submissions whose student does not exist.
+        """
+        student_ids = {submission["student_id"] for submission in submissions}
+        existing = set(db.execute(select(Student.id).where(Student.id.in_(student_ids))).scalars())
+        max_possible_score = sum(rubric.max_points for rubric in rubric_entry.rubrics)
+        total_scores = [sum(score for _, score, _ in report_scores) for report_scores in scores]
+        evaluator_ids = [submission.get("evaluator_id", evaluator_id) for submission in submissions]
+        positions = [i for i, submission in enumerate(submissions) if submission["student_id"] in existing]
+        saved = [(None, None, None)] * len(submissions)
+        if not positions:
+            return saved
+
+        table = Evaluation.__table__
+        evaluation_ids = list(db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), [
+            {
+                "student_id": submissions[i]["student_id"],
+                "report_type_id": rubric_entry.report_type_id,
+                "report_title": submissions[i]["report_title"],
+                "total_score": total_scores[i],
+                "max_possible_score": max_possible_score,
+                "evaluation_method": "rule-based",
+                "evaluator_id": evaluator_ids[i],
+            }
+            for i in positions
+        ]).scalars())
+        db.execute(insert(EvaluationScore.__table__), [
+            {"evaluation_id": evaluation_id, "rubric_id": rubric_id, "score": score, "feedback": feedback}
+            for evaluation_id, i in zip(evaluation_ids, positions)
+            for rubric_id, score, feedback in scores[i]
+        ])
+        today = datetime.utcnow().date()
+        StatisticsService.record_evaluations(db, [
+            {
+                "report_type_id": rubric_entry.report_type_id,
+                "evaluator_id": evaluator_ids[i],
+                "evaluation_method": "rule-based",
+                "day": today,
+                "total_score": total_scores[i],
+                "max_possible_score": max_possible_score
+            }
+            for i in positions
+        ])
+        for evaluation_id, i in zip(evaluation_ids, positions):
+            saved[i] = (evaluation_id, total_scores[i], max_possible_score)
+        return saved
+
     def get_evaluation(self, db: Session, evaluation_id: int) -> Optional[Evaluation]:
         """Get evaluation by ID with relationships"""
-        from sqlalchemy.orm import joinedload
         return db.query(Evaluation)\
-            .options(joinedload(Evaluation.student),
-                    joinedload(Evaluation.report_type),
-                    joinedload(Evaluation.scores).joinedload(EvaluationScore.rubric))\
+            .options(*_evaluation_detail_options())\
             .filter(Evaluation.id == evaluation_id).first()
 
+    @staticmethod
+    async def aget_evaluation(db: AsyncSession, evaluation_id: int) -> Optional[Evaluation]:
+        """get_evaluation on an AsyncSession"""
+        result = await db.execute(
+            select(Evaluation).options(*_evaluation_detail_options()).where(Evaluation.id == evaluation_id)
+        )
+        return result.unique().scalars().first()
+
+    @staticmethod
+    def query_evaluations_with_scores(db: Session):
+        """Query evaluations with student, report type and scored rubrics eager loaded.
+
+        Scores are loaded with a separate IN query, so the query can be combined with LIMIT and yield_per.
+        """
+        return db.query(Evaluation).options(*_evaluation_list_options())
+
+    @staticmethod
+    def select_evaluations_with_scores():
+        """query_evaluations_with_scores as a select() for AsyncSession"""
+        return select(Evaluation).options(*_evaluation_list_options())
+
+    @staticmethod
+    def query_evaluation_summaries(db: Session):
+        """Query only the evaluation, student and report type columns shown in overview lists (no scores)"""
+        return db.query(*_evaluation_summary_columns())\
+            .join(Student, Student.id == Evaluation.student_id)\
+            .join(ReportType, ReportType.id == Evaluation.report_type_id)
+
+    @staticmethod
+    def select_evaluation_summaries():
+        """query_evaluation_summaries as a select() for AsyncSession"""
+        return select(*_evaluation_summary_columns())\
+            .join(Student, Student.id == Evaluation.student_id)\
+            .join(ReportType, ReportType.id == Evaluation.report_type_id)
+
     def get_all_evaluations(self, db: Session, skip: int = 0, limit: int = 100) -> List[Evaluation]:
         """Get all evaluations"""
         return db.query(Evaluation).offset(skip).limit(limit).all()
@@ -0,0 +1,208 @@
+"""Chunked readers for bulk imports from CSV, Excel and NDJSON files.
+
+Uploaded files are read IMPORT_CHUNK_SIZE rows at a time, so an import never holds more
+than one chunk of the file in memory. Each chunk is a DataFrame of stripped strings with
+normalized column names (lowercase, underscores), indexed by the row number users see:
+the spreadsheet row for CSV and Excel (the header is row 1) or the line of an NDJSON file.
+Validation can then run column-wise on a chunk and still report errors per row.
+"""
+from fastapi import UploadFile
+from fastapi.responses import StreamingResponse
+from openpyxl import load_workbook
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from ..database import SessionLocal
+import itertools
+import json
+import os
+import pandas as pd
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+
+IMPORT_FORMATS = ("csv", "excel", "ndjson")
+# Set by a reader for rows it could not parse (e.g. invalid JSON on an NDJSON line)
+READ_ERROR_COLUMN = "_read_error"
+
+_FORMATS_BY_EXTENSION = {
+    ".csv": "csv",
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+_FORMATS_BY_CONTENT_TYPE = {
+    "text/csv": "csv",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": "excel",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None, format: Optional[str] = None) -> str:
+    """Import format from an explicit format, the file extension or the content type"""
+    if format:
+        if format not in IMPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+        return format
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in _FORMATS_BY_EXTENSION:
+        return _FORMATS_BY_EXTENSION[extension]
+    if content_type in _FORMATS_BY_CONTENT_TYPE:
+        return _FORMATS_BY_CONTENT_TYPE[content_type]
+    raise ValueError("Cannot tell the file format; upload a .csv, .xlsx or .ndjson file or pass format")
+
+
+def normalize_column_name(name) -> str:
+    return str(name).strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _text_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Normalize column names, turn every cell into a stripped string ("" for empty cells)
+    and drop rows that are empty throughout.
+
+    Readers build frames with dtype=object, so a column of numbers with an empty cell is
+    not turned into floats ("1234567.0").
+    """
+    frame = frame.rename(columns=normalize_column_name)
+    frame = frame.astype(object).where(frame.notna(), "")
+    for column in frame.columns:
+        frame[column] = frame[column].astype(str).str.strip()
+    return frame[(frame != "").any(axis=1)]
+
+
+def read_csv_chunks(file, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    try:
+        reader = pd.read_csv(
+            file, dtype=str, keep_default_na=False, skip_blank_lines=False,
+            chunksize=chunk_size, encoding="utf-8-sig"
+        )
+        for chunk in reader:
+            # Header is row 1, so the first data row is row 2
+            chunk.index = chunk.index + 2
+            yield _text_frame(chunk)
+    except pd.errors.EmptyDataError:
+        return
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise ValueError(f"Could not read CSV file: {e}")
+
+
+def _records_frame(records: List[Sequence], index: List[int], columns: List[str]) -> pd.DataFrame:
+    width = len(columns)
+    rows = [tuple(record[:width]) + (None,) * (width - len(record)) for record in records]
+    return _text_frame(pd.DataFrame(rows, columns=columns, index=index, dtype=object))
+
+
+def read_excel_chunks(file, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Stream the first worksheet row by row (openpyxl read-only mode keeps only the current row in memory)"""
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ValueError(f"Could not read Excel file: {e}")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) if name is not None else f"column_{i + 1}" for i, name in enumerate(header)]
+        records, index = [], []
+        for row_number, values in enumerate(rows, start=2):
+            records.append(values)
+            index.append(row_number)
+            if len(records) >= chunk_size:
+                yield _records_frame(records, index, columns)
+                records, index = [], []
+        if records:
+            yield _records_frame(records, index, columns)
+    finally:
+        workbook.close()
+
+
+def read_ndjson_chunks(file, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Read one JSON object per line; lines that are not an object become rows with a read error"""
+    records, index = [], []
+    for line_number, line in enumerate(file, start=1):
+        line = line.decode("utf-8-sig", errors="replace") if isinstance(line, bytes) else line
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            record = {READ_ERROR_COLUMN: f"Invalid JSON: {e}"}
+        records.append(record)
+        index.append(line_number)
+        if len(records) >= chunk_size:
+            yield _text_frame(pd.DataFrame(records, index=index, dtype=object))
+            records, index = [], []
+    if records:
+        yield _text_frame(pd.DataFrame(records, index=index, dtype=object))
+
+
+_READERS = {
+    "csv": read_csv_chunks,
+    "excel": read_excel_chunks,
+    "ndjson": read_ndjson_chunks,
+}
+
+
+def iter_import_chunks(file, format: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    return _READERS[format](file, chunk_size)
+
+
+def open_import(upload: UploadFile, required_columns: Iterable[str], format: Optional[str] = None,
+                chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Start reading an uploaded file and check its columns before anything is imported.
+
+    Raises ValueError for unknown formats, unreadable files and (for CSV and Excel, whose
+    header names the columns) missing required columns, so the caller can still answer
+    with a 400 before streaming results.
+    """
+    format = detect_format(upload.filename, upload.content_type, format)
+    chunks = iter_import_chunks(upload.file, format, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        return iter(())
+    if format != "ndjson":
+        missing = [name for name in required_columns if name not in first.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    return itertools.chain([first], chunks)
+
+
+def column(frame: pd.DataFrame, name: str) -> pd.Series:
+    """A column of a chunk, or empty strings if the chunk does not have it (e.g. NDJSON keys left out)"""
+    if name in frame.columns:
+        return frame[name]
+    return pd.Series("", index=frame.index, dtype=object)
+
+
+def first_errors(frame: pd.DataFrame, checks: Sequence[Tuple[pd.Series, str]]) -> pd.Series:
+    """Error message per row from (failing-rows mask, message) checks; the first failing check wins, "" means valid"""
+    errors = column(frame, READ_ERROR_COLUMN).copy()
+    for failing, message in checks:
+        errors = errors.mask((errors == "") & failing, message)
+    return errors
+
+
+def stream_import_results(run_import: Callable[[Session], Iterator[List[Dict]]]) -> StreamingResponse:
+    """Stream per-row import results as newline-delimited JSON, followed by a summary line.
+
+    run_import receives a session owned by the stream and yields the results of each chunk:
+    one JSON-serializable dict per row with a "status" ("error" for rows that were not
+    imported). A chunk is sent as one piece, since every piece of a streamed response costs
+    a hop between threadpool and event loop. The summary counts rows per status.
+    """
+    def generate() -> Iterator[bytes]:
+        counts: Dict[str, int] = {}
+        db = SessionLocal()
+        try:
+            for results in run_import(db):
+                for result in results:
+                    counts[result["status"]] = counts.get(result["status"], 0) + 1
+                yield "".join(json.dumps(result) + "\n" for result in results).encode("utf-8")
+        finally:
+            db.close()
+        yield (json.dumps({"summary": {"rows": sum(counts.values()), **counts}}) + "\n").encode("utf-8")
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
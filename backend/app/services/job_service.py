@@ -0,0 +1,186 @@
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime, timedelta
+from ..database import SessionLocal
+from ..models import EvaluationJob
+import os
+import threading
+import traceback
+
+EVALUATION_JOB_WORKERS = int(os.getenv("EVALUATION_JOB_WORKERS", "2"))
+EVALUATION_JOB_POLL_INTERVAL = float(os.getenv("EVALUATION_JOB_POLL_INTERVAL", "2.0"))
+# A running job whose worker has not finished it within the lease is considered
+# abandoned (e.g. the process was restarted) and is picked up again
+EVALUATION_JOB_LEASE_SECONDS = int(os.getenv("EVALUATION_JOB_LEASE_SECONDS", "600"))
+EVALUATION_JOB_MAX_ATTEMPTS = int(os.getenv("EVALUATION_JOB_MAX_ATTEMPTS", "3"))
+
+JOB_TYPES = ("llm", "rule-based")
+
+
+class EvaluationJobService:
+    """Persisted evaluation job queue executed by a pool of background worker threads.
+
+    Jobs are rows in the evaluation_jobs table, so queued work survives a restart.
+    Workers claim jobs with a conditional UPDATE, which keeps several processes
+    sharing one database from running the same job twice.
+    """
+
+    def __init__(self, evaluation_service, worker_count: int = EVALUATION_JOB_WORKERS,
+                 poll_interval: float = EVALUATION_JOB_POLL_INTERVAL):
+        self.evaluation_service = evaluation_service
+        self.worker_count = worker_count
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def enqueue(self, db: Session, job_type: str, payload: dict, evaluator_id: Optional[int] = None) -> EvaluationJob:
+        """Store a new evaluation job and wake up an idle worker"""
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job = EvaluationJob(
+            job_type=job_type,
+            status="queued",
+            payload=payload,
+            evaluator_id=evaluator_id,
+            attempts=0
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self._wakeup.set()
+        return job
+
+    @staticmethod
+    def get_job(db: Session, job_id: int) -> Optional[EvaluationJob]:
+        """Get job by ID"""
+        return db.query(EvaluationJob).filter(EvaluationJob.id == job_id).first()
+
+    def start(self):
+        """Start the background workers"""
+        if self._threads or self.worker_count <= 0:
+            return
+        self._stop.clear()
+        for i in range(self.worker_count):
+            thread = threading.Thread(target=self._worker_loop, name=f"evaluation-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"Started {self.worker_count} evaluation job worker(s)")
+
+    def stop(self, timeout: float = 5.0):
+        """Signal the workers to stop and wait for them to finish their current job"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            try:
+                job_id = self._claim_next_job()
+            except Exception as e:
+                print(f"Evaluation job worker error while claiming job: {e}")
+                job_id = None
+
+            if job_id is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self._run_job(job_id)
+
+    def _claim_next_job(self) -> Optional[int]:
+        """Atomically mark the oldest runnable job as running and return its id"""
+        db = SessionLocal()
+        try:
+            while True:
+                now = datetime.utcnow()
+                lease_cutoff = now - timedelta(seconds=EVALUATION_JOB_LEASE_SECONDS)
+                candidate = db.query(EvaluationJob.id, EvaluationJob.status, EvaluationJob.attempts)\
+                    .filter(or_(
+                        EvaluationJob.status == "queued",
+                        and_(EvaluationJob.status == "running", EvaluationJob.started_at < lease_cutoff)
+                    ))\
+                    .order_by(EvaluationJob.id)\
+                    .first()
+                if candidate is None:
+                    return None
+
+                job_id, job_status, attempts = candidate
+                claim = db.query(EvaluationJob).filter(
+                    EvaluationJob.id == job_id,
+                    EvaluationJob.status == job_status
+                )
+                if job_status == "running":
+                    claim = claim.filter(EvaluationJob.started_at < lease_cutoff)
+
+                if (attempts or 0) >= EVALUATION_JOB_MAX_ATTEMPTS:
+                    claim.update({
+                        EvaluationJob.status: "failed",
+                        EvaluationJob.error: "Job abandoned after maximum number of attempts",
+                        EvaluationJob.finished_at: now
+                    }, synchronize_session=False)
+                    db.commit()
+                    continue
+
+                claimed = claim.update({
+                    EvaluationJob.status: "running",
+                    EvaluationJob.started_at: now,
+                    EvaluationJob.attempts: (attempts or 0) + 1
+                }, synchronize_session=False)
+                db.commit()
+                if claimed == 1:
+                    return job_id
+        finally:
+            db.close()
+
+    def _run_job(self, job_id: int):
+        """Execute a claimed job and record its outcome"""
+        db = SessionLocal()
+        try:
+            job = db.query(EvaluationJob).filter(EvaluationJob.id == job_id).first()
+            payload = dict(job.payload)
+            job_type = job.job_type
+            evaluator_id = job.evaluator_id
+
+            try:
+                if job_type == "llm":
+                    evaluation = self.evaluation_service.evaluate_with_llm(
+                        db,
+                        payload["student_id"],
+                        payload["report_type_id"],
+                        payload["report_title"],
+                        payload["report_content"],
+                        evaluator_id=evaluator_id,
+                        use_cache=payload.get("use_cache", True)
+                    )
+                else:
+                    evaluation = self.evaluation_service.evaluate_rule_based(
+                        db,
+                        payload["student_id"],
+                        payload["report_type_id"],
+                        payload["report_title"],
+                        payload["report_content"],
+                        evaluator_id=evaluator_id
+                    )
+                evaluation_id = evaluation.id
+                result = {"status": "succeeded", "evaluation_id": evaluation_id, "error": None}
+            except Exception as e:
+                db.rollback()
+                traceback.print_exc()
+                result = {"status": "failed", "evaluation_id": None, "error": str(e)}
+
+            db.query(EvaluationJob).filter(EvaluationJob.id == job_id).update({
+                EvaluationJob.status: result["status"],
+                EvaluationJob.evaluation_id: result["evaluation_id"],
+                EvaluationJob.error: result["error"],
+                EvaluationJob.finished_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Evaluation job {job_id} could not be recorded: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,140 @@
+from typing import Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./llm_cache.db")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+
+class LLMResultCache:
+    """Content-addressed cache of parsed language model results stored in SQLite.
+
+    Entries are keyed on a hash of (prompt, model, temperature, rubric version) and
+    evicted when older than the TTL or, beyond max_entries, least recently used first.
+    Hit/miss counters are stored alongside the entries so they are shared by all workers.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, rubric_version: str) -> str:
+        """Build the cache key for a model request"""
+        payload = json.dumps(
+            {"prompt": prompt, "model": model, "temperature": temperature, "rubric_version": rubric_version},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._schema_ready:
+            with self._lock:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS llm_cache (
+                        key TEXT PRIMARY KEY,
+                        model TEXT NOT NULL,
+                        result TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_accessed REAL NOT NULL,
+                        hit_count INTEGER NOT NULL DEFAULT 0
+                    );
+                    CREATE INDEX IF NOT EXISTS ix_llm_cache_last_accessed ON llm_cache (last_accessed);
+                    CREATE TABLE IF NOT EXISTS llm_cache_counters (
+                        name TEXT PRIMARY KEY,
+                        value INTEGER NOT NULL DEFAULT 0
+                    );
+                    INSERT OR IGNORE INTO llm_cache_counters (name, value) VALUES ('hits', 0), ('misses', 0);
+                """)
+                self._schema_ready = True
+        return conn
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached result for key, or None if missing or expired"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                row = conn.execute(
+                    "SELECT result FROM llm_cache WHERE key = ? AND created_at >= ?",
+                    (key, now - self.ttl_seconds)
+                ).fetchone()
+                if row is None:
+                    conn.execute("UPDATE llm_cache_counters SET value = value + 1 WHERE name = 'misses'")
+                    return None
+                conn.execute(
+                    "UPDATE llm_cache SET last_accessed = ?, hit_count = hit_count + 1 WHERE key = ?",
+                    (now, key)
+                )
+                conn.execute("UPDATE llm_cache_counters SET value = value + 1 WHERE name = 'hits'")
+            return json.loads(row[0])
+        finally:
+            conn.close()
+
+    def set(self, key: str, model: str, result: dict):
+        """Store a parsed result and evict expired or least recently used entries"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, model, result, created_at, last_accessed, hit_count) "
+                    "VALUES (?, ?, ?, ?, ?, 0)",
+                    (key, model, json.dumps(result), now, now)
+                )
+                conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+                count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                if count > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM llm_cache WHERE key IN "
+                        "(SELECT key FROM llm_cache ORDER BY last_accessed ASC LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM llm_cache")
+                conn.execute("UPDATE llm_cache_counters SET value = 0")
+        finally:
+            conn.close()
+
+    def stats(self) -> dict:
+        """Return entry count and hit/miss counters"""
+        conn = self._connect()
+        try:
+            entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            counters = dict(conn.execute("SELECT name, value FROM llm_cache_counters").fetchall())
+        finally:
+            conn.close()
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "enabled": LLM_CACHE_ENABLED,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+
+llm_cache = LLMResultCache(LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
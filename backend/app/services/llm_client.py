@@ -0,0 +1,69 @@
+import os
+import threading
+from dotenv import load_dotenv
+
+# Connection pool shared by all async model calls in this process
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+_async_http_client = None
+_async_openai_client = None
+_client_lock = threading.Lock()
+
+
+def get_openai_api_key() -> str:
+    """Return the configured API key, falling back to the .env files"""
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        for env_path in ("/app/backend/.env", os.path.join(os.path.dirname(__file__), "..", "..", ".env")):
+            if env_path and os.path.isfile(env_path):
+                load_dotenv(env_path, override=True)
+                api_key = os.getenv("OPENAI_API_KEY")
+                if api_key:
+                    break
+    if not api_key:
+        raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
+    return api_key
+
+
+def get_async_openai_client():
+    """Return the process-wide AsyncOpenAI client backed by a pooled httpx.AsyncClient"""
+    global _async_http_client, _async_openai_client
+    if _async_openai_client:
+        return _async_openai_client
+
+    with _client_lock:
+        if _async_openai_client:
+            return _async_openai_client
+
+        try:
+            import httpx
+            from openai import AsyncOpenAI
+        except ImportError:
+            raise Exception("OpenAI package not installed. Please install it with: pip install openai")
+
+        api_key = get_openai_api_key()
+        _async_http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=LLM_HTTP_MAX_CONNECTIONS
+            )
+        )
+        if api_key.startswith("gsk_"):
+            _async_openai_client = AsyncOpenAI(api_key=api_key, base_url=GROQ_BASE_URL, http_client=_async_http_client)
+        else:
+            _async_openai_client = AsyncOpenAI(api_key=api_key, http_client=_async_http_client)
+        return _async_openai_client
+
+
+async def close_async_openai_client():
+    """Close the shared async HTTP client (called on application shutdown)"""
+    global _async_http_client, _async_openai_client
+    http_client = _async_http_client
+    _async_http_client = None
+    _async_openai_client = None
+    if http_client is not None:
+        await http_client.aclose()
@@ -0,0 +1,108 @@
+from typing import Optional
+from datetime import datetime
+import glob
+import hashlib
+import os
+import threading
+
+REPORTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "reports")
+REPORT_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "frontend", "templates", "report_template.html"
+)
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", os.path.join(REPORTS_DIR, "cache"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Bump when the PDF output changes without the template file changing (e.g. rendering code)
+REPORT_RENDER_VERSION = "1"
+
+
+class PDFReportCache:
+    """Rendered PDF reports on disk, keyed by evaluation id, last update and template version.
+
+    A cached file is only served while the evaluation's updated_at and the report template
+    are unchanged; files are removed when an evaluation changes and the directory is kept
+    under max_bytes by deleting the least recently served files.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, template_path: str = REPORT_TEMPLATE_PATH):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.template_path = template_path
+        self._lock = threading.Lock()
+        self._template_stat = None
+        self._template_version = None
+
+    def template_version(self) -> str:
+        """Short hash of the report template, recomputed only when the file changes"""
+        try:
+            stat = os.stat(self.template_path)
+            stat_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return f"{REPORT_RENDER_VERSION}-builtin"
+
+        with self._lock:
+            if stat_key != self._template_stat:
+                with open(self.template_path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()[:12]
+                self._template_stat = stat_key
+                self._template_version = f"{REPORT_RENDER_VERSION}-{digest}"
+            return self._template_version
+
+    def path_for(self, evaluation_id: int, updated_at: Optional[datetime]) -> str:
+        stamp = int(updated_at.timestamp() * 1000) if updated_at else 0
+        return os.path.join(
+            self.directory, f"evaluation_{evaluation_id}_{stamp}_{self.template_version()}.pdf"
+        )
+
+    def get(self, evaluation_id: int, updated_at: Optional[datetime]) -> Optional[str]:
+        """Return the cached PDF path if a current rendering exists"""
+        path = self.path_for(evaluation_id, updated_at)
+        try:
+            # Touch the file so size-based eviction removes least recently served files first
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def store(self, evaluation_id: int, rendered_path: str, cache_path: str) -> str:
+        """Move a freshly rendered PDF into place and drop stale renderings of the evaluation"""
+        os.replace(rendered_path, cache_path)
+        for path in glob.glob(os.path.join(self.directory, f"evaluation_{evaluation_id}_*.pdf")):
+            if os.path.abspath(path) != os.path.abspath(cache_path):
+                self._remove(path)
+        self.evict()
+        return cache_path
+
+    def invalidate(self, evaluation_id: int):
+        """Remove all cached renderings of an evaluation"""
+        for path in glob.glob(os.path.join(self.directory, f"evaluation_{evaluation_id}_*.pdf")):
+            self._remove(path)
+
+    def evict(self):
+        """Delete least recently served files until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for path in glob.glob(os.path.join(self.directory, "evaluation_*.pdf")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+pdf_cache = PDFReportCache(PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES)
@@ -0,0 +1,226 @@
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(min(os.cpu_count() or 2, 4))))
+PDF_RENDER_QUEUE_SIZE = int(os.getenv("PDF_RENDER_QUEUE_SIZE", "32"))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+# A combined PDF is laid out by one worker, so it gets its own (fixed) time budget
+PDF_BOOKLET_TIMEOUT = float(os.getenv("PDF_BOOKLET_TIMEOUT", "300"))
+# How often a waiting request checks whether its queued job has failed before starting
+QUEUED_POLL_INTERVAL = 0.05
+
+# Print defaults applied to every report; the report template's own @page rules take precedence
+BASE_PRINT_CSS = """
+@page { size: A4; margin: 2cm; }
+"""
+
+# Per-process WeasyPrint state, created once per worker and reused across jobs
+_font_config = None
+_stylesheets = None
+# Queue on which pool workers report the jobs they start
+_started_queue = None
+
+
+class PDFRenderBusyError(Exception):
+    """Raised when the render queue stays full for longer than the job timeout"""
+
+
+def _init_worker():
+    global _font_config, _stylesheets
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    _font_config = FontConfiguration()
+    _stylesheets = [CSS(string=BASE_PRINT_CSS, font_config=_font_config)]
+
+
+def _init_process(started_queue):
+    global _started_queue
+    _started_queue = started_queue
+    _init_worker()
+
+
+def _run_job(job_id: int, fn, *args):
+    """Run a pool job, first telling the pool it has started (its timeout runs from here)"""
+    _started_queue.put(job_id)
+    return fn(*args)
+
+
+def render_pdf(html_content: str, output_path: str) -> str:
+    """Render HTML to a PDF file with the warm font configuration of this process"""
+    from weasyprint import HTML
+
+    if _font_config is None:
+        _init_worker()
+    HTML(string=html_content).write_pdf(output_path, stylesheets=_stylesheets, font_config=_font_config)
+    return output_path
+
+
+def render_pdf_booklet(html_documents: List[str], output_path: str) -> str:
+    """Render several HTML reports into one PDF, each report starting on a new page"""
+    from weasyprint import HTML
+
+    if _font_config is None:
+        _init_worker()
+    documents = [
+        HTML(string=html_content).render(stylesheets=_stylesheets, font_config=_font_config)
+        for html_content in html_documents
+    ]
+    pages = [page for document in documents for page in document.pages]
+    documents[0].copy(pages).write_pdf(output_path)
+    return output_path
+
+
+class PDFRenderPool:
+    """Pool of worker processes for CPU-bound HTML to PDF conversion.
+
+    Rendering runs outside the request threads so it does not serialize on the GIL.
+    At most workers + queue_size jobs are accepted at a time; callers wait up to the
+    job timeout for a slot, and each job may render for up to the timeout once a worker
+    has picked it up (workers report that through a queue). A job that overruns it is
+    stopped by killing the worker processes, which fails the other jobs in flight as well
+    but frees their slots. With workers set to 0 rendering happens inline in the calling
+    thread.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, booklet_timeout: float):
+        self.workers = workers
+        self.timeout = timeout
+        self.booklet_timeout = booklet_timeout
+        self._slots = threading.BoundedSemaphore(max(1, workers + queue_size))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._started: Dict[int, threading.Event] = {}
+        self._job_ids = itertools.count(1)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn keeps the workers free of the parent's threads and open connections
+                context = multiprocessing.get_context("spawn")
+                started_queue = context.Queue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_process,
+                    initargs=(started_queue,)
+                )
+                self._executor.stopped = threading.Event()
+                threading.Thread(
+                    target=self._watch_starts, args=(started_queue, self._executor.stopped),
+                    name="pdf-render-starts", daemon=True
+                ).start()
+            return self._executor
+
+    def _watch_starts(self, started_queue, stopped: threading.Event):
+        """Mark jobs as started when a worker reports picking them up"""
+        while not stopped.is_set():
+            try:
+                job_id = started_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            event = self._started.get(job_id)
+            if event is not None:
+                event.set()
+
+    def _reset_executor(self, executor: ProcessPoolExecutor, kill: bool = False):
+        """Drop a broken or stuck executor (unless it has already been replaced)"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.stopped.set()
+        if kill:
+            # A render stuck inside WeasyPrint never returns, so its process has to go; the
+            # executor then fails every job it had in flight, which releases their slots
+            for process in list((executor._processes or {}).values()):
+                process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn, *args) -> Future:
+        if self.workers <= 0:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            future.started = threading.Event()
+            future.started.set()
+            return future
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PDFRenderBusyError("PDF rendering queue is full, please retry later")
+        job_id = next(self._job_ids)
+        started = self._started[job_id] = threading.Event()
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(_run_job, job_id, fn, *args)
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                executor = self._get_executor()
+                future = executor.submit(_run_job, job_id, fn, *args)
+        except Exception:
+            self._started.pop(job_id, None)
+            self._slots.release()
+            raise
+        future.executor = executor
+        future.started = started
+
+        def finished(_):
+            self._started.pop(job_id, None)
+            self._slots.release()
+
+        future.add_done_callback(finished)
+        return future
+
+    def _wait(self, future: Future, timeout: float) -> str:
+        """Wait for a job; the timeout counts from when a worker picks it up, not from submit"""
+        try:
+            while not future.started.wait(QUEUED_POLL_INTERVAL):
+                if future.done():
+                    break
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                self._reset_executor(future.executor, kill=True)
+            raise Exception(f"PDF rendering timed out after {timeout:.0f} seconds")
+        except BrokenProcessPool:
+            self._reset_executor(future.executor)
+            raise Exception("PDF rendering worker crashed")
+
+    def submit(self, html_content: str, output_path: str) -> Future:
+        """Queue a render job and return its future (blocks while the queue is full)"""
+        return self._submit(render_pdf, html_content, output_path)
+
+    def render(self, html_content: str, output_path: str) -> str:
+        """Render HTML to output_path and wait for the result"""
+        return self._wait(self.submit(html_content, output_path), self.timeout)
+
+    def wait(self, future: Future) -> str:
+        """Wait for a submitted render job with the per-job timeout"""
+        return self._wait(future, self.timeout)
+
+    def render_booklet(self, html_documents: List[str], output_path: str) -> str:
+        """Render several reports into one PDF in a single worker, within the booklet timeout"""
+        future = self._submit(render_pdf_booklet, html_documents, output_path)
+        return self._wait(future, self.booklet_timeout)
+
+    def shutdown(self):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.stopped.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+pdf_render_pool = PDFRenderPool(PDF_RENDER_WORKERS, PDF_RENDER_QUEUE_SIZE, PDF_RENDER_TIMEOUT, PDF_BOOKLET_TIMEOUT)
@@ -0,0 +1,110 @@
+from jinja2 import ChoiceLoader, DictLoader, Environment, FileSystemLoader, Template
+import base64
+import os
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "frontend", "templates")
+IMAGES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "frontend", "static", "images")
+REPORT_TEMPLATE_NAME = "report_template.html"
+# Re-check template files for changes on every render (useful in development)
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() in ("1", "true", "yes")
+
+LOGO_FILES = {
+    "dipf_logo": "dipf_logo.png",
+    "goethe_logo": "goethe_logo.png"
+}
+
+# Used when frontend/templates/report_template.html is not available
+FALLBACK_REPORT_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Evaluation Report - {{ evaluation.report_title }}</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        h1 { color: #333; }
+        .header { border-bottom: 2px solid #333; padding-bottom: 20px; margin-bottom: 30px; }
+        .section { margin: 20px 0; }
+        .score { font-weight: bold; color: #0066cc; }
+        .total { font-size: 1.2em; margin-top: 30px; padding-top: 20px; border-top: 2px solid #333; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Academic Evaluation Report</h1>
+        <p><strong>Student:</strong> {{ evaluation.student.first_name }} {{ evaluation.student.last_name }}</p>
+        <p><strong>Matriculation Number:</strong> {{ evaluation.student.matriculation_number }}</p>
+        <p><strong>Report Title:</strong> {{ evaluation.report_title }}</p>
+        <p><strong>Report Type:</strong> {{ evaluation.report_type.name }}</p>
+        {% if evaluation.oberseminar_date %}
+        <p><strong>Oberseminar Date:</strong> {{ evaluation.oberseminar_date }}</p>
+        {% endif %}
+        {% if evaluation.oberseminar_time %}
+        <p><strong>Oberseminar Time:</strong> {{ evaluation.oberseminar_time }}</p>
+        {% endif %}
+    </div>
+    
+    <h2>Evaluation Details</h2>
+    {% for score in evaluation.scores %}
+    <div class="section">
+        <h3>{{ score.rubric.section_name }}</h3>
+        <p><strong>Score:</strong> <span class="score">{{ score.score }} / {{ score.rubric.max_points }}</span></p>
+        {% if score.feedback %}
+        <p><strong>Feedback:</strong> {{ score.feedback }}</p>
+        {% endif %}
+    </div>
+    {% endfor %}
+    
+    <div class="total">
+        <h2>Total Score</h2>
+        <p><strong>{{ evaluation.total_score }} / {{ evaluation.max_possible_score }}</strong></p>
+        <p><strong>Percentage:</strong> {{ "%.2f"|format((evaluation.total_score / evaluation.max_possible_score * 100) if evaluation.max_possible_score > 0 else 0) }}%</p>
+        <p><strong>Evaluation Method:</strong> {{ evaluation.evaluation_method }}</p>
+    </div>
+</body>
+</html>
+"""
+
+
+class ReportRenderer:
+    """Shared Jinja environment for report templates with pre-encoded logo assets.
+
+    Templates are compiled once and kept in the environment's cache; logos are read
+    and base64-encoded once so PDF renders only pay for template execution.
+    """
+
+    def __init__(self, templates_dir: str = TEMPLATES_DIR, images_dir: str = IMAGES_DIR,
+                 auto_reload: bool = TEMPLATE_AUTO_RELOAD):
+        self.environment = Environment(
+            loader=ChoiceLoader([
+                FileSystemLoader(templates_dir),
+                DictLoader({REPORT_TEMPLATE_NAME: FALLBACK_REPORT_TEMPLATE})
+            ]),
+            auto_reload=auto_reload
+        )
+        # Browser view links the static files; PDFs embed them as data URIs
+        self.logo_urls = {name: f"/static/images/{filename}" for name, filename in LOGO_FILES.items()}
+        self.logo_data_uris = self._encode_logos(images_dir)
+
+    @staticmethod
+    def _encode_logos(images_dir: str) -> dict:
+        data_uris = {}
+        for name, filename in LOGO_FILES.items():
+            logo_path = os.path.join(images_dir, filename)
+            if os.path.exists(logo_path):
+                with open(logo_path, "rb") as img_file:
+                    base64_data = base64.b64encode(img_file.read()).decode("utf-8")
+                data_uris[name] = f"data:image/png;base64,{base64_data}"
+            else:
+                data_uris[name] = ""
+        return data_uris
+
+    def get_report_template(self) -> Template:
+        return self.environment.get_template(REPORT_TEMPLATE_NAME)
+
+    def render_report(self, evaluation, embed_logos: bool = False) -> str:
+        """Render the evaluation report; embed_logos inlines the logos for PDF conversion"""
+        logos = self.logo_data_uris if embed_logos else self.logo_urls
+        return self.get_report_template().render(evaluation=evaluation, logos=logos)
+
+
+report_renderer = ReportRenderer()
@@ -1,16 +1,53 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
-from ..models import Evaluation
-from jinja2 import Template
+from typing import Iterator, List, Optional, Tuple
+from collections import deque
+from datetime import date, datetime, time, timedelta
+from ..database import SessionLocal
+from ..models import Evaluation, EvaluationScore
+from .evaluation_service import EvaluationService
+from .pdf_cache import pdf_cache
+from .pdf_renderer import pdf_render_pool
+from .report_renderer import report_renderer
+import asyncio
+import io
 import os
+import re
+import threading
+import zipfile
+
+EXPORT_LOAD_CHUNK_SIZE = 50
+EXPORT_RENDER_WINDOW = int(os.getenv("EXPORT_RENDER_WINDOW", "16"))
+EXPORT_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_evaluations(session, flush_context):
+    """Remember evaluations whose scores changed so their cached PDFs can be dropped on commit"""
+    changed = session.info.setdefault("changed_evaluation_ids", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Evaluation) and obj.id is not None:
+            changed.add(obj.id)
+        elif isinstance(obj, EvaluationScore) and obj.evaluation_id is not None:
+            changed.add(obj.evaluation_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_pdf_reports(session):
+    for evaluation_id in session.info.pop("changed_evaluation_ids", ()):
+        pdf_cache.invalidate(evaluation_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_evaluations(session):
+    session.info.pop("changed_evaluation_ids", None)
 
 
 class ReportService:
     @staticmethod
-    def generate_html_report(db: Session, evaluation_id: int) -> str:
-        """Generate HTML evaluation report"""
+    def _load_evaluation(db: Session, evaluation_id: int) -> Evaluation:
         from sqlalchemy.orm import joinedload
-        from ..models import EvaluationScore
         evaluation = db.query(Evaluation)\
             .options(joinedload(Evaluation.student),
                     joinedload(Evaluation.report_type),
@@ -18,85 +55,31 @@ class ReportService:
             .filter(Evaluation.id == evaluation_id).first()
         if not evaluation:
             raise Exception("Evaluation not found")
-        
-        # Load HTML template
-        template_path = os.path.join(
-            os.path.dirname(__file__), "..", "..", "..", "frontend", "templates", "report_template.html"
-        )
-        
-        if os.path.exists(template_path):
-            with open(template_path, "r", encoding="utf-8") as f:
-                template = Template(f.read())
-        else:
-            # Fallback template
-            template = Template("""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Evaluation Report - {{ evaluation.report_title }}</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 40px; }
-        h1 { color: #333; }
-        .header { border-bottom: 2px solid #333; padding-bottom: 20px; margin-bottom: 30px; }
-        .section { margin: 20px 0; }
-        .score { font-weight: bold; color: #0066cc; }
-        .total { font-size: 1.2em; margin-top: 30px; padding-top: 20px; border-top: 2px solid #333; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Academic Evaluation Report</h1>
-        <p><strong>Student:</strong> {{ evaluation.student.first_name }} {{ evaluation.student.last_name }}</p>
-        <p><strong>Matriculation Number:</strong> {{ evaluation.student.matriculation_number }}</p>
-        <p><strong>Report Title:</strong> {{ evaluation.report_title }}</p>
-        <p><strong>Report Type:</strong> {{ evaluation.report_type.name }}</p>
-        {% if evaluation.oberseminar_date %}
-        <p><strong>Oberseminar Date:</strong> {{ evaluation.oberseminar_date }}</p>
-        {% endif %}
-        {% if evaluation.oberseminar_time %}
-        <p><strong>Oberseminar Time:</strong> {{ evaluation.oberseminar_time }}</p>
-        {% endif %}
-    </div>
-    
-    <h2>Evaluation Details</h2>
-    {% for score in evaluation.scores %}
-    <div class="section">
-        <h3>{{ score.rubric.section_name }}</h3>
-        <p><strong>Score:</strong> <span class="score">{{ score.score }} / {{ score.rubric.max_points }}</span></p>
-        {% if score.feedback %}
-        <p><strong>Feedback:</strong> {{ score.feedback }}</p>
-        {% endif %}
-    </div>
-    {% endfor %}
-    
-    <div class="total">
-        <h2>Total Score</h2>
-        <p><strong>{{ evaluation.total_score }} / {{ evaluation.max_possible_score }}</strong></p>
-        <p><strong>Percentage:</strong> {{ "%.2f"|format((evaluation.total_score / evaluation.max_possible_score * 100) if evaluation.max_possible_score > 0 else 0) }}%</p>
-        <p><strong>Evaluation Method:</strong> {{ evaluation.evaluation_method }}</p>
-    </div>
-</body>
-</html>
-            """)
-        
-        return template.render(evaluation=evaluation)
+        return evaluation
 
     @staticmethod
-    def generate_pdf_report(db: Session, evaluation_id: int, output_path: Optional[str] = None) -> str:
-        """Generate PDF evaluation report using WeasyPrint (HTML to PDF)"""
-        from sqlalchemy.orm import joinedload
-        from ..models import EvaluationScore
-        from weasyprint import HTML, CSS
-        from datetime import datetime
-        import base64
-        
-        evaluation = db.query(Evaluation)\
-            .options(joinedload(Evaluation.student),
-                    joinedload(Evaluation.report_type),
-                    joinedload(Evaluation.scores).joinedload(EvaluationScore.rubric))\
-            .filter(Evaluation.id == evaluation_id).first()
+    def generate_html_report(db: Session, evaluation_id: int) -> str:
+        """Generate HTML evaluation report"""
+        evaluation = ReportService._load_evaluation(db, evaluation_id)
+        return ReportService.render_html_report(evaluation)
+
+    @staticmethod
+    async def agenerate_html_report(db: AsyncSession, evaluation_id: int) -> str:
+        """generate_html_report on an AsyncSession; the template is rendered off the event loop"""
+        evaluation = await EvaluationService.aget_evaluation(db, evaluation_id)
         if not evaluation:
             raise Exception("Evaluation not found")
+        return await asyncio.to_thread(ReportService.render_html_report, evaluation)
+
+    @staticmethod
+    def render_html_report(evaluation: Evaluation) -> str:
+        """Render the HTML report for an evaluation with loaded scores and rubrics"""
+        return report_renderer.render_report(evaluation)
+
+    @staticmethod
+    def generate_pdf_report(db: Session, evaluation_id: int, output_path: Optional[str] = None) -> str:
+        """Generate PDF evaluation report using WeasyPrint (HTML to PDF)"""
+        evaluation = ReportService._load_evaluation(db, evaluation_id)
         
         if not output_path:
             output_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "reports")
@@ -104,23 +87,201 @@ class ReportService:
             output_path = os.path.join(output_dir, f"evaluation_{evaluation_id}.pdf")
         
         # Generate HTML report first
-        html_content = ReportService.generate_html_report(db, evaluation_id)
+        html_content = ReportService.render_pdf_html(evaluation)
+        
+        # Convert HTML to PDF using WeasyPrint in the rendering pool
+        pdf_render_pool.render(html_content, output_path)
         
-        # Embed logos as base64 for PDF generation
-        logo_paths = {
-            'dipf_logo.png': os.path.join(os.path.dirname(__file__), "..", "..", "..", "frontend", "static", "images", "dipf_logo.png"),
-            'goethe_logo.png': os.path.join(os.path.dirname(__file__), "..", "..", "..", "frontend", "static", "images", "goethe_logo.png")
-        }
+        return output_path
+
+    @staticmethod
+    def render_pdf_html(evaluation: Evaluation) -> str:
+        """Render the report HTML with logos embedded for PDF conversion"""
+        return report_renderer.render_report(evaluation, embed_logos=True)
+
+    @staticmethod
+    def get_cached_pdf_report(db: Session, evaluation_id: int) -> str:
+        """Return the path of a current PDF report, rendering it only if not cached"""
+        row = db.query(Evaluation.id, Evaluation.created_at, Evaluation.updated_at)\
+            .filter(Evaluation.id == evaluation_id).first()
+        if not row:
+            raise Exception("Evaluation not found")
         
-        for logo_name, logo_path in logo_paths.items():
-            if os.path.exists(logo_path):
-                with open(logo_path, "rb") as img_file:
-                    base64_data = base64.b64encode(img_file.read()).decode('utf-8')
-                    data_uri = f"data:image/png;base64,{base64_data}"
-                    html_content = html_content.replace(f"file:///app/frontend/static/images/{logo_name}", data_uri)
+        version = row.updated_at or row.created_at
+        cached_path = pdf_cache.get(evaluation_id, version)
+        if cached_path:
+            return cached_path
         
-        # Convert HTML to PDF using WeasyPrint
-        HTML(string=html_content).write_pdf(output_path)
+        os.makedirs(pdf_cache.directory, exist_ok=True)
+        cache_path = pdf_cache.path_for(evaluation_id, version)
+        rendered_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            ReportService.generate_pdf_report(db, evaluation_id, output_path=rendered_path)
+            return pdf_cache.store(evaluation_id, rendered_path, cache_path)
+        finally:
+            if os.path.exists(rendered_path):
+                os.remove(rendered_path)
+
+    @staticmethod
+    def find_evaluation_ids(
+        db: Session, report_type_id: Optional[int] = None, evaluator_id: Optional[int] = None,
+        date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> List[int]:
+        """Get ids of the evaluations matching the export filters, oldest first"""
+        query = db.query(Evaluation.id)
+        if report_type_id is not None:
+            query = query.filter(Evaluation.report_type_id == report_type_id)
+        if evaluator_id is not None:
+            query = query.filter(Evaluation.evaluator_id == evaluator_id)
+        if date_from is not None:
+            query = query.filter(Evaluation.created_at >= datetime.combine(date_from, time.min))
+        if date_to is not None:
+            query = query.filter(Evaluation.created_at < datetime.combine(date_to + timedelta(days=1), time.min))
+        return [row.id for row in query.order_by(Evaluation.created_at, Evaluation.id).all()]
+
+    @staticmethod
+    def _iter_evaluations(evaluation_ids: List[int]) -> Iterator[Evaluation]:
+        """Load evaluations for export in chunks, with their own session"""
+        from sqlalchemy.orm import joinedload
+        db = SessionLocal()
+        try:
+            for start in range(0, len(evaluation_ids), EXPORT_LOAD_CHUNK_SIZE):
+                chunk_ids = evaluation_ids[start:start + EXPORT_LOAD_CHUNK_SIZE]
+                evaluations = db.query(Evaluation)\
+                    .options(joinedload(Evaluation.student),
+                            joinedload(Evaluation.report_type),
+                            joinedload(Evaluation.scores).joinedload(EvaluationScore.rubric))\
+                    .filter(Evaluation.id.in_(chunk_ids)).all()
+                by_id = {evaluation.id: evaluation for evaluation in evaluations}
+                for evaluation_id in chunk_ids:
+                    if evaluation_id in by_id:
+                        yield by_id[evaluation_id]
+                db.expunge_all()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _export_filename(evaluation: Evaluation) -> str:
+        name = f"{evaluation.student.matriculation_number}_{evaluation.student.last_name}_{evaluation.report_type.name}"
+        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_")
+        return f"{safe_name}_evaluation_{evaluation.id}.pdf"
+
+    @staticmethod
+    def _iter_export_pdfs(evaluation_ids: List[int]) -> Iterator[Tuple[str, str]]:
+        """Yield (archive name, PDF path) in order, rendering cache misses in parallel.
+
+        Up to EXPORT_RENDER_WINDOW renders are in flight ahead of the report being
+        yielded, so memory stays bounded regardless of the cohort size.
+        """
+        pending = deque()
         
-        return output_path
+        def finish(entry):
+            evaluation_id, filename, future, cache_path, rendered_path = entry
+            if future is None:
+                return filename, cache_path
+            try:
+                pdf_render_pool.wait(future)
+                return filename, pdf_cache.store(evaluation_id, rendered_path, cache_path)
+            finally:
+                if os.path.exists(rendered_path):
+                    os.remove(rendered_path)
+        
+        os.makedirs(pdf_cache.directory, exist_ok=True)
+        try:
+            for evaluation in ReportService._iter_evaluations(evaluation_ids):
+                version = evaluation.updated_at or evaluation.created_at
+                filename = ReportService._export_filename(evaluation)
+                cached_path = pdf_cache.get(evaluation.id, version)
+                if cached_path:
+                    pending.append((evaluation.id, filename, None, cached_path, None))
+                else:
+                    cache_path = pdf_cache.path_for(evaluation.id, version)
+                    rendered_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    future = pdf_render_pool.submit(ReportService.render_pdf_html(evaluation), rendered_path)
+                    pending.append((evaluation.id, filename, future, cache_path, rendered_path))
+                
+                while len(pending) > EXPORT_RENDER_WINDOW:
+                    yield finish(pending.popleft())
+            
+            while pending:
+                yield finish(pending.popleft())
+        finally:
+            # Client disconnected or rendering failed: drop renders nobody will collect
+            for _, _, future, _, rendered_path in pending:
+                if future is not None:
+                    future.cancel()
+                    if os.path.exists(rendered_path):
+                        os.remove(rendered_path)
+
+    @staticmethod
+    def stream_pdf_zip(evaluation_ids: List[int]) -> Iterator[bytes]:
+        """Stream a ZIP archive with one PDF report per evaluation"""
+        buffer = _StreamBuffer()
+        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for filename, pdf_path in ReportService._iter_export_pdfs(evaluation_ids):
+                with archive.open(filename, mode="w") as entry, open(pdf_path, "rb") as pdf_file:
+                    while True:
+                        data = pdf_file.read(EXPORT_STREAM_CHUNK_SIZE)
+                        if not data:
+                            break
+                        entry.write(data)
+                        yield buffer.pop()
+                yield buffer.pop()
+        yield buffer.pop()
+
+    @staticmethod
+    def stream_pdf_booklet(evaluation_ids: List[int]) -> Iterator[bytes]:
+        """Stream a single PDF containing all reports, each starting on a new page.
+
+        Unlike the ZIP export this is neither parallel nor streamed while rendering: one
+        worker lays out the whole booklet and sending starts once the file is written, so
+        callers cap the number of reports (see EXPORT_BOOKLET_MAX_REPORTS).
+        """
+        html_documents = [
+            ReportService.render_pdf_html(evaluation)
+            for evaluation in ReportService._iter_evaluations(evaluation_ids)
+        ]
+        os.makedirs(pdf_cache.directory, exist_ok=True)
+        output_path = os.path.join(
+            pdf_cache.directory, f"booklet_{os.getpid()}_{threading.get_ident()}_{id(html_documents)}.pdf.tmp"
+        )
+        try:
+            pdf_render_pool.render_booklet(html_documents, output_path)
+            del html_documents
+            with open(output_path, "rb") as pdf_file:
+                while True:
+                    data = pdf_file.read(EXPORT_STREAM_CHUNK_SIZE)
+                    if not data:
+                        break
+                    yield data
+        finally:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only, non-seekable sink that lets zipfile produce an archive incrementally"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
 
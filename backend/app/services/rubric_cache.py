@@ -0,0 +1,171 @@
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from ..models import ReportType, Rubric
+from ..schemas import RubricResponse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# How long a cached entry is used before its report type's rubric_version is re-read;
+# changes made in this process are visible immediately, other processes within this interval
+RUBRIC_CACHE_CHECK_INTERVAL = float(os.getenv("RUBRIC_CACHE_CHECK_INTERVAL", "5"))
+
+# Used for rubrics without parseable criteria ranges: five equal bands of the 0-10 scale
+DEFAULT_SCORE_BANDS = ((8.0, 10.0, ""), (6.0, 8.0, ""), (4.0, 6.0, ""), (2.0, 4.0, ""), (0.0, 2.0, ""))
+DEFAULT_CRITERIA_SCALE = 10.0
+# Criteria entry with the rubric's rule-based evaluation keywords, not a score band
+CRITERIA_KEYWORDS_KEY = "keywords"
+
+
+def parse_score_bands(criteria: Optional[dict]) -> Tuple[List[Tuple[float, float, str]], float]:
+    """Parse criteria such as {"10-9": "...", "0-2": "..."} into (low, high, description) bands.
+
+    Returns the bands from highest to lowest and the scale they are defined on (the highest
+    bound, usually 10); a rubric score is mapped onto that scale before it is assigned to a band.
+    """
+    bands = []
+    if isinstance(criteria, dict):
+        for score_range, description in criteria.items():
+            numbers = [float(n) for n in re.findall(r"\d+(?:\.\d+)?", str(score_range))]
+            if numbers:
+                bands.append((min(numbers), max(numbers), str(description)))
+    if not bands:
+        return list(DEFAULT_SCORE_BANDS), DEFAULT_CRITERIA_SCALE
+    bands.sort(key=lambda band: band[0], reverse=True)
+    return bands, max(high for _, high, _ in bands)
+
+
+def render_rubric_prompt_block(rubrics: List[RubricResponse]) -> str:
+    """Rubric sections as presented to the language model"""
+    rubric_sections = []
+    for r in rubrics:
+        section_text = f"## {r.section_name} (Max: {r.max_points} points)\n"
+        section_text += f"Description: {r.description or 'No description provided'}\n"
+
+        if r.criteria and isinstance(r.criteria, dict):
+            section_text += "\nEvaluation Criteria:\n"
+            for score_range, criterion_desc in r.criteria.items():
+                if score_range == CRITERIA_KEYWORDS_KEY:
+                    continue
+                section_text += f"- Score {score_range}: {criterion_desc}\n"
+
+        rubric_sections.append(section_text)
+
+    return "\n\n".join(rubric_sections)
+
+
+def rubric_fingerprint(rubrics: List[RubricResponse]) -> str:
+    """Fingerprint of the rubric definitions used to score a report"""
+    payload = json.dumps(
+        [[r.id, r.section_name, r.max_points, r.description, r.criteria] for r in rubrics],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RubricCacheEntry:
+    """Everything derived from the rubrics of one report type at one rubric_version"""
+
+    def __init__(self, report_type_id: int, version: Optional[int], rubrics: List[RubricResponse]):
+        self.report_type_id = report_type_id
+        self.version = version
+        self.rubrics = rubrics
+        self.rubrics_by_id = {r.id: r for r in rubrics}
+        self.rubrics_by_section = {r.section_name: r for r in rubrics}
+        self.score_bands = {r.id: parse_score_bands(r.criteria) for r in rubrics}
+        self.prompt_block = render_rubric_prompt_block(rubrics)
+        self.fingerprint = rubric_fingerprint(rubrics)
+        self.compiled_rules = None  # built on first use by rule_engine.compiled_rules
+        self.checked_at = time.monotonic()
+
+
+class RubricCache:
+    """Rubrics per report type, reloaded when the report type's rubric_version changes.
+
+    Entries are detached snapshots (RubricResponse objects), safe to share between
+    threads and requests. Writers call RubricService.bump_rubric_version in the same
+    transaction as the rubric change.
+    """
+
+    def __init__(self, check_interval: float = RUBRIC_CACHE_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._entries: Dict[int, RubricCacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def _fresh_entry(self, report_type_id: int) -> Tuple[Optional[RubricCacheEntry], bool]:
+        """The cached entry and whether it was checked recently enough to use without a query"""
+        with self._lock:
+            entry = self._entries.get(report_type_id)
+        return entry, bool(entry and time.monotonic() - entry.checked_at < self.check_interval)
+
+    def _store(self, report_type_id: int, version: Optional[int], rubrics: List[Rubric]) -> RubricCacheEntry:
+        entry = RubricCacheEntry(report_type_id, version, [RubricResponse.model_validate(r) for r in rubrics])
+        if version is not None:
+            with self._lock:
+                self._entries[report_type_id] = entry
+        return entry
+
+    @staticmethod
+    def _still_current(entry: Optional[RubricCacheEntry], version: Optional[int]) -> bool:
+        if entry and version is not None and entry.version == version:
+            entry.checked_at = time.monotonic()
+            return True
+        return False
+
+    def get(self, db: Session, report_type_id: int) -> RubricCacheEntry:
+        """Cached rubrics of a report type (an entry with no rubrics if it has none or does not exist)"""
+        entry, fresh = self._fresh_entry(report_type_id)
+        if fresh:
+            return entry
+
+        version = db.query(ReportType.rubric_version).filter(ReportType.id == report_type_id).scalar()
+        if self._still_current(entry, version):
+            return entry
+
+        rubrics = db.query(Rubric).filter(
+            Rubric.report_type_id == report_type_id
+        ).order_by(Rubric.order).all()
+        return self._store(report_type_id, version, rubrics)
+
+    async def aget(self, db: AsyncSession, report_type_id: int) -> RubricCacheEntry:
+        """get() on an AsyncSession"""
+        entry, fresh = self._fresh_entry(report_type_id)
+        if fresh:
+            return entry
+
+        version = await db.scalar(select(ReportType.rubric_version).where(ReportType.id == report_type_id))
+        if self._still_current(entry, version):
+            return entry
+
+        rubrics = (await db.scalars(
+            select(Rubric).where(Rubric.report_type_id == report_type_id).order_by(Rubric.order)
+        )).all()
+        return self._store(report_type_id, version, rubrics)
+
+    def invalidate(self, report_type_id: Optional[int] = None):
+        """Drop one report type's entry, or all entries"""
+        with self._lock:
+            if report_type_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(report_type_id, None)
+
+
+rubric_cache = RubricCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_rubrics(session):
+    """Drop cached rubrics of report types whose rubric_version was bumped in this transaction"""
+    for report_type_id in session.info.pop("bumped_rubric_report_type_ids", ()):
+        rubric_cache.invalidate(report_type_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_rubrics(session):
+    session.info.pop("bumped_rubric_report_type_ids", None)
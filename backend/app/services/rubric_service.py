@@ -1,10 +1,27 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, List, Optional
+import hashlib
 import json
 import os
 import pandas as pd
 from ..models import Rubric, ReportType
-from ..schemas import RubricCreate
+from ..schemas import RubricCreate, RubricResponse
+from .import_utils import column, first_errors, iter_import_chunks
+from .rubric_cache import rubric_cache
+
+RUBRIC_IMPORT_COLUMNS = ("report_type", "section_name", "max_points")
+
+
+def _parse_criteria(text: str) -> Optional[dict]:
+    """Criteria cell as a dict, None if it is blank or not a JSON object"""
+    if not text:
+        return None
+    try:
+        criteria = json.loads(text)
+    except ValueError:
+        return None
+    return criteria if isinstance(criteria, dict) else None
 
 
 class RubricService:
@@ -28,22 +45,66 @@ class RubricService:
                 return json.load(f)
         return {}
 
+    @staticmethod
+    def parse_rubric_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Convert a chunk of a rubric file column by column.
+
+        Returns report_type, section_name, max_points, description, criteria and order
+        (None or NaN where the file leaves them blank) with an error column ("" for valid rows).
+        """
+        report_types = column(chunk, "report_type")
+        section_names = column(chunk, "section_name")
+        max_points = pd.to_numeric(column(chunk, "max_points"), errors="coerce")
+        order_text = column(chunk, "order")
+        orders = pd.to_numeric(order_text, errors="coerce")
+        descriptions = column(chunk, "description")
+        criteria_text = column(chunk, "criteria")
+        criteria = criteria_text.map(_parse_criteria)
+        errors = first_errors(chunk, [
+            (report_types == "", "report_type is required"),
+            (section_names == "", "section_name is required"),
+            (max_points.isna() | (max_points <= 0), "max_points must be a positive number"),
+            ((order_text != "") & (orders.isna() | (orders % 1 != 0)), "order must be a whole number"),
+            ((criteria_text != "") & criteria.isna(), 'criteria must be a JSON object such as {"10-9": "..."}'),
+        ])
+        return pd.DataFrame({
+            "report_type": report_types,
+            "section_name": section_names,
+            "max_points": max_points,
+            "description": descriptions.where(descriptions != "", None),
+            "criteria": criteria,
+            "order": orders,
+            "error": errors,
+        }, index=chunk.index)
+
+    @staticmethod
+    def parse_rubric_file(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """parse_rubric_chunk over a whole file, which also flags repeated sections of a report
+        type and adds each row's position within its report type (starting at 1), the order
+        of a new section whose order is blank"""
+        parsed = [RubricService.parse_rubric_chunk(chunk) for chunk in chunks]
+        rubrics = pd.concat(parsed) if parsed else RubricService.parse_rubric_chunk(pd.DataFrame())
+        duplicated = rubrics.duplicated(["report_type", "section_name"]) & (rubrics["error"] == "")
+        rubrics["error"] = rubrics["error"].mask(duplicated, "Section appears more than once for this report type")
+        rubrics["position"] = rubrics.groupby("report_type").cumcount() + 1
+        return rubrics
+
+    @staticmethod
+    def _load_rubric_file(file_path: str, format: str) -> List[dict]:
+        with open(file_path, "rb") as f:
+            rubrics = RubricService.parse_rubric_file(iter_import_chunks(f, format))
+        invalid = rubrics[rubrics["error"] != ""]
+        if not invalid.empty:
+            raise Exception(f"row {invalid.index[0]}: {invalid['error'].iloc[0]}")
+        rubrics["order"] = rubrics["order"].fillna(rubrics["position"]).astype(int)
+        rubrics["criteria"] = rubrics["criteria"].map(lambda criteria: criteria or {})
+        return rubrics.drop(columns=["error", "position"]).to_dict("records")
+
     @staticmethod
     def load_rubrics_from_csv(file_path: str) -> List[dict]:
         """Load rubrics from CSV file"""
         try:
-            df = pd.read_csv(file_path)
-            rubrics = []
-            for _, row in df.iterrows():
-                rubrics.append({
-                    "report_type": row.get("report_type", ""),
-                    "section_name": row.get("section_name", ""),
-                    "max_points": float(row.get("max_points", 0)),
-                    "description": row.get("description", ""),
-                    "criteria": json.loads(row.get("criteria", "{}")) if isinstance(row.get("criteria"), str) else row.get("criteria", {}),
-                    "order": int(row.get("order", 0))
-                })
-            return rubrics
+            return RubricService._load_rubric_file(file_path, "csv")
         except Exception as e:
             raise Exception(f"Error loading rubrics from CSV: {str(e)}")
 
@@ -51,33 +112,137 @@ class RubricService:
     def load_rubrics_from_excel(file_path: str) -> List[dict]:
         """Load rubrics from Excel file"""
         try:
-            df = pd.read_excel(file_path)
-            rubrics = []
-            for _, row in df.iterrows():
-                rubrics.append({
-                    "report_type": row.get("report_type", ""),
-                    "section_name": row.get("section_name", ""),
-                    "max_points": float(row.get("max_points", 0)),
-                    "description": row.get("description", ""),
-                    "criteria": json.loads(row.get("criteria", "{}")) if isinstance(row.get("criteria"), str) else row.get("criteria", {}),
-                    "order": int(row.get("order", 0))
-                })
-            return rubrics
+            return RubricService._load_rubric_file(file_path, "excel")
         except Exception as e:
             raise Exception(f"Error loading rubrics from Excel: {str(e)}")
 
     @staticmethod
-    def get_rubrics_for_report_type(db: Session, report_type_id: int) -> List[Rubric]:
-        """Get all rubrics for a specific report type"""
-        return db.query(Rubric).filter(
-            Rubric.report_type_id == report_type_id
-        ).order_by(Rubric.order).all()
+    def content_hash(section_name: str, max_points: float, description: Optional[str], criteria: Optional[dict],
+                     order: int) -> str:
+        """Hash of everything that defines a rubric section; criteria keep their order, which the prompt follows"""
+        payload = json.dumps([section_name, float(max_points), description or "", criteria or {}, int(order or 0)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def import_rubrics(db: Session, chunks: Iterable[pd.DataFrame], dry_run: bool = False) -> dict:
+        """Create or update rubrics from a rubric file in one transaction.
+
+        Rows are matched to existing rubrics by report type name and section name and compared
+        by content hash, so only new ("created") and changed ("updated") sections are written;
+        report types that do not exist yet are created. Blank description, criteria and order
+        cells keep the values of an existing section (new sections get none, {} and their
+        position). Sections missing from the file are left as they are, since scores may refer
+        to them. Nothing is written if any row has an error, or with dry_run. Each changed
+        report type gets its rubric version bumped.
+        """
+        rubrics = RubricService.parse_rubric_file(chunks)
+        valid = rubrics["error"] == ""
+        report_type_names = rubrics.loc[valid, "report_type"].unique().tolist()
+
+        report_types = {
+            report_type.name: report_type
+            for report_type in db.query(ReportType).filter(ReportType.name.in_(report_type_names)).all()
+        }
+        existing = {
+            (rubric.report_type_id, rubric.section_name): rubric
+            for rubric in db.query(Rubric).filter(
+                Rubric.report_type_id.in_([report_type.id for report_type in report_types.values()])
+            ).all()
+        }
+
+        results = []
+        changes = []
+        for row, report_type_name, section_name, max_points, description, criteria, order, position, error in zip(
+                rubrics.index, rubrics["report_type"], rubrics["section_name"], rubrics["max_points"],
+                rubrics["description"], rubrics["criteria"], rubrics["order"], rubrics["position"], rubrics["error"]):
+            result = {"row": int(row), "report_type": report_type_name, "section_name": section_name}
+            results.append(result)
+            if error:
+                result.update({"status": "error", "error": error})
+                continue
+            report_type = report_types.get(report_type_name)
+            rubric = existing.get((report_type.id, section_name)) if report_type else None
+            if rubric is None:
+                criteria = criteria if criteria is not None else {}
+                order = position if pd.isna(order) else order
+            else:
+                description = description if description is not None else rubric.description
+                criteria = criteria if criteria is not None else rubric.criteria
+                order = rubric.order if pd.isna(order) else order
+            values = {"section_name": section_name, "max_points": float(max_points), "description": description,
+                      "criteria": criteria, "order": int(order)}
+            if rubric is None:
+                result["status"] = "created"
+            elif RubricService.content_hash(**values) == RubricService.content_hash(
+                    rubric.section_name, rubric.max_points, rubric.description, rubric.criteria, rubric.order):
+                result.update({"status": "unchanged", "rubric_id": rubric.id})
+                continue
+            else:
+                result.update({"status": "updated", "rubric_id": rubric.id})
+            changes.append((result, report_type_name, rubric, values))
+
+        summary = {}
+        for result in results:
+            summary[result["status"]] = summary.get(result["status"], 0) + 1
+        created_report_types = sorted({name for _, name, _, _ in changes if name not in report_types})
+        applied = not dry_run and not summary.get("error") and bool(changes)
+
+        if applied:
+            for name in created_report_types:
+                report_types[name] = ReportType(name=name, description=f"{name} report type")
+                db.add(report_types[name])
+            db.flush()
+            written = []
+            for result, report_type_name, rubric, values in changes:
+                if rubric is None:
+                    rubric = Rubric(report_type_id=report_types[report_type_name].id, **values)
+                    db.add(rubric)
+                else:
+                    for key, value in values.items():
+                        setattr(rubric, key, value)
+                written.append((result, rubric))
+            db.flush()
+            for report_type_id in {rubric.report_type_id for _, rubric in written}:
+                RubricService.bump_rubric_version(db, report_type_id)
+            for result, rubric in written:
+                result["rubric_id"] = rubric.id
+            db.commit()
+
+        return {
+            "applied": applied,
+            "report_types_created": created_report_types,
+            "results": results,
+            "summary": summary
+        }
+
+    @staticmethod
+    def get_rubrics_for_report_type(db: Session, report_type_id: int) -> List[RubricResponse]:
+        """Get all rubrics for a specific report type (served from the rubric cache)"""
+        return rubric_cache.get(db, report_type_id).rubrics
+
+    @staticmethod
+    async def aget_rubrics_for_report_type(db: AsyncSession, report_type_id: int) -> List[RubricResponse]:
+        """get_rubrics_for_report_type on an AsyncSession"""
+        return (await rubric_cache.aget(db, report_type_id)).rubrics
+
+    @staticmethod
+    def bump_rubric_version(db: Session, report_type_id: int):
+        """Mark the rubrics of a report type as changed (does not commit).
+
+        Cached rubrics are dropped in this process when the transaction commits; other
+        processes notice the new version within RUBRIC_CACHE_CHECK_INTERVAL seconds.
+        """
+        db.query(ReportType).filter(ReportType.id == report_type_id).update(
+            {ReportType.rubric_version: ReportType.rubric_version + 1}, synchronize_session=False
+        )
+        db.info.setdefault("bumped_rubric_report_type_ids", set()).add(report_type_id)
 
     @staticmethod
     def create_rubric(db: Session, rubric: RubricCreate) -> Rubric:
         """Create a new rubric"""
         db_rubric = Rubric(**rubric.dict())
         db.add(db_rubric)
+        RubricService.bump_rubric_version(db, rubric.report_type_id)
         db.commit()
         db.refresh(db_rubric)
         return db_rubric
@@ -119,6 +284,7 @@ class RubricService:
                         order=rubric_data.get("order", 0)
                     )
                     db.add(rubric)
+                RubricService.bump_rubric_version(db, report_type.id)
             
             db.commit()
 
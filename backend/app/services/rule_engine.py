@@ -0,0 +1,199 @@
+"""Keyword rules for rule-based evaluation.
+
+Each rubric section is scored by a rule: a set of keywords or phrases with weights, and
+how many points their hits are worth. Rules come from backend/rubrics/rule_based_rules.json
+(RULE_BASED_RULES_PATH) and are assigned to sections by name; a rubric can bring its own
+keywords with a "keywords" entry in its criteria, e.g.
+    {"10-9": "...", "keywords": ["prototype", {"keyword": "user study", "weight": 2}]}
+
+A section scores min(max_score, hit_weight * weighted hits) of its max points, where
+weighted hits sums the occurrences of each keyword times its weight. The defaults give
+the previous scoring: 70% of the points if a section's keywords occur at all, 50% for
+sections without a rule whose name occurs in the report.
+
+When hit counts matter, all keywords of a report type are compiled into one regex shaped
+like a trie of the keywords, so a single pass over the report counts every keyword, and the
+pass costs about the same for a handful of keywords as for hundreds. When every rule already
+reaches its max_score with one hit (as with the defaults), the report is only searched until
+each rule has found one keyword.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..schemas import EvaluationScoreCreate, RubricResponse
+from .rubric_cache import CRITERIA_KEYWORDS_KEY, RubricCacheEntry
+import json
+import os
+import re
+
+RULE_BASED_RULES_PATH = os.getenv(
+    "RULE_BASED_RULES_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "..", "rubrics", "rule_based_rules.json")
+)
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex matching any of the keywords, nested by common prefix (e.g. "intro(?:duc(?:tion|e))").
+
+    The regex engine then only follows the branch of the next character instead of trying
+    every keyword at every position, and as the optional groups are greedy, each match is the
+    longest keyword starting at that position.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        is_end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if is_end else group
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Counts occurrences of many keywords with a single pass over a text (case-insensitive).
+
+    Matches do not overlap: at each position the longest keyword wins, and keywords inside
+    that match (e.g. "spec" in "specification") are counted as well.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword})
+        self._pattern = re.compile(_trie_pattern(self.keywords)) if self.keywords else None
+        self._contained = {
+            keyword: [(other, keyword.count(other)) for other in self.keywords if other != keyword and other in keyword]
+            for keyword in self.keywords
+        }
+
+    def count(self, text: str) -> Dict[str, int]:
+        if self._pattern is None:
+            return {}
+        counts = Counter(self._pattern.findall(text.lower()))
+        for keyword, matches in list(counts.items()):
+            for other, occurrences in self._contained[keyword]:
+                counts[other] += matches * occurrences
+        return counts
+
+
+class KeywordRule:
+    """Keywords (with weights) of a rubric section and the share of its points their hits are worth"""
+
+    def __init__(self, keywords: Dict[str, float], hit_weight: float, max_score: float, feedback: str):
+        self.keywords = keywords
+        self.hit_weight = hit_weight
+        self.max_score = max_score
+        self.feedback = feedback
+        # False if a single hit of any keyword already earns max_score
+        self.counts_hits = any(hit_weight * weight < max_score for weight in keywords.values())
+
+    def score(self, rubric: RubricResponse, counts: Dict[str, int]) -> EvaluationScoreCreate:
+        hits = sum(counts.get(keyword, 0) * weight for keyword, weight in self.keywords.items())
+        if hits <= 0:
+            return EvaluationScoreCreate(
+                rubric_id=rubric.id, score=0.0, feedback=f"Rule-based evaluation for {rubric.section_name}"
+            )
+        return EvaluationScoreCreate(
+            rubric_id=rubric.id,
+            score=rubric.max_points * min(self.max_score, self.hit_weight * hits),
+            feedback=self.feedback.format(section_name=rubric.section_name)
+        )
+
+
+def _keyword_weights(keywords: Iterable) -> Dict[str, float]:
+    """Keywords given as strings (weight 1) or {"keyword": ..., "weight": ...}"""
+    weights = {}
+    for keyword in keywords or ():
+        if isinstance(keyword, dict):
+            weights[str(keyword["keyword"]).lower()] = float(keyword.get("weight", 1.0))
+        elif keyword:
+            weights[str(keyword).lower()] = 1.0
+    return weights
+
+
+class RuleSet:
+    """Keyword rules by section name, as configured in the rules file"""
+
+    def __init__(self, config: dict):
+        defaults = config.get("defaults", {})
+        self.hit_weight = float(defaults.get("hit_weight", 0.7))
+        self.max_score = float(defaults.get("max_score", 0.7))
+        self.rules = [
+            (
+                [section.lower() for section in rule.get("sections", [])],
+                _keyword_weights(rule.get("keywords")),
+                float(rule.get("hit_weight", self.hit_weight)),
+                float(rule.get("max_score", self.max_score)),
+                rule.get("feedback", "{section_name} section found.")
+            )
+            for rule in config.get("rules", [])
+        ]
+        fallback = config.get("fallback", {})
+        self.fallback_hit_weight = float(fallback.get("hit_weight", 0.5))
+        self.fallback_max_score = float(fallback.get("max_score", 0.5))
+        self.fallback_feedback = fallback.get("feedback", "{section_name} section found.")
+
+    @classmethod
+    def load(cls, path: str = RULE_BASED_RULES_PATH) -> "RuleSet":
+        if not os.path.exists(path):
+            print(f"Rule-based evaluation rules not found at {path}, using section names only")
+            return cls({})
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def rule_for(self, rubric: RubricResponse) -> KeywordRule:
+        """The first rule whose sections occur in the rubric's section name, or the fallback
+        rule that looks for the section name itself; keywords in the criteria replace the rule's"""
+        section_name = rubric.section_name.lower()
+        rule = next((rule for rule in self.rules if any(section in section_name for section in rule[0])), None)
+        if rule is not None:
+            _, keywords, hit_weight, max_score, feedback = rule
+        else:
+            keywords = {section_name: 1.0}
+            hit_weight, max_score, feedback = self.fallback_hit_weight, self.fallback_max_score, self.fallback_feedback
+
+        criteria = rubric.criteria if isinstance(rubric.criteria, dict) else {}
+        if criteria.get(CRITERIA_KEYWORDS_KEY):
+            keywords = _keyword_weights(criteria[CRITERIA_KEYWORDS_KEY])
+        return KeywordRule(keywords, hit_weight, max_score, feedback)
+
+
+class CompiledRules:
+    """Rules of one report type's rubrics with all their keywords in one matcher"""
+
+    def __init__(self, rubrics: List[RubricResponse], rule_set: RuleSet):
+        self.rules: List[Tuple[RubricResponse, KeywordRule]] = [(rubric, rule_set.rule_for(rubric)) for rubric in rubrics]
+        self.matcher = KeywordMatcher(keyword for _, rule in self.rules for keyword in rule.keywords)
+        self.counts_hits = any(rule.counts_hits for _, rule in self.rules)
+
+    def score(self, text: str) -> List[EvaluationScoreCreate]:
+        if self.counts_hits:
+            counts = self.matcher.count(text)
+        else:
+            # One keyword per rule is enough, and a substring search stops at the first occurrence
+            content_lower = text.lower()
+            counts = {}
+            for _, rule in self.rules:
+                keyword = next((keyword for keyword in rule.keywords if keyword in content_lower), None)
+                if keyword is not None:
+                    counts[keyword] = 1
+        return [rule.score(rubric, counts) for rubric, rule in self.rules]
+
+
+rule_set = RuleSet.load()
+
+
+def compiled_rules(rubric_entry: RubricCacheEntry, rules: Optional[RuleSet] = None) -> CompiledRules:
+    """Compiled rules for a rubric cache entry, built once per entry (and so per rubric version)"""
+    if rules is not None:
+        return CompiledRules(rubric_entry.rubrics, rules)
+    if rubric_entry.compiled_rules is None:
+        rubric_entry.compiled_rules = CompiledRules(rubric_entry.rubrics, rule_set)
+    return rubric_entry.compiled_rules
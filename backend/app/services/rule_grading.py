@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from ..schemas import RubricResponse
+from .rule_engine import CompiledRules, rule_set
+import multiprocessing
+import os
+import threading
+
+RULE_GRADING_WORKERS = int(os.getenv("RULE_GRADING_WORKERS", str(os.cpu_count() or 1)))
+RULE_GRADING_CHUNK_SIZE = int(os.getenv("RULE_GRADING_CHUNK_SIZE", "100"))
+
+# Compiled rules kept per worker process, by rubric fingerprint
+COMPILED_RULES_PER_WORKER = 32
+
+_compiled_rules: "OrderedDict[str, CompiledRules]" = OrderedDict()
+
+# (rubric_id, score, feedback) per rubric of a report
+ReportScores = List[Tuple[int, float, str]]
+
+
+def score_reports(fingerprint: str, rubrics: List[dict], texts: List[str]) -> List[ReportScores]:
+    """Score reports of one report type with the rules compiled for its rubrics in this process.
+
+    Rubrics arrive as plain dicts (RubricResponse fields) so the arguments pickle cheaply;
+    they are only compiled the first time this process sees their fingerprint.
+    """
+    compiled = _compiled_rules.get(fingerprint)
+    if compiled is None:
+        compiled = CompiledRules([RubricResponse(**rubric) for rubric in rubrics], rule_set)
+        _compiled_rules[fingerprint] = compiled
+        if len(_compiled_rules) > COMPILED_RULES_PER_WORKER:
+            _compiled_rules.popitem(last=False)
+    else:
+        _compiled_rules.move_to_end(fingerprint)
+    return [
+        [(score.rubric_id, score.score, score.feedback) for score in compiled.score(text)]
+        for text in texts
+    ]
+
+
+class RuleGradingPool:
+    """Pool of worker processes for batch rule-based grading.
+
+    Keyword matching is pure CPU work, so chunks of reports are scored in separate
+    processes instead of threads that would serialize on the GIL. At most two chunks per
+    worker are in flight, so a large batch is read from its source as scoring progresses.
+    With fewer than two workers chunks are scored inline in the calling thread, where a
+    single worker process would only add the cost of sending the reports over.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn keeps the workers free of the parent's threads and open connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def score(
+        self, chunks: Iterable[Tuple[Any, str, List[dict], List[str]]]
+    ) -> Iterator[Tuple[Any, List[ReportScores]]]:
+        """Score (key, fingerprint, rubrics, texts) chunks, yielding (key, scores) as chunks complete"""
+        if self.workers < 2:
+            for key, fingerprint, rubrics, texts in chunks:
+                yield key, score_reports(fingerprint, rubrics, texts)
+            return
+
+        executor = self._get_executor()
+        pending: Dict[Future, Any] = {}
+        chunks = iter(chunks)
+        try:
+            while True:
+                for key, fingerprint, rubrics, texts in chunks:
+                    pending[executor.submit(score_reports, fingerprint, rubrics, texts)] = key
+                    if len(pending) >= self.workers * 2:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        except BrokenProcessPool:
+            self._reset_executor()
+            raise Exception("Rule-based grading worker crashed")
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+rule_grading_pool = RuleGradingPool(RULE_GRADING_WORKERS)
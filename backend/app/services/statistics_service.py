@@ -0,0 +1,250 @@
+from sqlalchemy import func, case, and_, insert
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date, datetime
+from ..database import dialect_insert
+from ..models import Evaluation, EvaluationStatsRollup, ReportType
+import math
+
+
+class StatisticsService:
+    """Score statistics answered from the evaluation_stats_rollups table.
+
+    Each rollup row holds count, sum, sum of squares, min and max of the total scores for
+    one (report type, evaluator, evaluation method, day) group. Rows are updated in the
+    same transaction that stores an evaluation, so reads cost O(number of groups) instead
+    of scanning every evaluation.
+    """
+
+    @staticmethod
+    def _format_statistics(report_type_id: int, report_type_name: str, total_evaluations: int,
+                           average_score: Optional[float], average_max_score: Optional[float],
+                           min_score: Optional[float], max_score: Optional[float]) -> dict:
+        if not total_evaluations:
+            return {
+                "report_type_id": report_type_id,
+                "report_type_name": report_type_name,
+                "total_evaluations": 0,
+                "average_score": 0.0,
+                "average_percentage": 0.0,
+                "max_possible_score": 0.0,
+                "min_score": 0.0,
+                "max_score": 0.0
+            }
+        
+        average_score = average_score or 0.0
+        average_max_score = average_max_score or 0.0
+        average_percentage = (average_score / average_max_score * 100) if average_max_score > 0 else 0.0
+        
+        return {
+            "report_type_id": report_type_id,
+            "report_type_name": report_type_name,
+            "total_evaluations": total_evaluations,
+            "average_score": round(average_score, 2),
+            "average_percentage": round(average_percentage, 2),
+            "max_possible_score": round(average_max_score, 2),
+            "min_score": round(min_score, 2) if min_score is not None else 0.0,
+            "max_score": round(max_score, 2) if max_score is not None else 0.0
+        }
+
+    @staticmethod
+    def record_evaluation(db: Session, evaluation: Evaluation, day: Optional[date] = None):
+        """Add an evaluation to its rollup group (does not commit; call inside the evaluation's transaction)"""
+        StatisticsService.record_evaluations(db, [{
+            "report_type_id": evaluation.report_type_id,
+            "evaluator_id": evaluation.evaluator_id,
+            "evaluation_method": evaluation.evaluation_method,
+            "day": day or datetime.utcnow().date(),
+            "total_score": evaluation.total_score,
+            "max_possible_score": evaluation.max_possible_score
+        }])
+
+    @staticmethod
+    def record_evaluations(db: Session, evaluations: List[dict]):
+        """Add many evaluations to their rollup groups (does not commit).
+
+        Each dict has report_type_id, evaluator_id, evaluation_method, day, total_score and
+        max_possible_score. Evaluations are summed per group first, so the upsert runs once
+        per group (as one executemany) rather than once per evaluation.
+        """
+        groups = {}
+        for evaluation in evaluations:
+            total_score = evaluation["total_score"] or 0.0
+            max_possible_score = evaluation["max_possible_score"] or 0.0
+            key = (evaluation["report_type_id"], evaluation["evaluator_id"] or 0,
+                   evaluation["evaluation_method"], evaluation["day"])
+            group = groups.get(key)
+            if group is None:
+                groups[key] = {
+                    "report_type_id": key[0],
+                    "evaluator_id": key[1],
+                    "evaluation_method": key[2],
+                    "day": key[3],
+                    "evaluation_count": 1,
+                    "score_sum": total_score,
+                    "score_sum_squares": total_score * total_score,
+                    "max_possible_sum": max_possible_score,
+                    "min_score": total_score,
+                    "max_score": total_score
+                }
+            else:
+                group["evaluation_count"] += 1
+                group["score_sum"] += total_score
+                group["score_sum_squares"] += total_score * total_score
+                group["max_possible_sum"] += max_possible_score
+                group["min_score"] = min(group["min_score"], total_score)
+                group["max_score"] = max(group["max_score"], total_score)
+        if not groups:
+            return
+
+        insert_stmt = dialect_insert(db)
+        stmt = insert_stmt(EvaluationStatsRollup.__table__)
+        rollup = EvaluationStatsRollup.__table__.c
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[rollup.report_type_id, rollup.evaluator_id, rollup.evaluation_method, rollup.day],
+            set_={
+                "evaluation_count": rollup.evaluation_count + stmt.excluded.evaluation_count,
+                "score_sum": rollup.score_sum + stmt.excluded.score_sum,
+                "score_sum_squares": rollup.score_sum_squares + stmt.excluded.score_sum_squares,
+                "max_possible_sum": rollup.max_possible_sum + stmt.excluded.max_possible_sum,
+                "min_score": case(
+                    (rollup.min_score.is_(None), stmt.excluded.min_score),
+                    (stmt.excluded.min_score < rollup.min_score, stmt.excluded.min_score),
+                    else_=rollup.min_score
+                ),
+                "max_score": case(
+                    (rollup.max_score.is_(None), stmt.excluded.max_score),
+                    (stmt.excluded.max_score > rollup.max_score, stmt.excluded.max_score),
+                    else_=rollup.max_score
+                )
+            }
+        )
+        db.execute(stmt, list(groups.values()))
+
+    @staticmethod
+    def rebuild_rollups(db: Session) -> int:
+        """Recompute all rollup rows from the evaluations table (for backfills); returns the group count"""
+        day = func.date(Evaluation.created_at)
+        evaluator = func.coalesce(Evaluation.evaluator_id, 0)
+        rows = db.query(
+            Evaluation.report_type_id,
+            evaluator,
+            Evaluation.evaluation_method,
+            day,
+            func.count(Evaluation.id),
+            func.coalesce(func.sum(Evaluation.total_score), 0.0),
+            func.coalesce(func.sum(Evaluation.total_score * Evaluation.total_score), 0.0),
+            func.coalesce(func.sum(Evaluation.max_possible_score), 0.0),
+            func.min(Evaluation.total_score),
+            func.max(Evaluation.total_score)
+        ).group_by(Evaluation.report_type_id, evaluator, Evaluation.evaluation_method, day).all()
+
+        db.query(EvaluationStatsRollup).delete(synchronize_session=False)
+        values = [
+            {
+                "report_type_id": row[0],
+                "evaluator_id": row[1],
+                "evaluation_method": row[2] or "manual",
+                # SQLite returns date() as an ISO string
+                "day": date.fromisoformat(row[3]) if isinstance(row[3], str) else row[3],
+                "evaluation_count": row[4],
+                "score_sum": row[5],
+                "score_sum_squares": row[6],
+                "max_possible_sum": row[7],
+                "min_score": row[8],
+                "max_score": row[9]
+            }
+            for row in rows if row[3] is not None
+        ]
+        if values:
+            db.execute(insert(EvaluationStatsRollup), values)
+        db.commit()
+        return len(values)
+
+    @staticmethod
+    def ensure_rollups(db: Session) -> bool:
+        """Backfill the rollups once if evaluations exist but no rollup rows do (e.g. after upgrading)"""
+        if db.query(EvaluationStatsRollup.id).first() is not None:
+            return False
+        if db.query(Evaluation.id).first() is None:
+            return False
+        groups = StatisticsService.rebuild_rollups(db)
+        print(f"Built {groups} evaluation statistics rollup group(s)")
+        return True
+
+    @staticmethod
+    def get_report_type_statistics(db: Session, report_type_id: Optional[int] = None) -> List[dict]:
+        """Score statistics per report type, summed from the rollup rows"""
+        count = func.coalesce(func.sum(EvaluationStatsRollup.evaluation_count), 0)
+        query = db.query(
+            ReportType.id,
+            ReportType.name,
+            count,
+            func.sum(EvaluationStatsRollup.score_sum),
+            func.sum(EvaluationStatsRollup.max_possible_sum),
+            func.min(EvaluationStatsRollup.min_score),
+            func.max(EvaluationStatsRollup.max_score)
+        ).outerjoin(EvaluationStatsRollup, EvaluationStatsRollup.report_type_id == ReportType.id)
+        
+        if report_type_id is not None:
+            query = query.filter(ReportType.id == report_type_id)
+        
+        rows = query.group_by(ReportType.id, ReportType.name).order_by(ReportType.id).all()
+        statistics = []
+        for type_id, type_name, total, score_sum, max_sum, min_score, max_score in rows:
+            statistics.append(StatisticsService._format_statistics(
+                type_id, type_name, total,
+                score_sum / total if total else None,
+                max_sum / total if total else None,
+                min_score, max_score
+            ))
+        return statistics
+
+    @staticmethod
+    def get_time_series(db: Session, report_type_id: Optional[int] = None, evaluator_id: Optional[int] = None,
+                        evaluation_method: Optional[str] = None, date_from: Optional[date] = None,
+                        date_to: Optional[date] = None) -> List[dict]:
+        """Daily score statistics (count, mean, standard deviation, min, max) over the rollup rows"""
+        filters = []
+        if report_type_id is not None:
+            filters.append(EvaluationStatsRollup.report_type_id == report_type_id)
+        if evaluator_id is not None:
+            filters.append(EvaluationStatsRollup.evaluator_id == evaluator_id)
+        if evaluation_method:
+            filters.append(EvaluationStatsRollup.evaluation_method == evaluation_method)
+        if date_from:
+            filters.append(EvaluationStatsRollup.day >= date_from)
+        if date_to:
+            filters.append(EvaluationStatsRollup.day <= date_to)
+
+        query = db.query(
+            EvaluationStatsRollup.day,
+            func.sum(EvaluationStatsRollup.evaluation_count),
+            func.sum(EvaluationStatsRollup.score_sum),
+            func.sum(EvaluationStatsRollup.score_sum_squares),
+            func.sum(EvaluationStatsRollup.max_possible_sum),
+            func.min(EvaluationStatsRollup.min_score),
+            func.max(EvaluationStatsRollup.max_score)
+        )
+        if filters:
+            query = query.filter(and_(*filters))
+        rows = query.group_by(EvaluationStatsRollup.day).order_by(EvaluationStatsRollup.day).all()
+
+        series = []
+        for day, total, score_sum, sum_squares, max_sum, min_score, max_score in rows:
+            if not total:
+                continue
+            mean = score_sum / total
+            # Population variance from the running sums; clamp rounding noise below zero
+            variance = max(sum_squares / total - mean * mean, 0.0)
+            average_max = max_sum / total
+            series.append({
+                "day": day.isoformat() if isinstance(day, date) else day,
+                "total_evaluations": total,
+                "average_score": round(mean, 2),
+                "std_dev": round(math.sqrt(variance), 2),
+                "average_percentage": round(mean / average_max * 100, 2) if average_max > 0 else 0.0,
+                "min_score": round(min_score, 2) if min_score is not None else 0.0,
+                "max_score": round(max_score, 2) if max_score is not None else 0.0
+            })
+        return series
@@ -0,0 +1,123 @@
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Iterator, List, Set
+from ..database import dialect_insert
+from ..models import Student
+from .import_utils import column, first_errors
+import pandas as pd
+
+STUDENT_IMPORT_COLUMNS = ("matriculation_number", "first_name", "last_name")
+
+
+class StudentService:
+    @staticmethod
+    def import_students(db: Session, chunks: Iterable[pd.DataFrame]) -> Iterator[List[Dict]]:
+        """Upsert students from import chunks, one transaction per chunk, yielding the per-row results of each chunk.
+
+        Rows are matched on matriculation number: new numbers are created, existing students
+        get the imported name ("updated", or "unchanged" if it did not change). Invalid rows
+        and repeated matriculation numbers (the first occurrence in the file wins) are
+        reported with status "error" and skipped.
+        """
+        seen: Set[str] = set()
+        for chunk in chunks:
+            yield StudentService._import_chunk(db, chunk, seen)
+
+    @staticmethod
+    def _import_chunk(db: Session, chunk: pd.DataFrame, seen: Set[str]) -> List[Dict]:
+        matriculation_numbers = column(chunk, "matriculation_number")
+        first_names = column(chunk, "first_name")
+        last_names = column(chunk, "last_name")
+        errors = first_errors(chunk, [
+            (matriculation_numbers == "", "matriculation_number is required"),
+            (matriculation_numbers.str.len() != 7, "Matriculation number must be exactly 7 characters long"),
+            (~matriculation_numbers.str.isdigit(), "Matriculation number must contain only digits"),
+            (first_names == "", "first_name is required"),
+            (last_names == "", "last_name is required"),
+        ])
+        errors = errors.mask(
+            (errors == "") & (matriculation_numbers.duplicated() | matriculation_numbers.isin(seen)),
+            "Duplicate matriculation number in the file"
+        )
+        valid = errors == ""
+        seen.update(matriculation_numbers[valid])
+
+        statuses = pd.Series("error", index=chunk.index, dtype=object)
+        student_ids = pd.Series(None, index=chunk.index, dtype=object)
+        if valid.any():
+            try:
+                statuses[valid], student_ids[valid] = StudentService._upsert(
+                    db, matriculation_numbers[valid], first_names[valid], last_names[valid]
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Student import chunk failed: {e}")
+                errors[valid] = f"Could not save the row: {e}"
+                statuses[valid] = "error"
+                student_ids[valid] = None
+
+        results = []
+        for row, status, matriculation_number, student_id, error in zip(
+                chunk.index, statuses, matriculation_numbers, student_ids, errors):
+            result = {"row": int(row), "status": status, "matriculation_number": matriculation_number}
+            if status == "error":
+                result["error"] = error
+            else:
+                result["student_id"] = int(student_id)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def _upsert(db: Session, matriculation_numbers: pd.Series, first_names: pd.Series, last_names: pd.Series):
+        """Insert new and rename changed students with one INSERT ... ON CONFLICT; returns (statuses, ids)"""
+        existing = pd.DataFrame(
+            db.execute(
+                select(Student.matriculation_number, Student.id, Student.first_name, Student.last_name)
+                .where(Student.matriculation_number.in_(matriculation_numbers.tolist()))
+            ).all(),
+            columns=["matriculation_number", "id", "first_name", "last_name"]
+        ).set_index("matriculation_number")
+        current_ids = matriculation_numbers.map(existing["id"])
+        is_new = current_ids.isna()
+        is_changed = ~is_new & (
+            (first_names != matriculation_numbers.map(existing["first_name"]))
+            | (last_names != matriculation_numbers.map(existing["last_name"]))
+        )
+        statuses = pd.Series("unchanged", index=matriculation_numbers.index, dtype=object)
+        statuses[is_new] = "created"
+        statuses[is_changed] = "updated"
+
+        to_write = is_new | is_changed
+        if to_write.any():
+            rows = pd.DataFrame({
+                "matriculation_number": matriculation_numbers[to_write],
+                "first_name": first_names[to_write],
+                "last_name": last_names[to_write],
+            }).to_dict("records")
+            students = Student.__table__.c
+            insert = dialect_insert(db)
+            stmt = insert(Student.__table__)
+            # Another import may have created a student since the lookup above; the
+            # conflict clause turns that insert into an update instead of failing
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[students.matriculation_number],
+                set_={"first_name": stmt.excluded.first_name, "last_name": stmt.excluded.last_name},
+                where=or_(students.first_name != stmt.excluded.first_name,
+                          students.last_name != stmt.excluded.last_name)
+            ).returning(students.matriculation_number, students.id)
+            # executemany on a Core insert: SQLAlchemy sends the rows as batched multi-row
+            # INSERTs from one cached statement instead of compiling a VALUES clause per chunk
+            written_ids = dict(db.execute(stmt, rows).all())
+            current_ids = current_ids.fillna(matriculation_numbers.map(written_ids))
+
+            # Created concurrently with the same name: nothing was written and nothing returned
+            missing = current_ids.isna()
+            if missing.any():
+                concurrent_ids = dict(db.execute(
+                    select(Student.matriculation_number, Student.id)
+                    .where(Student.matriculation_number.in_(matriculation_numbers[missing].tolist()))
+                ).all())
+                current_ids = current_ids.fillna(matriculation_numbers.map(concurrent_ids))
+                statuses[missing] = "unchanged"
+        return statuses, current_ids
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from typing import Optional
+from ..models import User
+from ..schemas import UserResponse
+import os
+import threading
+import time
+
+AUTH_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+# Upper bound on how long a cached principal is used; user changes made by other
+# processes become visible within this interval, changes made in this process immediately
+AUTH_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("AUTH_TOKEN_CACHE_TTL_SECONDS", "300"))
+
+
+class TokenCache:
+    """Verified bearer tokens mapped to the user they authenticate.
+
+    An entry is valid until the token's exp claim or the TTL, whichever comes first, and
+    beyond max_entries the least recently used entries are evicted. Principals are detached
+    UserResponse snapshots, so they can be shared between requests and threads.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[UserResponse]:
+        """Return the cached principal for a token, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, token: str, principal: UserResponse, expires_at: Optional[float]):
+        """Cache a verified token until expires_at (epoch seconds) or the TTL"""
+        if self.max_entries <= 0:
+            return
+        valid_until = time.time() + self.ttl_seconds
+        if expires_at is not None:
+            valid_until = min(valid_until, expires_at)
+        with self._lock:
+            self._entries[token] = (principal, valid_until)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached token of a user"""
+        with self._lock:
+            for token in [t for t, (principal, _) in self._entries.items() if principal.id == user_id]:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+
+token_cache = TokenCache(AUTH_TOKEN_CACHE_MAX_ENTRIES, AUTH_TOKEN_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _record_changed_user(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    """Drop cached tokens of users updated or deleted in this transaction"""
+    for user_id in session.info.pop("changed_user_ids", ()):
+        token_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,138 @@
+"""SQLite settings for running the API with concurrent requests and several worker processes.
+
+With SQLITE_PROFILE=production (the default) every connection is opened with:
+  - journal_mode=WAL: readers no longer block behind a writer and vice versa
+  - synchronous=NORMAL: in WAL mode this only syncs at checkpoints; a power loss can drop the
+    last commits but never corrupts the database
+  - busy_timeout: writers from other processes wait for the lock instead of failing with
+    "database is locked"
+  - mmap_size and cache_size: keep hot pages of the database in memory
+
+Within a process, write transactions additionally go through a FIFO queue, so one
+connection writes at a time and waiting writers are served in order instead of competing
+in SQLite's busy handler. SQLITE_PROFILE=default keeps SQLite's own defaults and disables the queue.
+"""
+from collections import deque
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import os
+import threading
+import time
+
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production").lower()
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "15000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+
+WRITE_SLOT_KEY = "sqlite_write_slot"
+
+
+def production_pragmas(in_memory: bool = False) -> list:
+    """PRAGMA statements run on every new connection of the production profile"""
+    pragmas = [
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}",
+    ]
+    if not in_memory:
+        pragmas = [
+            "PRAGMA journal_mode = WAL",
+            *pragmas,
+            f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}",
+        ]
+    return pragmas
+
+
+def configure_sqlite_engine(engine: Engine):
+    """Run the production pragmas on every connection the engine opens (sync or async engine)"""
+    if SQLITE_PROFILE != "production":
+        return
+    sync_engine = getattr(engine, "sync_engine", engine)
+    pragmas = production_pragmas(in_memory=":memory:" in str(sync_engine.url))
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+class SQLiteWriteQueue:
+    """FIFO lock handed from one write transaction to the next"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._busy = False
+        self._waiters = deque()
+        self.writes = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self):
+        """Wait for the write slot; raises if it is not free within the timeout"""
+        with self._lock:
+            self.writes += 1
+            if not self._busy and not self._waiters:
+                self._busy = True
+                return
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+            self.waited += 1
+
+        start = time.monotonic()
+        granted = waiter.wait(self.timeout)
+        with self._lock:
+            self.wait_seconds += time.monotonic() - start
+            if not granted and not waiter.is_set():
+                self._waiters.remove(waiter)
+                raise Exception("Timed out waiting for the database write queue")
+
+    def release(self):
+        """Hand the write slot to the next waiting transaction"""
+        with self._lock:
+            if self._waiters:
+                # The slot stays busy and passes directly to the next writer
+                self._waiters.popleft().set()
+            else:
+                self._busy = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "writes": self.writes,
+                "waited": self.waited,
+                "queued": len(self._waiters),
+                "average_wait_ms": round(self.wait_seconds / self.waited * 1000, 2) if self.waited else 0.0
+            }
+
+
+sqlite_write_queue = SQLiteWriteQueue(timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+
+
+def install_write_queue(engine: Engine, queue: SQLiteWriteQueue = sqlite_write_queue):
+    """Serialize the write transactions on the engine's connections through queue.
+
+    A connection takes the write slot before its first INSERT, UPDATE or DELETE and gives it
+    back when it is returned to the pool, after its transaction has been committed or rolled
+    back (sessions return their connection at the end of every transaction). Connections
+    that only read never wait.
+    """
+    if SQLITE_PROFILE != "production":
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _take_write_slot(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and (context.isinsert or context.isupdate or context.isdelete) \
+                and not conn.info.get(WRITE_SLOT_KEY):
+            queue.acquire()
+            conn.info[WRITE_SLOT_KEY] = True
+
+    @event.listens_for(engine.pool, "checkin")
+    def _release_write_slot(dbapi_connection, connection_record):
+        if connection_record is not None and connection_record.info.pop(WRITE_SLOT_KEY, False):
+            queue.release()
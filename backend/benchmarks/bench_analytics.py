@@ -0,0 +1,112 @@
+"""Benchmark per-section score distributions: per-object Python loop vs. the NumPy engine.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.bench_analytics --sizes 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="bench_analytics_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from sqlalchemy import insert  # noqa: E402
+
+from backend.app.database import Base, SessionLocal, engine  # noqa: E402
+from backend.app.models import Evaluation, EvaluationScore, ReportType, Rubric, Student  # noqa: E402
+from backend.app.services.analytics_service import AnalyticsService  # noqa: E402
+
+SECTIONS_PER_TYPE = 8
+
+
+def legacy_distributions(db):
+    """Per-object approach: load every score with its rubric and aggregate in Python lists"""
+    cells = {}
+    for score in db.query(EvaluationScore).all():
+        key = (score.evaluation.report_type_id, score.rubric_id)
+        cells.setdefault(key, []).append(score.score / score.rubric.max_points * 100)
+    return {
+        key: (statistics.mean(values), statistics.pstdev(values), statistics.quantiles(values, n=4))
+        for key, values in cells.items() if len(values) > 1
+    }
+
+
+def populate(db, score_count: int, report_type_count: int = 4, student_count: int = 500):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db.execute(insert(ReportType), [{"name": f"Type {i}"} for i in range(report_type_count)])
+    db.execute(insert(Rubric), [
+        {"report_type_id": t + 1, "section_name": f"Section {s}", "max_points": 10.0, "order": s}
+        for t in range(report_type_count) for s in range(SECTIONS_PER_TYPE)
+    ])
+    db.execute(insert(Student), [
+        {"first_name": "S", "last_name": str(i), "matriculation_number": f"{i:07d}"} for i in range(student_count)
+    ])
+    rng = random.Random(42)
+    evaluation_count = score_count // SECTIONS_PER_TYPE
+    evaluations = []
+    for i in range(evaluation_count):
+        evaluations.append({
+            "student_id": rng.randint(1, student_count),
+            "report_type_id": rng.randint(1, report_type_count),
+            "report_title": f"Report {i}",
+            "total_score": 0.0,
+            "max_possible_score": 10.0 * SECTIONS_PER_TYPE,
+            "evaluation_method": "manual"
+        })
+    for start in range(0, evaluation_count, 10000):
+        db.execute(insert(Evaluation), evaluations[start:start + 10000])
+
+    batch = []
+    for evaluation_id, evaluation in enumerate(evaluations, start=1):
+        first_rubric = (evaluation["report_type_id"] - 1) * SECTIONS_PER_TYPE + 1
+        for section in range(SECTIONS_PER_TYPE):
+            batch.append({
+                "evaluation_id": evaluation_id,
+                "rubric_id": first_rubric + section,
+                "score": round(rng.uniform(0, 10), 1)
+            })
+        if len(batch) >= 50000:
+            db.execute(insert(EvaluationScore), batch)
+            batch = []
+    if batch:
+        db.execute(insert(EvaluationScore), batch)
+    db.commit()
+
+
+def measure(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy-above", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'scores':>10} {'python loop (ms)':>18} {'numpy (ms)':>12} {'speedup':>9}")
+    for size in args.sizes:
+        db = SessionLocal()
+        try:
+            populate(db, size)
+            numpy_ms = measure(lambda: AnalyticsService.get_section_distributions(db), args.repeat)
+            if size <= args.skip_legacy_above:
+                legacy_ms = measure(lambda: (legacy_distributions(db), db.expunge_all()), 1)
+                print(f"{size:>10} {legacy_ms:>18.1f} {numpy_ms:>12.1f} {legacy_ms / numpy_ms:>8.1f}x")
+            else:
+                print(f"{size:>10} {'-':>18} {numpy_ms:>12.1f} {'-':>9}")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
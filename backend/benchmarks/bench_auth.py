@@ -0,0 +1,120 @@
+"""Benchmark authenticated request throughput: blocking auth dependency (previous behavior) vs. cached, non-blocking auth.
+
+Requests go through the full ASGI app (GET /api/auth/me) with many in flight at once.
+--db-latency-ms adds a delay to every database round trip, as with a database server on
+the network; the previous dependency runs its query on the event loop, so that delay
+stalls every concurrent request. Keep --concurrency below the connection pool size (15 by
+default): beyond it the previous dependency can block the loop while waiting for a pooled
+connection that only the blocked loop would release, and requests time out.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.bench_auth --requests 2000 --concurrency 10 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+_db_dir = tempfile.mkdtemp(prefix="bench_auth_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException, status  # noqa: E402
+from jose import JWTError, jwt  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.app.database import Base, SessionLocal, engine, get_db  # noqa: E402
+from backend.app.models import User  # noqa: E402
+from backend.app.routers import auth  # noqa: E402
+from backend.app.services.token_cache import token_cache  # noqa: E402
+
+
+async def legacy_get_current_user(token: str = Depends(auth.oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    """The previous dependency: decodes the token and queries the user on the event loop"""
+    credentials_exception = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    try:
+        payload = jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
+        username = payload.get("sub")
+        if username is None:
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+    user = auth.get_user_by_username(db, username=username)
+    if user is None:
+        raise credentials_exception
+    return user
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth.router)
+    return app
+
+
+def populate(user_count: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add_all([User(username=f"user{i}", hashed_password="x") for i in range(user_count)])
+        db.commit()
+    finally:
+        db.close()
+    return [
+        auth.create_access_token({"sub": f"user{i}"}, expires_delta=timedelta(minutes=30))
+        for i in range(user_count)
+    ]
+
+
+async def run(app: FastAPI, tokens, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(tokens[i % len(tokens)])
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                token = queue.get_nowait()
+                response = await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    tokens = populate(args.users)
+    if args.db_latency_ms > 0:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _latency(*_):
+            time.sleep(args.db_latency_ms / 1000)
+
+    variants = [
+        ("blocking, no cache", legacy_get_current_user, 0),
+        ("non-blocking, no cache", auth.get_current_user, 0),
+        ("non-blocking, token cache", auth.get_current_user, token_cache.max_entries or 10000),
+    ]
+    print(f"{'dependency':<28} {'seconds':>9} {'requests/s':>11}")
+    for name, dependency, cache_entries in variants:
+        app = build_app()
+        app.dependency_overrides[auth.get_current_user] = dependency
+        token_cache.clear()
+        token_cache.max_entries = cache_entries
+        elapsed = asyncio.run(run(app, tokens, args.requests, args.concurrency))
+        print(f"{name:<28} {elapsed:>9.2f} {args.requests / elapsed:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Benchmark evaluation list views: joinedload (previous behavior) vs. selectinload vs. summary projection.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.bench_list_views --sizes 1000 10000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="bench_list_views_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from sqlalchemy import event, insert  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from backend.app.database import Base, SessionLocal, engine  # noqa: E402
+from backend.app.models import Evaluation, EvaluationScore, ReportType, Rubric, Student, User  # noqa: E402
+from backend.app.pagination import paginate  # noqa: E402
+from backend.app.routers.evaluations import format_evaluation_response, format_evaluation_summary  # noqa: E402
+from backend.app.services.evaluation_service import EvaluationService  # noqa: E402
+
+SECTIONS = 8
+PAGE_SIZE = 100
+CRITERIA = {f"{high}-{high - 1}": "Criterion description " * 8 for high in range(10, 0, -2)}
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def legacy_list(db, evaluator_id):
+    """The previous /my implementation: one joined query over evaluations x scores x rubrics"""
+    evaluations = db.query(Evaluation)\
+        .options(
+            joinedload(Evaluation.student),
+            joinedload(Evaluation.report_type),
+            joinedload(Evaluation.scores).joinedload(EvaluationScore.rubric)
+        )\
+        .filter(Evaluation.evaluator_id == evaluator_id)\
+        .order_by(Evaluation.created_at.desc())\
+        .all()
+    return [format_evaluation_response(e) for e in evaluations]
+
+
+def full_list(db, evaluator_id, limit=None):
+    query = EvaluationService.query_evaluations_with_scores(db).filter(Evaluation.evaluator_id == evaluator_id)
+    if limit:
+        return [format_evaluation_response(e) for e in paginate(query, Evaluation, limit, descending=True)[0]]
+    return [format_evaluation_response(e) for e in query.order_by(Evaluation.created_at.desc(), Evaluation.id.desc())]
+
+
+def summary_list(db, evaluator_id, limit=None):
+    query = EvaluationService.query_evaluation_summaries(db).filter(Evaluation.evaluator_id == evaluator_id)
+    if limit:
+        return [format_evaluation_summary(row) for row in paginate(query, Evaluation, limit, descending=True)[0]]
+    return [format_evaluation_summary(row) for row in query.order_by(Evaluation.created_at.desc(), Evaluation.id.desc())]
+
+
+def populate(db, evaluation_count: int, student_count: int = 500):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db.execute(insert(User), [{"username": "bench", "hashed_password": "x"}])
+    db.execute(insert(ReportType), [{"name": "Type"}])
+    db.execute(insert(Rubric), [
+        {"report_type_id": 1, "section_name": f"Section {s}", "max_points": 10.0, "criteria": CRITERIA, "order": s}
+        for s in range(SECTIONS)
+    ])
+    db.execute(insert(Student), [
+        {"first_name": "S", "last_name": str(i), "matriculation_number": f"{i:07d}"} for i in range(student_count)
+    ])
+    rng = random.Random(42)
+    db.execute(insert(Evaluation), [
+        {
+            "student_id": rng.randint(1, student_count),
+            "report_type_id": 1,
+            "report_title": f"Report {i}",
+            "total_score": 40.0,
+            "max_possible_score": 80.0,
+            "evaluation_method": "manual",
+            "evaluator_id": 1
+        }
+        for i in range(evaluation_count)
+    ])
+    db.execute(insert(EvaluationScore), [
+        {"evaluation_id": e, "rubric_id": s + 1, "score": 5.0, "feedback": "Feedback text " * 10}
+        for e in range(1, evaluation_count + 1) for s in range(SECTIONS)
+    ])
+    db.commit()
+
+
+def measure(db, counter, fn, repeat: int):
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        db.expunge_all()
+        start_count = counter.count
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        queries = counter.count - start_count
+    return statistics.median(timings) * 1000, queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    counter = QueryCounter()
+    print(f"{'evaluations':>12} {'view':<28} {'queries':>8} {'ms':>10}")
+    for size in args.sizes:
+        db = SessionLocal()
+        try:
+            populate(db, size)
+            views = [
+                ("joinedload, all rows", lambda: legacy_list(db, 1)),
+                ("selectinload, all rows", lambda: full_list(db, 1)),
+                ("summary, all rows", lambda: summary_list(db, 1)),
+                (f"selectinload, page of {PAGE_SIZE}", lambda: full_list(db, 1, PAGE_SIZE)),
+                (f"summary, page of {PAGE_SIZE}", lambda: summary_list(db, 1, PAGE_SIZE)),
+            ]
+            for name, fn in views:
+                ms, queries = measure(db, counter, fn, args.repeat)
+                print(f"{size:>12} {name:<28} {queries:>8} {ms:>10.1f}")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Benchmark rule-based scoring throughput on multi-megabyte reports: previous keyword scans vs. the compiled rule engine.
+
+The previous scoring lowercased the report and ran one substring scan per keyword until
+one matched, and only knew whether a section's keywords occurred. The rule engine does the
+same with the default rules (one hit earns a section's score) and counts every keyword in
+one pass when rules weigh hits ("counting": hit_weight 0.1, max_score 1.0). All run on the
+default rubrics of every report type. Then the matcher alone is timed with growing numbers
+of keywords (as when rubrics bring their own keyword lists), against one str.count pass
+per keyword.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.bench_rule_engine --megabytes 1 5 --repeat 3
+"""
+import argparse
+import json
+import random
+import string
+import time
+from datetime import datetime
+
+from backend.app.schemas import RubricResponse
+from backend.app.services.rubric_service import RubricService
+from backend.app.services.rule_engine import CompiledRules, KeywordMatcher, RuleSet, RULE_BASED_RULES_PATH, rule_set
+
+WORDS = (
+    "the of and a to in is we this that for with our which are be as on it by system model data method "
+    "approach user interface performance implementation prototype results design evaluation introduction "
+    "requirements specification architecture discussion findings objectives goals purpose research"
+).split()
+
+
+def legacy_scores(rubrics, report_content: str) -> list:
+    """The previous evaluate_rule_based scoring (score per rubric)"""
+    scores = []
+    content_lower = report_content.lower()
+    for rubric in rubrics:
+        score = 0.0
+        section_name_lower = rubric.section_name.lower()
+        if "introduction" in section_name_lower:
+            if any(word in content_lower for word in ["introduction", "introduce", "overview"]):
+                score = rubric.max_points * 0.7
+        elif "objective" in section_name_lower or "overview" in section_name_lower:
+            if any(word in content_lower for word in ["objective", "goal", "aim", "purpose"]):
+                score = rubric.max_points * 0.7
+        elif "requirement" in section_name_lower:
+            if any(word in content_lower for word in ["requirement", "specification", "spec"]):
+                score = rubric.max_points * 0.7
+        elif "design" in section_name_lower:
+            if any(word in content_lower for word in ["design", "architecture", "structure"]):
+                score = rubric.max_points * 0.7
+        elif "result" in section_name_lower or "discussion" in section_name_lower:
+            if any(word in content_lower for word in ["result", "discussion", "finding"]):
+                score = rubric.max_points * 0.7
+        else:
+            if section_name_lower in content_lower:
+                score = rubric.max_points * 0.5
+        scores.append(score)
+    return scores
+
+
+def default_rubrics() -> dict:
+    rubric_id = 0
+    rubrics_by_type = {}
+    for report_type, rubrics in RubricService.load_default_rubrics().items():
+        rubrics_by_type[report_type] = []
+        for rubric in rubrics:
+            rubric_id += 1
+            rubrics_by_type[report_type].append(RubricResponse(
+                id=rubric_id, report_type_id=0, created_at=datetime.now(), **rubric
+            ))
+    return rubrics_by_type
+
+
+def make_report(megabytes: float, rng: random.Random, vocabulary=WORDS) -> str:
+    words = []
+    size = 0
+    while size < megabytes * 1_000_000:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def count_each_keyword(report: str, keywords) -> list:
+    content_lower = report.lower()
+    return [content_lower.count(keyword) for keyword in keywords]
+
+
+def best_of(repeat: int, function, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, nargs="+", default=[1, 5])
+    parser.add_argument("--keywords", type=int, nargs="+", default=[20, 100, 400])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    rubrics_by_type = default_rubrics()
+    compiled = {report_type: CompiledRules(rubrics, rule_set) for report_type, rubrics in rubrics_by_type.items()}
+    with open(RULE_BASED_RULES_PATH, "r", encoding="utf-8") as f:
+        counting_config = json.load(f)
+    counting_config["defaults"] = {"hit_weight": 0.1, "max_score": 1.0}
+    counting_config["fallback"].update({"hit_weight": 0.1, "max_score": 1.0})
+    counting_rules = RuleSet(counting_config)
+    counting = {report_type: CompiledRules(rubrics, counting_rules) for report_type, rubrics in rubrics_by_type.items()}
+
+    print(f"{'report MB':>9} {'previous MB/s':>14} {'engine MB/s':>12} {'same scores':>12} {'engine, counting MB/s':>22}")
+    for megabytes in args.megabytes:
+        report = make_report(megabytes, rng)
+        same = all(
+            legacy_scores(rubrics, report) == [s.score for s in compiled[report_type].score(report)]
+            for report_type, rubrics in rubrics_by_type.items()
+        )
+        legacy = best_of(args.repeat, lambda: [legacy_scores(r, report) for r in rubrics_by_type.values()])
+        engine = best_of(args.repeat, lambda: [c.score(report) for c in compiled.values()])
+        engine_counting = best_of(args.repeat, lambda: [c.score(report) for c in counting.values()])
+        total = megabytes * len(rubrics_by_type)
+        print(f"{megabytes:>9.1f} {total / legacy:>14.1f} {total / engine:>12.1f} {str(same):>12} "
+              f"{total / engine_counting:>22.1f}")
+
+    print()
+    print(f"{'keywords':>8} {'report MB':>9} {'str.count per keyword MB/s':>27} {'one-pass matcher MB/s':>22}")
+    megabytes = max(args.megabytes)
+    extra = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12))) for _ in range(max(args.keywords))]
+    for count in args.keywords:
+        keywords = (WORDS[-20:] + extra)[:count]
+        report = make_report(megabytes, rng, WORDS + keywords)
+        matcher = KeywordMatcher(keywords)
+        per_keyword = best_of(args.repeat, count_each_keyword, report, keywords)
+        one_pass = best_of(args.repeat, matcher.count, report)
+        print(f"{count:>8} {megabytes:>9.1f} {megabytes / per_keyword:>27.1f} {megabytes / one_pass:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark batch rule-based grading: one evaluate_rule_based call per submission vs. the rescore command.
+
+Fills a fresh SQLite database with students and an archive of finished evaluation jobs,
+then re-scores the archive one submission at a time (one transaction each, as the
+single-submission endpoint does) and with `python -m backend.app.cli rescore` for each
+number of worker processes (RULE_GRADING_WORKERS), with and without saving the
+evaluations. Runs once with the shipped rules, where one keyword hit is enough, and once
+with rules that count every hit ("counting": hit_weight 0.1, max_score 1.0), which makes
+scoring the larger share of the work.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.bench_rule_grading --documents 2000 --kilobytes 20 --workers 1 2 4
+"""
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+
+WORDS = (
+    "the of and a to in is we this that for with our which are be as on it by system model data method "
+    "approach user interface performance implementation prototype results design evaluation introduction "
+    "requirements specification architecture discussion findings objectives goals purpose research"
+).split()
+
+
+def counting_rules(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config["defaults"] = {"hit_weight": 0.1, "max_score": 1.0}
+    config.setdefault("fallback", {}).update({"hit_weight": 0.1, "max_score": 1.0})
+    return config
+
+
+def make_report(kilobytes: float, rng: random.Random) -> str:
+    words = []
+    size = 0
+    while size < kilobytes * 1000:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def fill_archive(env: dict, documents: int, kilobytes: float):
+    """Create the schema, students and one succeeded rule-based job per document"""
+    script = f"""
+import random
+from backend.app.database import SessionLocal, engine
+from backend.app.migrations import run_migrations
+from backend.app.models import EvaluationJob, ReportType, Student
+from backend.app.services.rubric_service import RubricService
+from backend.benchmarks.bench_rule_grading import make_report
+
+run_migrations(engine)
+db = SessionLocal()
+RubricService.initialize_default_rubrics(db)
+report_type_ids = [report_type.id for report_type in db.query(ReportType).all()]
+students = [Student(first_name="Bench", last_name=str(i), matriculation_number=str(9000000 + i)) for i in range(100)]
+db.add_all(students)
+db.commit()
+rng = random.Random(42)
+reports = [make_report({kilobytes}, rng) for _ in range(50)]
+db.add_all([
+    EvaluationJob(job_type="rule-based", status="succeeded", payload={{
+        "student_id": rng.choice(students).id,
+        "report_type_id": rng.choice(report_type_ids),
+        "report_title": f"Report {{i}}",
+        "report_content": reports[i % len(reports)] + f" {{i}}"
+    }})
+    for i in range({documents})
+])
+db.commit()
+db.close()
+"""
+    subprocess.run([sys.executable, "-c", script], env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def one_at_a_time(env: dict) -> float:
+    """Re-score the archive with one evaluate_rule_based call per submission; returns documents/sec"""
+    script = """
+import time
+from backend.app.database import SessionLocal
+from backend.app.models import EvaluationJob
+from backend.app.services.evaluation_service import EvaluationService
+
+db = SessionLocal()
+service = EvaluationService()
+payloads = [payload for (payload,) in db.query(EvaluationJob.payload).order_by(EvaluationJob.id)]
+start = time.perf_counter()
+for payload in payloads:
+    service.evaluate_rule_based(db, payload["student_id"], payload["report_type_id"],
+                                payload["report_title"], payload["report_content"])
+print(len(payloads) / (time.perf_counter() - start))
+db.close()
+"""
+    output = subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def rescore(env: dict, workers: int, dry_run: bool) -> float:
+    """Run the rescore command; returns the documents/sec it reports"""
+    command = [sys.executable, "-m", "backend.app.cli", "rescore"] + (["--dry-run"] if dry_run else [])
+    output = subprocess.run(command, env={**env, "RULE_GRADING_WORKERS": str(workers)},
+                            check=True, capture_output=True, text=True)
+    return float(re.search(r"([\d.]+) documents/sec", output.stdout).group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--kilobytes", type=float, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    from backend.app.services.rule_engine import RULE_BASED_RULES_PATH
+
+    print(f"{args.documents} documents of {args.kilobytes:g} KB, {os.cpu_count()} CPU(s)")
+    print(f"{'rules':<9} {'mode':<28} {'documents/sec':>14}")
+    for rules in ("shipped", "counting"):
+        with tempfile.TemporaryDirectory(prefix="bench_rule_grading_") as directory:
+            env = dict(os.environ)
+            env.update({
+                "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                "ASYNC_DATABASE_URL": "",
+                "SQLITE_PROFILE": "production",
+                "LLM_CACHE_PATH": os.path.join(directory, "llm_cache.db"),
+            })
+            if rules == "counting":
+                rules_path = os.path.join(directory, "rules.json")
+                with open(rules_path, "w", encoding="utf-8") as f:
+                    json.dump(counting_rules(RULE_BASED_RULES_PATH), f)
+                env["RULE_BASED_RULES_PATH"] = rules_path
+            fill_archive(env, args.documents, args.kilobytes)
+
+            print(f"{rules:<9} {'one evaluate_rule_based each':<28} {one_at_a_time(env):>14.1f}")
+            for workers in args.workers:
+                print(f"{rules:<9} {f'rescore, {workers} worker(s)':<28} {rescore(env, workers, False):>14.1f}")
+            for workers in args.workers:
+                print(f"{rules:<9} {f'rescore --dry-run, {workers}':<28} {rescore(env, workers, True):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark read/write throughput of the API on SQLite with several uvicorn worker processes.
+
+Starts the app with uvicorn --workers on a fresh database once per SQLite profile
+(SQLITE_PROFILE=default keeps SQLite's rollback journal and no write queue, production
+enables WAL, the pragmas and the in-process write queue) and drives it with a mix of
+evaluation reads, student list reads and evaluation writes for a fixed duration.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.bench_sqlite_concurrency --workers 4 --concurrency 32 --duration 15
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PORT = 8765
+
+
+def server_env(profile: str, directory: str) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(directory, 'bench.db')}",
+        "ASYNC_DATABASE_URL": "",
+        "SQLITE_PROFILE": profile,
+        "LLM_CACHE_PATH": os.path.join(directory, "llm_cache.db"),
+        "EVALUATION_JOB_WORKERS": "0",
+        "PDF_RENDER_WORKERS": "0",
+    })
+    return env
+
+
+def start_server(env: dict, workers: int) -> subprocess.Popen:
+    # Create the schema once, so the workers do not race to run the migrations
+    subprocess.run([sys.executable, "-m", "backend.app.cli", "migrate"], env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(PORT),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{PORT}/health").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    server.terminate()
+    raise Exception("Server did not start")
+
+
+async def run_load(concurrency: int, duration: float, write_ratio: float) -> dict:
+    results = {"read": [], "write": [], "errors": 0}
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=60) as client:
+        # Workers finish their startup (which creates the demo user) at different times
+        for _ in range(60):
+            login = await client.post("/api/auth/login", data={"username": "demo", "password": "demo123"})
+            if login.status_code == 200:
+                break
+            await asyncio.sleep(0.5)
+        token = login.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        report_type_id = (await client.get("/api/report-types/")).json()[0]["id"]
+        rubrics = (await client.get(f"/api/report-types/{report_type_id}/rubrics")).json()
+        student_ids = []
+        for i in range(20):
+            response = await client.post("/api/students/", json={
+                "first_name": "Bench", "last_name": str(i), "matriculation_number": f"{9000000 + i}"
+            })
+            student_ids.append(response.json()["id"])
+        evaluation_ids = [0]
+
+        async def write():
+            response = await client.post("/api/evaluations/", headers=headers, json={
+                "student_id": random.choice(student_ids),
+                "report_type_id": report_type_id,
+                "report_title": "Benchmark report",
+                "evaluation_method": "manual",
+                "scores": [{"rubric_id": r["id"], "score": random.uniform(0, r["max_points"])} for r in rubrics]
+            })
+            if response.status_code == 200:
+                evaluation_ids.append(response.json()["id"])
+            return response
+
+        async def read():
+            if random.random() < 0.5 and len(evaluation_ids) > 1:
+                return await client.get(f"/api/evaluations/{random.choice(evaluation_ids[1:])}")
+            return await client.get("/api/students/?limit=50")
+
+        async def worker(stop_at: float):
+            while time.monotonic() < stop_at:
+                kind = "write" if random.random() < write_ratio else "read"
+                start = time.perf_counter()
+                try:
+                    response = await (write() if kind == "write" else read())
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    results[kind].append(time.perf_counter() - start)
+                else:
+                    results["errors"] += 1
+
+        stop_at = time.monotonic() + duration
+        await asyncio.gather(*[worker(stop_at) for _ in range(concurrency)])
+    return results
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--profiles", nargs="+", default=["default", "production"])
+    args = parser.parse_args()
+
+    print(f"{'profile':<11} {'reads/s':>8} {'writes/s':>9} {'errors':>7} {'read p50 ms':>12} {'read p99 ms':>12} "
+          f"{'write p50 ms':>13} {'write p99 ms':>13}")
+    for profile in args.profiles:
+        with tempfile.TemporaryDirectory(prefix="bench_sqlite_") as directory:
+            server = start_server(server_env(profile, directory), args.workers)
+            try:
+                results = asyncio.run(run_load(args.concurrency, args.duration, args.write_ratio))
+            finally:
+                server.terminate()
+                server.wait()
+        reads, writes = results["read"], results["write"]
+        print(f"{profile:<11} {len(reads) / args.duration:>8.0f} {len(writes) / args.duration:>9.0f} "
+              f"{results['errors']:>7} {statistics.median(reads or [0]) * 1000:>12.1f} "
+              f"{percentile(reads, 0.99) * 1000:>12.1f} {statistics.median(writes or [0]) * 1000:>13.1f} "
+              f"{percentile(writes, 0.99) * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
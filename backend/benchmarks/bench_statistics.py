@@ -0,0 +1,97 @@
+"""Benchmark report-type statistics: per-object Python loop vs. the statistics rollup table.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.bench_statistics --sizes 10000 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_db_dir = tempfile.mkdtemp(prefix="bench_statistics_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from sqlalchemy import insert  # noqa: E402
+
+from backend.app.database import Base, SessionLocal, engine  # noqa: E402
+from backend.app.models import Evaluation, ReportType, Student  # noqa: E402
+from backend.app.services.statistics_service import StatisticsService  # noqa: E402
+
+
+def legacy_statistics(db):
+    """The original implementation: load every evaluation per report type and aggregate in Python"""
+    statistics_list = []
+    for report_type in db.query(ReportType).all():
+        evaluations = db.query(Evaluation).filter(Evaluation.report_type_id == report_type.id).all()
+        total_scores = [e.total_score for e in evaluations]
+        max_scores = [e.max_possible_score for e in evaluations]
+        count = len(evaluations)
+        statistics_list.append({
+            "report_type_id": report_type.id,
+            "total_evaluations": count,
+            "average_score": sum(total_scores) / count if count else 0.0,
+            "average_max": sum(max_scores) / count if count else 0.0,
+            "min_score": min(total_scores) if total_scores else 0.0,
+            "max_score": max(total_scores) if total_scores else 0.0
+        })
+    return statistics_list
+
+
+def populate(db, evaluation_count: int, report_type_count: int = 4, student_count: int = 500):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db.execute(insert(ReportType), [{"name": f"Type {i}"} for i in range(report_type_count)])
+    db.execute(insert(Student), [
+        {"first_name": "S", "last_name": str(i), "matriculation_number": f"{i:07d}"} for i in range(student_count)
+    ])
+    rng = random.Random(42)
+    batch = []
+    for i in range(evaluation_count):
+        batch.append({
+            "student_id": rng.randint(1, student_count),
+            "report_type_id": rng.randint(1, report_type_count),
+            "report_title": f"Report {i}",
+            "total_score": rng.uniform(0, 100),
+            "max_possible_score": 100.0,
+            "evaluation_method": "manual"
+        })
+        if len(batch) == 10000:
+            db.execute(insert(Evaluation), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Evaluation), batch)
+    db.commit()
+
+
+def measure(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'evaluations':>12} {'python loop (ms)':>18} {'rollups (ms)':>15} {'speedup':>9} {'rebuild (ms)':>12}")
+    for size in args.sizes:
+        db = SessionLocal()
+        try:
+            populate(db, size)
+            rebuild_ms = measure(lambda: StatisticsService.rebuild_rollups(db), 1)
+            legacy_ms = measure(lambda: (legacy_statistics(db), db.expunge_all()), args.repeat)
+            sql_ms = measure(lambda: StatisticsService.get_report_type_statistics(db), args.repeat)
+        finally:
+            db.close()
+        print(f"{size:>12} {legacy_ms:>18.1f} {sql_ms:>15.1f} {legacy_ms / sql_ms:>8.1f}x {rebuild_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -55,39 +55,44 @@ updateHeaderAuth();
 document.addEventListener('DOMContentLoaded', updateHeaderAuth);
 
 // Utility functions
+async function apiRequest(endpoint, options = {}) {
+    const token = localStorage.getItem('access_token');
+    const headers = {
+        'Content-Type': 'application/json',
+        ...options.headers
+    };
+    
+    // Add token to headers
+    if (token) {
+        headers['Authorization'] = `Bearer ${token}`;
+    }
+    
+    const response = await fetch(`${API_BASE}${endpoint}`, {
+        headers,
+        ...options
+    });
+    
+    // If unauthorized, redirect to login
+    if (response.status === 401) {
+        localStorage.removeItem('access_token');
+        localStorage.removeItem('user_info');
+        if (window.location.pathname !== '/login') {
+            window.location.href = '/login';
+        }
+        throw new Error('Unauthorized');
+    }
+    
+    if (!response.ok) {
+        const error = await response.json().catch(() => ({ detail: 'Unknown error' }));
+        throw new Error(error.detail || `HTTP error! status: ${response.status}`);
+    }
+    
+    return response;
+}
+
 async function apiCall(endpoint, options = {}) {
     try {
-        const token = localStorage.getItem('access_token');
-        const headers = {
-            'Content-Type': 'application/json',
-            ...options.headers
-        };
-        
-        // Add token to headers
-        if (token) {
-            headers['Authorization'] = `Bearer ${token}`;
-        }
-        
-        const response = await fetch(`${API_BASE}${endpoint}`, {
-            headers,
-            ...options
-        });
-        
-        // If unauthorized, redirect to login
-        if (response.status === 401) {
-            localStorage.removeItem('access_token');
-            localStorage.removeItem('user_info');
-            if (window.location.pathname !== '/login') {
-                window.location.href = '/login';
-            }
-            throw new Error('Unauthorized');
-        }
-        
-        if (!response.ok) {
-            const error = await response.json().catch(() => ({ detail: 'Unknown error' }));
-            throw new Error(error.detail || `HTTP error! status: ${response.status}`);
-        }
-        
+        const response = await apiRequest(endpoint, options);
         return await response.json();
     } catch (error) {
         console.error('API call failed:', error);
@@ -95,6 +100,25 @@ async function apiCall(endpoint, options = {}) {
     }
 }
 
+// Fetch every page of a cursor-paginated list endpoint (follows the X-Next-Cursor header)
+async function apiCallAllPages(endpoint) {
+    try {
+        const items = [];
+        const separator = endpoint.includes('?') ? '&' : '?';
+        let cursor = null;
+        do {
+            const url = cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint;
+            const response = await apiRequest(url);
+            items.push(...await response.json());
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
+        return items;
+    } catch (error) {
+        console.error('API call failed:', error);
+        throw error;
+    }
+}
+
 // Check if form is valid
 function checkFormValidity() {
     const form = document.getElementById('evaluationForm');
@@ -11,7 +11,7 @@ async function loadMyEvaluations() {
     const noResults = document.getElementById('noResults');
 
     try {
-        const evaluations = await apiCall('/evaluations/my');
+        const evaluations = await apiCallAllPages('/evaluations/my?fields=summary');
         
         loadingIndicator.style.display = 'none';
         
@@ -60,7 +60,7 @@ async function handleSearch() {
 
 async function loadStudentHistory(studentId) {
     try {
-        const evaluations = await apiCall(`/students/${studentId}/evaluations`);
+        const evaluations = await apiCallAllPages(`/students/${studentId}/evaluations?fields=summary`);
         const container = document.getElementById('evaluationsList');
         const evaluationsContainer = document.getElementById('evaluationsContainer');
         const noResults = document.getElementById('noResults');